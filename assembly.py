@@ -0,0 +1,340 @@
+import numpy as np
+
+from optimize import annealing_candidates, annealing_tms, choose_balanced_pair
+from primer import reverse_complement
+from temp import BASE_CODES, GC_MASK, NN_INIT_DH, NN_INIT_DS, WALLACE_WEIGHTS, nn_prefix_sums, salt_corrected_tm
+
+
+ASSEMBLY_FIELDS = [
+    "name",
+    "forward_primer",
+    "reverse_primer",
+    "forward_nmer",
+    "forward_tm",
+    "reverse_nmer",
+    "reverse_tm",
+    "product_length",
+    "next",
+    "overlap",
+    "overlap_length",
+    "overlap_shift",
+    "overlap_tm",
+    "overlap_gc_percent",
+    "shared_kmers",
+]
+
+REPEAT_K = 12
+
+# Best-scoring windows kept per junction for the DP, which is quadratic in this number.
+CANDIDATES_PER_JUNCTION = 48
+
+# Cost of a window: |Tm - target| in °C plus these weighted terms.
+LENGTH_WEIGHT = 0.05
+SHIFT_WEIGHT = 0.02
+BALANCE_WEIGHT = 0.5
+REPEAT_PENALTY = 100.0
+
+
+def window_tms(region: str, starts: np.ndarray, lengths: np.ndarray, model: str = "wallace", **conditions) -> np.ndarray:
+    """
+    Calculate the Tm of many windows of a sequence at once, each in O(1) from prefix sums.
+
+    Args:
+        region (str): Upper-case DNA sequence.
+        starts (np.ndarray): Start of each window.
+        lengths (np.ndarray): Length of each window.
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    raw = np.frombuffer(region.encode("ascii"), dtype=np.uint8)
+    ends = starts + lengths
+
+    if model == "wallace":
+        prefix = np.concatenate(([0], np.cumsum(WALLACE_WEIGHTS[raw])))
+        return (prefix[ends] - prefix[starts]).astype(np.float64)
+
+    if model != "nn":
+        raise ValueError(f"Unknown Tm model {model!r}.")
+
+    codes = BASE_CODES[raw]
+    dh_prefix, ds_prefix = nn_prefix_sums(region)
+    dh = dh_prefix[ends - 1] - dh_prefix[starts] + NN_INIT_DH[codes[starts]] + NN_INIT_DH[codes[ends - 1]]
+    ds = ds_prefix[ends - 1] - ds_prefix[starts] + NN_INIT_DS[codes[starts]] + NN_INIT_DS[codes[ends - 1]]
+
+    return salt_corrected_tm(dh, ds, lengths, **conditions)
+
+def shared_kmer_flags(regions: list[str], k: int = REPEAT_K) -> list[np.ndarray]:
+    """
+    Flag, for every junction region, the k-mers that also occur in another region on either strand.
+
+    Args:
+        regions (list[str]): Sequence around each junction.
+        k (int, optional): k-mer length. Defaults to REPEAT_K.
+    """
+
+    owners: dict[str, set[int]] = {}
+
+    for index, region in enumerate(regions):
+        for strand in (region, reverse_complement(region)):
+            for position in range(len(strand) - k + 1):
+                owners.setdefault(strand[position:position + k], set()).add(index)
+
+    return [
+        np.array([len(owners[region[position:position + k]]) > 1 for position in range(len(region) - k + 1)], dtype=np.int64)
+        for region in regions
+    ]
+
+def junction_candidates(
+        left: str,
+        right: str,
+        flags: np.ndarray,
+        min_overlap: int,
+        max_overlap: int,
+        target_tm: float,
+        model: str = "wallace",
+        k: int = REPEAT_K,
+        **conditions
+    ) -> dict:
+    """
+    Score every overlap window across one junction and keep the best ones.
+
+    A window of length L with shift a takes the last a bases of the left
+    fragment and the first L - a bases of the right one.
+
+    Args:
+        left (str): End of the left fragment (at most max_overlap bases).
+        right (str): Start of the right fragment (at most max_overlap bases).
+        flags (np.ndarray): Shared k-mer flags of left + right, from shared_kmer_flags.
+        min_overlap (int): Shortest overlap.
+        max_overlap (int): Longest overlap.
+        target_tm (float): Desired overlap Tm.
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        k (int, optional): k-mer length of the flags. Defaults to REPEAT_K.
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    region = left + right
+    lengths, shifts = np.meshgrid(np.arange(min_overlap, max_overlap + 1), np.arange(max_overlap + 1), indexing="ij")
+    keep = (shifts <= lengths) & (shifts <= len(left)) & (lengths - shifts <= len(right))
+    lengths, shifts = lengths[keep], shifts[keep]
+
+    if len(lengths) == 0:
+        raise ValueError(f"Fragments are too short for overlaps of at least {min_overlap} bases.")
+
+    starts = len(left) - shifts
+    tms = window_tms(region, starts, lengths, model, **conditions)
+    gc_prefix = np.concatenate(([0], np.cumsum(GC_MASK[np.frombuffer(region.encode("ascii"), dtype=np.uint8)])))
+    flag_prefix = np.concatenate(([0], np.cumsum(flags)))
+    shared = np.where(lengths >= k, flag_prefix[np.maximum(starts + lengths - k + 1, starts)] - flag_prefix[starts], 0)
+
+    cost = (
+        np.abs(tms - target_tm)
+        + LENGTH_WEIGHT * (lengths - min_overlap)
+        + SHIFT_WEIGHT * np.abs(2 * shifts - lengths)
+        + REPEAT_PENALTY * shared
+    )
+    best = np.argsort(cost, kind="stable")[:CANDIDATES_PER_JUNCTION]
+
+    return {
+        "region": region,
+        "start": starts[best],
+        "length": lengths[best],
+        "shift": shifts[best],
+        "tm": tms[best],
+        "gc_percent": 100 * (gc_prefix[starts[best] + lengths[best]] - gc_prefix[starts[best]]) / lengths[best],
+        "shared": shared[best],
+        "cost": cost[best],
+    }
+
+def transition_costs(previous: dict, current: dict, fragment_length: int) -> np.ndarray:
+    """
+    Return the cost of every pair of windows at two consecutive junctions sharing a fragment.
+
+    Pairs whose overlaps would cross inside the shared fragment are infeasible.
+
+    Args:
+        previous (dict): Candidates of the junction before the fragment.
+        current (dict): Candidates of the junction after the fragment.
+        fragment_length (int): Length of the shared fragment.
+    """
+
+    used = (previous["length"] - previous["shift"])[:, np.newaxis] + current["shift"][np.newaxis, :]
+    balance = BALANCE_WEIGHT * np.abs(previous["tm"][:, np.newaxis] - current["tm"][np.newaxis, :])
+
+    return np.where(used <= fragment_length, balance, np.inf)
+
+def choose_windows(candidates: list[dict], lengths: list[int], circular: bool) -> list[int]:
+    """
+    Pick one window per junction minimizing the total cost by dynamic programming along the assembly.
+
+    For a circular assembly the DP is run for every choice at the first
+    junction at once, and closed with the transition back to it.
+
+    Args:
+        candidates (list[dict]): Candidates of each junction, in assembly order.
+        lengths (list[int]): Length of each fragment; junction j joins fragments j and j + 1.
+        circular (bool): Whether the last junction joins the last fragment back to the first.
+    """
+
+    # Rows index the window chosen at the first junction (a single row when linear).
+    if circular:
+        cost = np.full((len(candidates[0]["cost"]),) * 2, np.inf)
+        np.fill_diagonal(cost, candidates[0]["cost"])
+    else:
+        cost = candidates[0]["cost"][np.newaxis, :]
+
+    backpointers = []
+
+    for j in range(1, len(candidates)):
+        total = cost[:, :, np.newaxis] + transition_costs(candidates[j - 1], candidates[j], lengths[j])[np.newaxis]
+        backpointers.append(total.argmin(axis=1))
+        cost = total.min(axis=1) + candidates[j]["cost"][np.newaxis, :]
+
+    if circular:
+        cost = cost + transition_costs(candidates[-1], candidates[0], lengths[0]).T
+
+    row, choice = np.unravel_index(np.argmin(cost), cost.shape)
+
+    if not np.isfinite(cost[row, choice]):
+        raise ValueError("No overlaps fit: a fragment is shorter than the overlaps on both of its ends.")
+
+    choices = [int(choice)]
+
+    for back in reversed(backpointers):
+        choices.append(int(back[row, choices[-1]]))
+
+    return choices[::-1]
+
+def design_assembly(
+        fragments: list[tuple[str, str]],
+        circular: bool = True,
+        min_overlap: int = 20,
+        max_overlap: int = 40,
+        overlap_tm: float = 60.0,
+        anneal_tm: float = 60.0,
+        tm_window: float = 2.5,
+        min_nmer: int = 15,
+        max_nmer: int = 35,
+        gc_clamp: bool = False,
+        model: str = "wallace",
+        **conditions
+    ) -> list[dict]:
+    """
+    Design Gibson / overlap-extension assembly primers for fragments joined in order.
+
+    Each junction gets an overlap whose length and position across the seam
+    are chosen so that overlap Tm values are close to `overlap_tm` and to each
+    other, overlaps are short and evenly split between the two primer tails,
+    and no overlap shares a REPEAT_K-mer with another junction (which could
+    join the wrong ends). Primers anneal with lengths chosen to reach
+    `anneal_tm`; each carries the part of its overlap from the neighbouring
+    fragment as a 5' tail. The part of an overlap inside a fragment anneals
+    to it as well, so a primer never anneals over fewer bases than that part;
+    the reported nmer and Tm are those of the bases that actually anneal.
+    Only the ends of each fragment are read.
+
+    Returns one record per fragment (fields of ASSEMBLY_FIELDS) holding its
+    primers, PCR product length and the overlap with the next fragment.
+
+    Args:
+        fragments (list[tuple[str, str]]): (name, sequence) of each fragment in assembly order, e.g. inserts then vector backbone.
+        circular (bool, optional): Whether the last fragment joins back to the first (e.g. with a vector). Defaults to True.
+        min_overlap (int, optional): Shortest overlap. Defaults to 20.
+        max_overlap (int, optional): Longest overlap. Defaults to 40.
+        overlap_tm (float, optional): Desired overlap Tm. Defaults to 60.0.
+        anneal_tm (float, optional): Desired Tm of the annealing part of each primer. Defaults to 60.0.
+        tm_window (float, optional): Allowed deviation from anneal_tm. Defaults to 2.5.
+        min_nmer (int, optional): Shortest annealing length. Defaults to 15.
+        max_nmer (int, optional): Longest annealing length. Defaults to 35.
+        gc_clamp (bool, optional): Whether to require a GC clamp on the annealing part. Defaults to False.
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    if len(fragments) < 2:
+        raise ValueError("At least two fragments are required.")
+
+    if min_overlap > max_overlap:
+        raise ValueError("min_overlap cannot be greater than max_overlap.")
+
+    if min_overlap < 2:
+        raise ValueError("Overlaps must be at least 2 bases long.")
+
+    names = [name for name, _ in fragments]
+    lengths = [len(sequence) for _, sequence in fragments]
+    heads = [str(sequence[:max(max_overlap, max_nmer)]).upper() for _, sequence in fragments]
+    tails = [str(sequence[-max(max_overlap, max_nmer):]).upper() for _, sequence in fragments]
+    count = len(fragments) if circular else len(fragments) - 1
+    joins = [(j, (j + 1) % len(fragments)) for j in range(count)]
+
+    lefts = [tails[i][-max_overlap:] for i, _ in joins]
+    rights = [heads[i][:max_overlap] for _, i in joins]
+    flags = shared_kmer_flags([left + right for left, right in zip(lefts, rights)])
+    candidates = [
+        junction_candidates(left, right, flag, min_overlap, max_overlap, overlap_tm, model, **conditions)
+        for left, right, flag in zip(lefts, rights, flags)
+    ]
+    chosen = []
+
+    for junction, choice in zip(candidates, choose_windows(candidates, lengths, circular)):
+        window = {key: values[choice].item() for key, values in junction.items() if key != "region"}
+        window["overlap"] = junction["region"][window["start"]:window["start"] + window["length"]]
+        chosen.append(window)
+
+    incoming = {right: junction for (_, right), junction in zip(joins, chosen)}
+    outgoing = {left: junction for (left, _), junction in zip(joins, chosen)}
+    records = []
+
+    def primer_candidates(name: str, end: str, region: str, inside: int) -> list[tuple[int, float]]:
+        found = annealing_candidates(region[:max_nmer], min_nmer, max_nmer, anneal_tm, tm_window, gc_clamp, model, **conditions)
+
+        if not found:
+            raise ValueError(f"No {end} primer length of fragment {name} between {min_nmer} and {max_nmer} reaches {anneal_tm} ± {tm_window} °C.")
+
+        # The part of the overlap inside this fragment anneals too, so no primer anneals over fewer bases than that.
+        tms = annealing_tms(region, model, **conditions)
+
+        return sorted({(max(nmer, inside), float(tms[max(nmer, inside)])) for nmer, _ in found})
+
+    for i, name in enumerate(names):
+        before, after = incoming.get(i), outgoing.get(i)
+        forward_inside = before["length"] - before["shift"] if before is not None else 0
+        reverse_inside = after["shift"] if after is not None else 0
+
+        (forward_nmer, forward_tm), (reverse_nmer, reverse_tm) = choose_balanced_pair(
+            primer_candidates(name, "forward", heads[i], forward_inside),
+            primer_candidates(name, "reverse", reverse_complement(tails[i]), reverse_inside),
+            anneal_tm
+        )
+
+        forward_primer, reverse_primer = heads[i][:forward_nmer], reverse_complement(tails[i][-reverse_nmer:])
+        product_length = lengths[i]
+
+        if before is not None:
+            forward_primer = before["overlap"] + heads[i][forward_inside:forward_nmer]
+            product_length += before["shift"]
+
+        if after is not None:
+            reverse_primer = reverse_complement(tails[i][len(tails[i]) - reverse_nmer:] + after["overlap"][reverse_inside:])
+            product_length += after["length"] - after["shift"]
+
+        records.append({
+            "name": name,
+            "forward_primer": forward_primer,
+            "reverse_primer": reverse_primer,
+            "forward_nmer": forward_nmer,
+            "forward_tm": forward_tm,
+            "reverse_nmer": reverse_nmer,
+            "reverse_tm": reverse_tm,
+            "product_length": product_length,
+            "next": names[(i + 1) % len(names)] if after is not None else None,
+            "overlap": after["overlap"] if after is not None else None,
+            "overlap_length": after["length"] if after is not None else None,
+            "overlap_shift": after["shift"] if after is not None else None,
+            "overlap_tm": after["tm"] if after is not None else None,
+            "overlap_gc_percent": after["gc_percent"] if after is not None else None,
+            "shared_kmers": after["shared"] if after is not None else None,
+        })
+
+    return records
\ No newline at end of file
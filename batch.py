@@ -0,0 +1,326 @@
+import csv
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+
+from cache import design_inputs, open_cache
+from primer import construct_primers
+from temp import calculate_tm_model
+from len import get_length
+from metrics import METRICS, collect_stages, stage
+
+
+MANIFEST_FIELDS = [
+    "name",
+    "seq",
+    "seq_b",
+    "mut",
+    "nmer",
+    "forward_re",
+    "reverse_re",
+    "forward_tag",
+    "reverse_tag",
+]
+
+RESULT_FIELDS = [
+    "row",
+    "name",
+    "forward_primer",
+    "mut_reverse_primer",
+    "mut_forward_primer",
+    "reverse_primer",
+    "forward_tm",
+    "forward_ta",
+    "reverse_tm",
+    "reverse_ta",
+    "product_length",
+    "error",
+]
+
+FASTA_EXTENSIONS = (".fa", ".fasta", ".fna", ".fas")
+
+
+def normalize(sequence: str | None) -> str:
+    """
+    Return the sequence in upper case with all whitespace removed.
+
+    Args:
+        sequence (str | None): Input DNA sequence, may be None or empty.
+    """
+
+    return "".join(sequence.upper().split()) if sequence else ""
+
+def read_fasta_manifest(handle: Iterable[str]) -> Iterator[dict]:
+    """
+    Parse a FASTA manifest, one construct per record.
+
+    Per-row parameters are given as key=value pairs on the header line, e.g.
+    `>gfp nmer=20 forward_re=GAATTC reverse_re=CTCGAG`.
+
+    Args:
+        handle (Iterable[str]): Lines of the FASTA manifest.
+    """
+
+    row = None
+    chunks: list[str] = []
+
+    for line in handle:
+        line = line.strip()
+
+        if line.startswith(">"):
+            if row is not None:
+                row["seq"] = "".join(chunks)
+                yield row
+
+            fields = line[1:].split()
+            row = {"name": fields[0] if fields else ""}
+            chunks = []
+
+            for field in fields[1:]:
+                key, sep, value = field.partition("=")
+
+                if sep:
+                    row[key.replace("-", "_")] = value
+        elif line and row is not None:
+            chunks.append(line)
+
+    if row is not None:
+        row["seq"] = "".join(chunks)
+        yield row
+
+def read_manifest(path: str) -> Iterator[dict]:
+    """
+    Stream construct rows from a TSV, CSV or FASTA manifest.
+
+    Table manifests must have a header row using the column names in
+    MANIFEST_FIELDS; only `seq` is mandatory, missing columns fall back to the
+    batch defaults.
+
+    Args:
+        path (str): Path to the manifest file.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+
+    with open(path, newline="") as handle:
+        if extension in FASTA_EXTENSIONS:
+            yield from read_fasta_manifest(handle)
+            return
+
+        delimiter = "," if extension == ".csv" else "\t"
+        reader = csv.DictReader((line for line in handle if line.strip() and not line.startswith("#")), delimiter=delimiter)
+
+        for row in reader:
+            yield {key.strip().lower().replace("-", "_"): value for key, value in row.items() if key}
+
+def design_construct(
+        seq_a: str,
+        seq_b: str,
+        mut: str,
+        nmer: int,
+        forward_re_site: str,
+        reverse_re_site: str,
+        forward_tag: str = "",
+        reverse_tag: str = "",
+        tm_model: str = "wallace",
+        ta_offset: float = 5.0,
+        conditions: dict | None = None
+    ) -> dict:
+    """
+    Run the full primer, Tm and length pipeline for a single construct.
+
+    This mirrors the `all` subcommand without printing, and expects already
+    normalized sequences.
+
+    Args:
+        seq_a (str): Target DNA sequence.
+        seq_b (str): Target DNA sequence of the other target gene, or "".
+        mut (str): Mutation sequence to be introduced between the targets, or "".
+        nmer (int): Number of nucleotides from each end to include.
+        forward_re_site (str): Restriction enzyme site for the forward primer.
+        reverse_re_site (str): Restriction enzyme site for the reverse primer.
+        forward_tag (str, optional): Additional tag sequence for the forward primer. Defaults to "".
+        reverse_tag (str, optional): Additional tag sequence for the reverse primer. Defaults to "".
+        tm_model (str, optional): Melting temperature model, "wallace" or "nn". Defaults to "wallace".
+        ta_offset (float, optional): Annealing temperature is Tm minus this offset. Defaults to 5.0.
+        conditions (dict | None, optional): Salt and primer concentrations for the "nn" model. Defaults to None.
+    """
+
+    if mut != "" and seq_b == "":
+        raise ValueError("For mutation primers, sequence B must be provided.")
+
+    if seq_b != "" and mut == "":
+        raise ValueError("Mutation sequence must be provided when sequence B is given.")
+
+    with stage("construct"):
+        primer_a, primer_b, primer_c, primer_d = construct_primers(
+            seq_a,
+            seq_b,
+            mut,
+            nmer,
+            forward_re_site,
+            reverse_re_site,
+            forward_tag,
+            reverse_tag
+        )
+
+    with stage("tm"):
+        forward_tm = calculate_tm_model(primer_a, nmer, tm_model, **(conditions or {}))
+        reverse_tm = calculate_tm_model(primer_d, nmer, tm_model, **(conditions or {}))
+
+    with stage("length"):
+        product_length = get_length(seq_a, seq_b, primer_a, primer_d, primer_b, nmer)
+
+    return {
+        "forward_primer": primer_a,
+        "mut_reverse_primer": primer_b,
+        "mut_forward_primer": primer_c,
+        "reverse_primer": primer_d,
+        "forward_tm": forward_tm,
+        "forward_ta": forward_tm - ta_offset,
+        "reverse_tm": reverse_tm,
+        "reverse_ta": reverse_tm - ta_offset,
+        "product_length": product_length,
+    }
+
+def design_row(index: int, row: dict, defaults: dict) -> dict:
+    """
+    Design primers for one manifest row, capturing any error in the result.
+
+    When `defaults["cache"]` holds cache settings, designs are looked up in
+    (and stored to) the persistent cache of the worker process.
+
+    Args:
+        index (int): 1-based position of the row in the manifest.
+        row (dict): Manifest row as produced by read_manifest.
+        defaults (dict): Fallback values for fields missing from the row.
+    """
+
+    def field(key: str) -> str:
+        value = row.get(key)
+        return value if value not in (None, "") else defaults.get(key) or ""
+
+    result = {"row": index, "name": row.get("name") or f"row{index}"}
+
+    try:
+        nmer = field("nmer")
+
+        if nmer == "":
+            raise ValueError("nmer must be provided in the manifest or with --nmer.")
+
+        with stage("normalize"):
+            seq_a, seq_b = normalize(field("seq")), normalize(field("seq_b"))
+
+        params = {
+            "mut": normalize(field("mut")),
+            "nmer": int(nmer),
+            "forward_re_site": normalize(field("forward_re")),
+            "reverse_re_site": normalize(field("reverse_re")),
+            "forward_tag": normalize(field("forward_tag")),
+            "reverse_tag": normalize(field("reverse_tag")),
+            "tm_model": defaults.get("tm_model", "wallace"),
+            "ta_offset": defaults.get("ta_offset", 5.0),
+            "conditions": defaults.get("conditions") or {},
+        }
+
+        def compute() -> dict:
+            return design_construct(seq_a, seq_b, **params)
+
+        if defaults.get("cache"):
+            inputs = design_inputs("batch", {"seq_a": seq_a, "seq_b": seq_b}, **params)
+            result.update(open_cache(**defaults["cache"]).get_or_compute(inputs, compute))
+        else:
+            result.update(compute())
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+
+    return result
+
+def design_chunk(chunk: list[tuple[int, dict]], defaults: dict) -> list[dict]:
+    """
+    Design primers for a chunk of manifest rows in a worker process.
+
+    Args:
+        chunk (list[tuple[int, dict]]): Pairs of row index and manifest row.
+        defaults (dict): Fallback values for fields missing from the rows.
+    """
+
+    results = [design_row(index, row, defaults) for index, row in chunk]
+
+    # Worker caches are never closed, so their memory hits are written after every chunk.
+    if defaults.get("cache"):
+        open_cache(**defaults["cache"]).flush()
+
+    return results
+
+def chunked(rows: Iterable[dict], size: int) -> Iterator[list[tuple[int, dict]]]:
+    """
+    Group rows into numbered chunks of at most `size` rows.
+
+    Args:
+        rows (Iterable[dict]): Manifest rows.
+        size (int): Maximum number of rows per chunk.
+    """
+
+    chunk = []
+
+    for index, row in enumerate(rows, start=1):
+        chunk.append((index, row))
+
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+def run_batch(rows: Iterable[dict], defaults: dict, workers: int | None = None, chunksize: int = 64) -> Iterator[dict]:
+    """
+    Design primers for every row on a process pool, yielding results in input order.
+
+    Only a bounded number of chunks is in flight at any time, so results
+    stream out while the manifest is still being read. When stage metrics
+    are enabled, each worker records them per chunk and they are merged into
+    this process, so the report does not depend on the number of workers.
+
+    Args:
+        rows (Iterable[dict]): Manifest rows.
+        defaults (dict): Fallback values for fields missing from the rows.
+        workers (int | None, optional): Number of worker processes. Defaults to the CPU count.
+        chunksize (int, optional): Number of rows sent to a worker at once. Defaults to 64.
+    """
+
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1.")
+
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for chunk in chunked(rows, chunksize):
+            yield from design_chunk(chunk, defaults)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=METRICS.disable) as executor:
+        pending = deque()
+
+        def collect() -> list[dict]:
+            if not METRICS.enabled:
+                return pending.popleft().result()
+
+            results, stages = pending.popleft().result()
+            METRICS.merge(stages)
+
+            return results
+
+        for chunk in chunked(rows, chunksize):
+            if METRICS.enabled:
+                pending.append(executor.submit(collect_stages, METRICS.track_memory, design_chunk, chunk, defaults))
+            else:
+                pending.append(executor.submit(design_chunk, chunk, defaults))
+
+            if len(pending) >= workers * 2:
+                yield from collect()
+
+        while pending:
+            yield from collect()
\ No newline at end of file
@@ -0,0 +1,440 @@
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from functools import cache
+from typing import Callable
+
+import numpy as np
+
+import main as cli
+from cache import open_cache
+from len import get_length
+from packed import PackedSeq
+from primer import construct_mutation_primers_single, construct_primers
+from temp import calculate_tm, calculate_tm_batch, calculate_tm_model
+
+
+GENE_SIZES = [1_000, 10_000, 100_000, 1_000_000, 5_000_000]
+BATCH_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+QUICK_GENE_SIZES = [1_000, 10_000, 100_000]
+QUICK_BATCH_SIZES = [10, 100, 1_000, 10_000]
+
+SENSE_CODONS = [a + b + c for a in "ACGT" for b in "ACGT" for c in "ACGT" if a + b + c not in ("TAA", "TAG", "TGA")]
+
+RE_SITES = ("GAATTC", "CTCGAG")
+
+# Calls per timed run of single-design benchmarks, so they are not lost in timer resolution.
+LOOPS = 1000
+
+
+def synthetic_gene(length: int, seed: int = 0) -> str:
+    """
+    Return a reproducible random open reading frame of about `length` bases (ATG ... TAA).
+
+    Args:
+        length (int): Approximate gene length in bases.
+        seed (int, optional): Random seed. Defaults to 0.
+    """
+
+    rng = random.Random(seed)
+
+    return "ATG" + "".join(rng.choices(SENSE_CODONS, k=max(1, length // 3 - 2))) + "TAA"
+
+def synthetic_primers(count: int, length: int = 25, seed: int = 0) -> list[str]:
+    """
+    Return a reproducible list of random primers.
+
+    Args:
+        count (int): Number of primers.
+        length (int, optional): Primer length. Defaults to 25.
+        seed (int, optional): Random seed. Defaults to 0.
+    """
+
+    codes = np.random.default_rng(seed).integers(0, 4, size=(count, length), dtype=np.uint8)
+    letters = np.frombuffer(b"ACGT", dtype=np.uint8)[codes]
+
+    return [row.tobytes().decode("ascii") for row in letters]
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """
+    Return the best wall-clock time of `repeat` calls, in seconds.
+
+    Args:
+        func (Callable[[], object]): Function to time.
+        repeat (int): Number of calls.
+    """
+
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+class Suite:
+    """
+    Collects benchmark timings and throughputs (items per second) by name.
+
+    Args:
+        repeat (int): Number of timed calls per benchmark; the best one is kept.
+        pattern (str | None, optional): Only run benchmarks whose name matches this regular expression. Defaults to None.
+    """
+
+    def __init__(self, repeat: int, pattern: str | None = None) -> None:
+        self.repeat = repeat
+        self.pattern = re.compile(pattern) if pattern else None
+        self.results: dict[str, dict] = {}
+
+    def selected(self, name: str) -> bool:
+        """
+        Return whether a benchmark is run, so its inputs are only prepared when needed.
+
+        Args:
+            name (str): Benchmark name.
+        """
+
+        return self.pattern is None or self.pattern.search(name) is not None
+
+    def record(self, name: str, func: Callable[[], object], items: int) -> None:
+        """
+        Time a benchmark and store its best time and throughput.
+
+        Args:
+            name (str): Benchmark name.
+            func (Callable[[], object]): Function to time.
+            items (int): Number of items (primers, bases, designs...) processed per call.
+        """
+
+        if not self.selected(name):
+            return
+
+        seconds = measure(func, self.repeat)
+        self.results[name] = {"seconds": seconds, "items": items, "throughput": items / seconds if seconds > 0 else float("inf")}
+        print(f"{name:<48} {seconds * 1000:>12.3f} ms {self.results[name]['throughput']:>16.1f} items/s", file=sys.stderr)
+
+def run_cli(argv: list[str], stdin: str | None = None) -> None:
+    """
+    Run a main.py subcommand in this process, discarding its output.
+
+    Args:
+        argv (list[str]): Command line arguments, without the program name.
+        stdin (str | None, optional): Text fed to standard input. Defaults to None.
+    """
+
+    saved_stdin = sys.stdin
+
+    try:
+        if stdin is not None:
+            sys.stdin = io.StringIO(stdin)
+
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            cli.main(argv)
+    finally:
+        sys.stdin = saved_stdin
+
+def bench_functions(suite: Suite, gene_sizes: list[int], batch_sizes: list[int]) -> None:
+    """
+    Benchmark the core design functions on synthetic genes and primer batches.
+
+    Args:
+        suite (Suite): Collected results.
+        gene_sizes (list[int]): Template lengths in bases.
+        batch_sizes (list[int]): Numbers of primers per batch.
+    """
+
+    for size in gene_sizes:
+        gene = synthetic_gene(size, seed=size)
+        gene_b = synthetic_gene(size, seed=size + 1)
+
+        suite.record(f"construct_primers/{size}", lambda: [construct_primers(gene, "", "", 20, *RE_SITES) for _ in range(LOOPS)], LOOPS)
+        suite.record(f"construct_primers_mut/{size}", lambda: [construct_primers(gene, gene_b, "GGG", 20, *RE_SITES) for _ in range(LOOPS)], LOOPS)
+        suite.record(f"get_length/{size}", lambda: [get_length(gene, gene_b, "A" * 29, "C" * 29, "G" * 43, 20) for _ in range(LOOPS)], LOOPS)
+        suite.record(f"packed_encode/{size}", lambda: PackedSeq(gene), size)
+
+    for count in batch_sizes:
+        primers = synthetic_primers(count, seed=count)
+        gene = synthetic_gene(3_000, seed=count)
+        positions = [(position % (len(gene) // 3 - 2)) * 3 + 3 for position in range(count)]
+
+        suite.record(f"calculate_tm/{count}", lambda: [calculate_tm(primer, 20) for primer in primers], count)
+        suite.record(f"calculate_tm_batch/{count}", lambda: calculate_tm_batch(primers, 20), count)
+        suite.record(f"calculate_tm_batch_nn/{count}", lambda: calculate_tm_batch(primers, 20, "nn"), count)
+        suite.record(
+            f"construct_mutation_primers_single/{count}",
+            lambda: [construct_mutation_primers_single(gene[:start], gene[start + 3:], 20, "GCG") for start in positions],
+            count
+        )
+
+        if count <= 10_000:
+            suite.record(f"calculate_tm_nn/{count}", lambda: [calculate_tm_model(primer, 20, "nn") for primer in primers], count)
+
+def bench_cli(suite: Suite, workdir: str, gene_sizes: list[int], batch_sizes: list[int]) -> None:
+    """
+    Benchmark every main.py subcommand end to end, in process, on synthetic inputs.
+
+    Args:
+        suite (Suite): Collected results.
+        workdir (str): Directory for the generated input files.
+        gene_sizes (list[int]): Template lengths in bases; the smallest is passed inline, the largest as a file.
+        batch_sizes (list[int]): Numbers of primers per batch; the largest sizes the primer and manifest files.
+    """
+
+    gene = synthetic_gene(min(gene_sizes), seed=1)
+    gene_b = synthetic_gene(min(gene_sizes), seed=2)
+    cache_path = os.path.join(workdir, "cache.sqlite")
+    primer_count = min(max(batch_sizes), 100_000)
+    manifest_rows = min(max(batch_sizes), 1_000)
+    forward, _, _, reverse = construct_primers(gene, "", "", 20, *RE_SITES)
+
+    # Input files are written on first use, so benchmarks excluded by --filter never build them.
+    @cache
+    def primers() -> list[str]:
+        return synthetic_primers(primer_count, seed=4)
+
+    @cache
+    def large_path() -> str:
+        large = synthetic_gene(max(gene_sizes), seed=3)
+        path = os.path.join(workdir, "large.fa")
+
+        with open(path, "w") as handle:
+            handle.write(">large\n" + "\n".join(large[i:i + 80] for i in range(0, len(large), 80)) + "\n")
+
+        return path
+
+    @cache
+    def reference_path() -> str:
+        path = os.path.join(workdir, "reference.fa")
+
+        with open(path, "w") as handle:
+            for index in range(4):
+                handle.write(f">chr{index + 1}\n{synthetic_gene(max(gene_sizes) // 4, seed=10 + index)}\n")
+
+        # Build the k-mer index outside the timed runs.
+        run_cli(["specificity", "--reference", path, "--primer", forward])
+
+        return path
+
+    @cache
+    def primer_path() -> str:
+        path = os.path.join(workdir, "primers.txt")
+
+        with open(path, "w") as handle:
+            handle.write("\n".join(f"p{index}\t{primer}" for index, primer in enumerate(primers())) + "\n")
+
+        return path
+
+    @cache
+    def manifest_path() -> str:
+        path = os.path.join(workdir, "manifest.tsv")
+
+        with open(path, "w") as handle:
+            handle.write("name\tseq\tnmer\n")
+            handle.write("".join(f"g{index}\t{synthetic_gene(900, seed=100 + index)}\t20\n" for index in range(manifest_rows)))
+
+        return path
+
+    @cache
+    def pairs_path() -> str:
+        path = os.path.join(workdir, "pairs.txt")
+
+        with open(path, "w") as handle:
+            handle.write("".join(f"pair{index}\t{forward}\t{reverse}\n" for index in range(10)))
+
+        return path
+
+    def small_primers() -> list[str]:
+        return primers()[:min(primer_count, 200)]
+
+    def requests() -> str:
+        return "".join(
+            json.dumps({"id": index, "op": "temp", "params": {"forward_primer": primer, "reverse_primer": primer, "nmer": 20}}) + "\n"
+            for index, primer in enumerate(small_primers())
+        )
+
+    design = ["--nmer", "20", "--forward-re", RE_SITES[0], "--reverse-re", RE_SITES[1]]
+    two_genes = ["--seq", gene, "--seq-b", gene_b, "--mut", "GGG"]
+    # Length of the large template, as written by synthetic_gene.
+    large_length = 3 * max(1, max(gene_sizes) // 3 - 2) + 6
+
+    # Each entry returns (argv, items per run) when its benchmark is selected.
+    commands = {
+        "primer": lambda: (["primer", "--seq", gene, *design], 1),
+        "primer_file": lambda: (["primer", "--seq-file", large_path(), *design], 1),
+        "primer_target_tm": lambda: (["primer", "--seq", gene, "--target-tm", "60", "--forward-re", RE_SITES[0], "--reverse-re", RE_SITES[1]], 1),
+        "mut-primer": lambda: (["mut-primer", "--seq", gene, "--pos", "10", "--mut", "GCG", "--nmer", "15"], 1),
+        "mut-primer_scan": lambda: (["mut-primer", "--seq", gene, "--nmer", "15", "--scan", "saturation"], 19 * (len(gene) // 3 - 2)),
+        "temp": lambda: (["temp", "--forward", forward, "--reverse", reverse, "--nmer", "20"], 2),
+        "temp_file": lambda: (["temp", "--file", primer_path(), "--nmer", "20", "--tm-model", "nn"], primer_count),
+        "len": lambda: (["len", "--seq", gene, "--forward", forward, "--reverse", reverse, "--nmer", "20"], 1),
+        "all": lambda: (["all", *two_genes, *design], 1),
+        "all_dimers": lambda: (["all", *two_genes, *design, "--dimers", "--tm-model", "nn"], 1),
+        "all_cache": lambda: (["all", *two_genes, *design, "--cache", cache_path], 1),
+        "batch": lambda: (["batch", "--manifest", manifest_path(), "--forward-re", RE_SITES[0], "--reverse-re", RE_SITES[1], "--workers", "2"], manifest_rows),
+        "specificity": lambda: (["specificity", "--reference", reference_path(), "--file", primer_path()], primer_count),
+        "restriction": lambda: (["restriction", "--seq-file", large_path()], large_length),
+        "dimer": lambda: (["dimer", *[arg for primer in small_primers() for arg in ("--primer", primer)]], len(small_primers())),
+        "pcr": lambda: (["pcr", "--seq-file", large_path(), "--pairs", pairs_path()], large_length),
+        "assembly": lambda: (["assembly", *[arg for index in range(20) for arg in ("--seq", synthetic_gene(min(gene_sizes), seed=200 + index))]], 20),
+        "panel": lambda: (["panel", "--workers", "1", *[arg for index in range(50) for arg in ("--seq", synthetic_gene(min(gene_sizes) + 20 * index, seed=300 + index))]], 50),
+        "cache": lambda: (["cache", "stats", "--path", cache_path], 1),
+        "serve": lambda: (["serve"], len(small_primers())),
+    }
+
+    for name, command in commands.items():
+        if not suite.selected(f"cli/{name}"):
+            continue
+
+        argv, items = command()
+        stdin = requests() if name == "serve" else None
+        suite.record(f"cli/{name}", lambda: run_cli(argv, stdin), items)
+
+    # Every call of the cold benchmark designs into a new database, so it always misses.
+    cold_paths = (os.path.join(workdir, f"cold{index}.sqlite") for index in range(suite.repeat))
+    suite.record("cli/all_cache_cold", lambda: run_cli(["all", *two_genes, *design, "--cache", next(cold_paths)]), 1)
+
+    # The cached connections point into workdir, which is removed after this run.
+    open_cache.cache_clear()
+
+def environment() -> dict:
+    """
+    Describe the machine and code version the benchmarks ran on.
+    """
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def run(args: argparse.Namespace) -> None:
+    """
+    Run the selected benchmark groups and write the results as JSON.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+
+    gene_sizes = QUICK_GENE_SIZES if args.quick else GENE_SIZES
+    batch_sizes = QUICK_BATCH_SIZES if args.quick else BATCH_SIZES
+    suite = Suite(args.repeat, args.filter)
+
+    if args.group in ("all", "functions"):
+        bench_functions(suite, gene_sizes, batch_sizes)
+
+    if args.group in ("all", "cli"):
+        with tempfile.TemporaryDirectory() as workdir:
+            bench_cli(suite, workdir, gene_sizes, batch_sizes)
+
+    report = {"environment": environment(), "quick": args.quick, "repeat": args.repeat, "results": suite.results}
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+def compare(args: argparse.Namespace) -> int:
+    """
+    Compare two benchmark reports and return 1 if any throughput dropped past the threshold.
+
+    Baseline benchmarks missing from the current report also fail the
+    comparison, unless --allow-missing is given (e.g. for a --filter run).
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)["results"]
+
+    with open(args.current) as handle:
+        current = json.load(handle)["results"]
+
+    regressions = []
+    print(f"{'benchmark':<48} {'baseline':>14} {'current':>14} {'change':>9}")
+
+    for name in sorted(set(baseline) & set(current)):
+        before, after = baseline[name]["throughput"], current[name]["throughput"]
+        change = after / before - 1 if before else 0.0
+        flag = ""
+
+        if change < -args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+
+        print(f"{name:<48} {before:>14.1f} {after:>14.1f} {change:>+8.1%}{flag}")
+
+    missing = sorted(set(baseline) - set(current))
+
+    if missing:
+        print(f"\n{len(missing)} baseline benchmark(s) missing from the current results: {', '.join(missing)}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}.", file=sys.stderr)
+
+    if missing and not args.allow_missing:
+        print(f"\n{len(missing)} baseline benchmark(s) did not run; pass --allow-missing if that is expected.", file=sys.stderr)
+
+    return 1 if regressions or (missing and not args.allow_missing) else 0
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite and performance regression gate for the design pipeline.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and write the results as JSON.")
+    run_parser.add_argument("--output", dest="output", required=False,
+                            help="Path of the JSON results file. Defaults to standard output.")
+    run_parser.add_argument("--quick", dest="quick", action="store_true",
+                            help="Use templates up to 100 kb and batches up to 10^4 primers.")
+    run_parser.add_argument("--group", dest="group", choices=("all", "functions", "cli"), default="all",
+                            help="Benchmark only the core functions or only the main.py subcommands.")
+    run_parser.add_argument("--repeat", dest="repeat", type=int, default=3,
+                            help="Number of timed runs per benchmark; the best one is kept.")
+    run_parser.add_argument("--filter", dest="filter", required=False,
+                            help="Only keep benchmarks whose name matches this regular expression.")
+
+    compare_parser = subparsers.add_parser("compare", help="Fail if throughput dropped compared with a baseline report.")
+    compare_parser.add_argument("baseline", help="Baseline JSON results.")
+    compare_parser.add_argument("current", help="Current JSON results.")
+    compare_parser.add_argument("--threshold", dest="threshold", type=float, default=0.2,
+                                help="Largest allowed drop in throughput, as a fraction (0.2 = 20%%).")
+    compare_parser.add_argument("--allow-missing", dest="allow_missing", action="store_true",
+                                help="Do not fail when baseline benchmarks are missing from the current results.")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run(args)
+        return 0
+
+    return compare(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,310 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "primer-design-utils", "designs.sqlite")
+
+# Bump whenever the design functions change their results, so stale entries are never returned.
+CACHE_VERSION = 3
+
+EVICTION_INTERVAL = 64
+
+
+def sequence_digest(sequence) -> str:
+    """
+    Return the SHA-256 digest of a normalized sequence, reading large records in chunks.
+
+    Args:
+        sequence: A str or a SequenceRecord.
+    """
+
+    digest = hashlib.sha256()
+
+    for chunk in sequence.iter_chunks() if hasattr(sequence, "iter_chunks") else [sequence]:
+        digest.update(chunk.encode("ascii"))
+
+    return digest.hexdigest()
+
+def design_inputs(command: str, sequences: dict, **params) -> dict:
+    """
+    Return the cache inputs of a design, with each sequence replaced by its digest.
+
+    Args:
+        command (str): Name of the design pipeline, so different pipelines never share entries.
+        sequences (dict): Mapping of input name to sequence (str or SequenceRecord).
+        **params: Every other parameter that affects the result.
+    """
+
+    return {"command": command, **{name: sequence_digest(sequence) for name, sequence in sequences.items()}, **params}
+
+def cache_key(inputs: dict) -> str:
+    """
+    Return the content address of a design: the SHA-256 of its canonical JSON inputs.
+
+    Args:
+        inputs (dict): JSON-serializable design inputs, with sequences replaced by their digests.
+    """
+
+    canonical = json.dumps({"version": CACHE_VERSION, **inputs}, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class DesignCache:
+    """
+    Persistent SQLite cache of design results, keyed by the hash of their inputs.
+
+    A bounded in-memory LRU layer sits in front of the database so repeated
+    designs within one process (e.g. a batch run) do not touch the disk.
+    Hits served from memory are counted too; they are written to the
+    database (with their access time) in one batch by flush, which runs
+    every EVICTION_INTERVAL such hits and before stats, listing, eviction,
+    purging and closing.
+    The database is trimmed to `max_entries` rows and `max_mb` of stored
+    results, evicting the least recently used entries first.
+
+    Args:
+        path (str, optional): Path of the SQLite database. Defaults to DEFAULT_CACHE_PATH.
+        max_entries (int, optional): Maximum number of stored designs. Defaults to 100000.
+        max_mb (float, optional): Maximum total size of stored results in MB. Defaults to 256.0.
+        memory_entries (int, optional): Number of designs kept in memory. Defaults to 4096.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 100000, max_mb: float = 256.0, memory_entries: int = 4096) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.memory_entries = memory_entries
+        self.memory: OrderedDict[str, dict] = OrderedDict()
+        # Hits served from memory and not yet written to the database, by key.
+        self.pending: dict[str, int] = {}
+        self.pending_hits = 0
+        self.writes = 0
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS designs ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS designs_last_access ON designs (last_access)")
+        self.connection.commit()
+
+    def remember(self, key: str, value: dict) -> None:
+        """
+        Store a result in the in-memory LRU layer.
+
+        Args:
+            key (str): Cache key.
+            value (dict): Design result.
+        """
+
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key: str) -> dict | None:
+        """
+        Return the cached result for a key, or None if it is not cached.
+
+        Args:
+            key (str): Cache key.
+        """
+
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.pending[key] = self.pending.get(key, 0) + 1
+            self.pending_hits += 1
+
+            if self.pending_hits >= EVICTION_INTERVAL:
+                self.flush()
+
+            return self.memory[key]
+
+        row = self.connection.execute("SELECT value FROM designs WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        with self.connection:
+            self.connection.execute("UPDATE designs SET last_access = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+
+        value = json.loads(row[0])
+        self.remember(key, value)
+
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        """
+        Store a result, evicting old entries every EVICTION_INTERVAL writes.
+
+        Args:
+            key (str): Cache key.
+            value (dict): JSON-serializable design result.
+        """
+
+        encoded = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO designs (key, value, size, created, last_access, hits) VALUES (?, ?, ?, ?, ?, 0)",
+                (key, encoded, len(encoded), now, now)
+            )
+
+        self.remember(key, json.loads(encoded))
+        self.writes += 1
+
+        if self.writes % EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def get_or_compute(self, inputs: dict, compute: Callable[[], dict]) -> dict:
+        """
+        Return the cached result for the inputs, computing and storing it on a miss.
+
+        Args:
+            inputs (dict): JSON-serializable design inputs.
+            compute (Callable[[], dict]): Function computing the result.
+        """
+
+        key = cache_key(inputs)
+        value = self.get(key)
+
+        if value is None:
+            value = compute()
+            self.put(key, value)
+            value = self.memory[key]
+
+        return value
+
+    def flush(self) -> None:
+        """
+        Write the hits served from memory since the last flush, and their access time, to the database.
+        """
+
+        if not self.pending:
+            return
+
+        now = time.time()
+
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE designs SET last_access = ?, hits = hits + ? WHERE key = ?",
+                [(now, hits, key) for key, hits in self.pending.items()]
+            )
+
+        self.pending.clear()
+        self.pending_hits = 0
+
+    def evict(self) -> int:
+        """
+        Delete least recently used entries until the size limits are met, returning how many were removed.
+        """
+
+        self.flush()
+        count, size = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM designs").fetchone()
+
+        if count <= self.max_entries and size <= self.max_bytes:
+            return 0
+
+        removed = 0
+        rows = self.connection.execute("SELECT key, size FROM designs ORDER BY last_access ASC").fetchall()
+
+        with self.connection:
+            for key, entry_size in rows:
+                if count <= self.max_entries and size <= self.max_bytes:
+                    break
+
+                self.connection.execute("DELETE FROM designs WHERE key = ?", (key,))
+                self.memory.pop(key, None)
+                count -= 1
+                size -= entry_size
+                removed += 1
+
+        return removed
+
+    def stats(self) -> dict:
+        """
+        Return the number of entries, total stored size, total hits (from memory or disk) and limits of the cache.
+        """
+
+        self.flush()
+        count, size, hits = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM designs").fetchone()
+
+        return {
+            "path": self.path,
+            "entries": count,
+            "bytes": size,
+            "hits": hits,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+    def entries(self, limit: int = 20) -> list[dict]:
+        """
+        Return the most recently used entries without their values.
+
+        Args:
+            limit (int, optional): Maximum number of entries. Defaults to 20.
+        """
+
+        self.flush()
+        rows = self.connection.execute(
+            "SELECT key, size, created, last_access, hits FROM designs ORDER BY last_access DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+        return [dict(zip(("key", "size", "created", "last_access", "hits"), row)) for row in rows]
+
+    def purge(self, older_than: float | None = None) -> int:
+        """
+        Delete all entries, or only those not used for `older_than` seconds, returning how many were removed.
+
+        Args:
+            older_than (float | None, optional): Minimum age since last use in seconds. Defaults to None.
+        """
+
+        self.flush()
+
+        with self.connection:
+            if older_than is None:
+                removed = self.connection.execute("DELETE FROM designs").rowcount
+            else:
+                removed = self.connection.execute("DELETE FROM designs WHERE last_access < ?", (time.time() - older_than,)).rowcount
+
+        self.memory.clear()
+
+        return removed
+
+    def close(self) -> None:
+        """
+        Apply the size limits and close the database.
+        """
+
+        self.evict()
+        self.connection.close()
+
+@lru_cache(maxsize=None)
+def open_cache(path: str = DEFAULT_CACHE_PATH, max_entries: int = 100000, max_mb: float = 256.0) -> DesignCache:
+    """
+    Return the process-wide cache for a database path, opening it on first use.
+
+    Batch workers call this for every row, so each worker process keeps one
+    connection and one in-memory layer for its whole lifetime.
+
+    Args:
+        path (str, optional): Path of the SQLite database. Defaults to DEFAULT_CACHE_PATH.
+        max_entries (int, optional): Maximum number of stored designs. Defaults to 100000.
+        max_mb (float, optional): Maximum total size of stored results in MB. Defaults to 256.0.
+    """
+
+    return DesignCache(path, max_entries, max_mb)
\ No newline at end of file
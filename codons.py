@@ -0,0 +1,73 @@
+GENETIC_CODE = {
+    "TTT": "F", "TTC": "F", "TTA": "L", "TTG": "L",
+    "CTT": "L", "CTC": "L", "CTA": "L", "CTG": "L",
+    "ATT": "I", "ATC": "I", "ATA": "I", "ATG": "M",
+    "GTT": "V", "GTC": "V", "GTA": "V", "GTG": "V",
+    "TCT": "S", "TCC": "S", "TCA": "S", "TCG": "S",
+    "CCT": "P", "CCC": "P", "CCA": "P", "CCG": "P",
+    "ACT": "T", "ACC": "T", "ACA": "T", "ACG": "T",
+    "GCT": "A", "GCC": "A", "GCA": "A", "GCG": "A",
+    "TAT": "Y", "TAC": "Y", "TAA": "*", "TAG": "*",
+    "CAT": "H", "CAC": "H", "CAA": "Q", "CAG": "Q",
+    "AAT": "N", "AAC": "N", "AAA": "K", "AAG": "K",
+    "GAT": "D", "GAC": "D", "GAA": "E", "GAG": "E",
+    "TGT": "C", "TGC": "C", "TGA": "*", "TGG": "W",
+    "CGT": "R", "CGC": "R", "CGA": "R", "CGG": "R",
+    "AGT": "S", "AGC": "S", "AGA": "R", "AGG": "R",
+    "GGT": "G", "GGC": "G", "GGA": "G", "GGG": "G",
+}
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+# Most frequently used codon for each amino acid (Kazusa codon usage database).
+CODON_USAGE = {
+    "ecoli": {
+        "A": "GCG", "C": "TGC", "D": "GAT", "E": "GAA", "F": "TTT",
+        "G": "GGC", "H": "CAT", "I": "ATT", "K": "AAA", "L": "CTG",
+        "M": "ATG", "N": "AAC", "P": "CCG", "Q": "CAG", "R": "CGC",
+        "S": "AGC", "T": "ACC", "V": "GTG", "W": "TGG", "Y": "TAT",
+    },
+    "human": {
+        "A": "GCC", "C": "TGC", "D": "GAC", "E": "GAG", "F": "TTC",
+        "G": "GGC", "H": "CAC", "I": "ATC", "K": "AAG", "L": "CTG",
+        "M": "ATG", "N": "AAC", "P": "CCC", "Q": "CAG", "R": "AGA",
+        "S": "AGC", "T": "ACC", "V": "GTG", "W": "TGG", "Y": "TAC",
+    },
+}
+
+
+def translate_codon(codon: str) -> str:
+    """
+    Return the one-letter amino acid encoded by a codon, or "X" if it is not a valid codon.
+
+    Args:
+        codon (str): Three-base codon (5' to 3').
+    """
+
+    return GENETIC_CODE.get(codon.upper(), "X")
+
+def parse_positions(spec: str, codon_count: int) -> list[int]:
+    """
+    Parse a 1-based codon position list such as "2-10,15,20-25".
+
+    Args:
+        spec (str): Comma-separated positions and inclusive ranges.
+        codon_count (int): Number of codons in the target sequence.
+    """
+
+    positions = []
+
+    for part in spec.replace(" ", "").split(","):
+        if part == "":
+            continue
+
+        start, sep, stop = part.partition("-")
+        first = int(start)
+        last = int(stop) if sep else first
+
+        if first < 1 or last > codon_count or first > last:
+            raise ValueError(f"Invalid position range {part!r} for a sequence of {codon_count} codons.")
+
+        positions.extend(range(first, last + 1))
+
+    return positions
\ No newline at end of file
@@ -0,0 +1,247 @@
+import math
+
+import numpy as np
+
+from temp import BASE_CODES, GAS_CONSTANT, NN_DH, NN_DS
+
+
+TEMPERATURE = 37.0
+
+# Free energy (kcal/mol) of each nearest-neighbor stack at TEMPERATURE.
+NN_DG = NN_DH - (TEMPERATURE + 273.15) * NN_DS / 1000
+
+# Duplex initiation free energy (SantaLucia & Hicks, 2004).
+INIT_DG = 1.96
+
+# Hairpin loop initiation free energies (kcal/mol) by loop length (SantaLucia & Hicks, 2004).
+HAIRPIN_LOOP_DG = {3: 3.5, 4: 3.5, 5: 3.3, 6: 4.0, 7: 4.2, 8: 4.3, 9: 4.5, 10: 4.6}
+
+DIMER_DG_THRESHOLD = -6.0
+THREE_PRIME_RUN_THRESHOLD = 4
+HAIRPIN_DG_THRESHOLD = -3.0
+
+# Columns of the structured dimer output: "primer" records hold one report per
+# primer, "pair" records one flagged cross-dimer.
+DIMER_FIELDS = [
+    "record",
+    "name",
+    "hairpin_dg",
+    "self_dimer_dg",
+    "self_three_prime_run",
+    "flagged",
+    "primer_a",
+    "primer_b",
+    "dg",
+    "three_prime_run",
+    "max_run",
+]
+
+
+def encode_right_aligned(primers: list[str]) -> np.ndarray:
+    """
+    Encode primers into an (n, longest) array of base codes with their 3' ends in the last column.
+
+    Padding uses code 4, which never pairs.
+
+    Args:
+        primers (list[str]): Primer sequences (5' to 3').
+    """
+
+    width = max((len(primer) for primer in primers), default=0)
+    codes = np.full((len(primers), width), 4, dtype=np.uint8)
+
+    for row, primer in enumerate(primers):
+        if primer:
+            codes[row, width - len(primer):] = BASE_CODES[np.frombuffer(primer.encode("ascii"), dtype=np.uint8)]
+
+    return codes
+
+def dimer_matrix(primers_a: list[str], primers_b: list[str] | None = None) -> dict[str, np.ndarray]:
+    """
+    Score every primer of `primers_a` against every primer of `primers_b` for duplex formation.
+
+    The two primers are aligned antiparallel at every offset and the whole
+    (len(primers_a), len(primers_b)) block is scored at once with NumPy, one
+    alignment column at a time. Returned arrays:
+
+    - "dg": free energy (kcal/mol, 37 °C) of the most stable contiguous duplex
+    - "max_run": longest contiguous run of complementary bases
+    - "three_prime_run": longest complementary run that includes the 3' terminal base of either primer
+    - "matches": largest number of complementary bases in any single alignment
+
+    Args:
+        primers_a (list[str]): Primer sequences (5' to 3').
+        primers_b (list[str] | None, optional): Primer sequences (5' to 3'). Defaults to primers_a.
+    """
+
+    primers_b = primers_a if primers_b is None else primers_b
+    codes_a = encode_right_aligned(primers_a)
+    codes_b = encode_right_aligned(primers_b)
+    width = max(codes_a.shape[1], codes_b.shape[1])
+    codes_a = np.pad(codes_a, ((0, 0), (width - codes_a.shape[1], 0)), constant_values=4)
+    codes_b = np.pad(codes_b, ((0, 0), (width - codes_b.shape[1], 0)), constant_values=4)
+
+    # Primer B read 3' to 5' and complemented, so a column pairs when the codes are equal.
+    paired_b = np.where(codes_b < 4, 3 - codes_b.astype(np.int16), 5)[:, ::-1]
+    stacks_a = np.zeros(codes_a.shape)
+    stacks_a[:, 1:] = NN_DG[codes_a[:, :-1].astype(np.intp) * 5 + codes_a[:, 1:]]
+
+    shape = (len(primers_a), len(primers_b))
+    best_dg = np.zeros(shape)
+    max_run = np.zeros(shape, dtype=np.int64)
+    three_prime_run = np.zeros(shape, dtype=np.int64)
+    matches = np.zeros(shape, dtype=np.int64)
+
+    for shift in range(-(width - 1), width):
+        columns = range(max(0, shift), min(width, width + shift))
+        run = np.zeros(shape, dtype=np.int64)
+        run_dg = np.zeros(shape)
+        count = np.zeros(shape, dtype=np.int64)
+        previous = np.zeros(shape, dtype=bool)
+
+        for column in columns:
+            pairs = codes_a[:, np.newaxis, column] == paired_b[np.newaxis, :, column - shift]
+            run = np.where(pairs, run + 1, 0)
+            run_dg = np.where(pairs & previous, run_dg + stacks_a[:, np.newaxis, column], 0.0)
+            count += pairs
+            previous = pairs
+
+            max_run = np.maximum(max_run, run)
+            best_dg = np.minimum(best_dg, np.where(run >= 2, run_dg + INIT_DG, 0.0))
+
+            # The 3' end of primer B sits in column `shift`; a run covering every column since then includes it.
+            if shift >= 0:
+                three_prime_run = np.maximum(three_prime_run, np.where(run == column - shift + 1, run, 0))
+
+        # The 3' end of primer A sits in the last column; the run ending there includes it.
+        if shift >= 0:
+            three_prime_run = np.maximum(three_prime_run, run)
+
+        matches = np.maximum(matches, count)
+
+    return {"dg": best_dg, "max_run": max_run, "three_prime_run": three_prime_run, "matches": matches}
+
+def cross_dimer(primer_a: str, primer_b: str) -> dict[str, float]:
+    """
+    Score duplex formation between two primers.
+
+    Args:
+        primer_a (str): First primer sequence (5' to 3').
+        primer_b (str): Second primer sequence (5' to 3').
+    """
+
+    scores = dimer_matrix([primer_a], [primer_b])
+
+    return {key: values[0, 0].item() for key, values in scores.items()}
+
+def self_dimer(primer: str) -> dict[str, float]:
+    """
+    Score duplex formation between two copies of the same primer.
+
+    Args:
+        primer (str): Primer sequence (5' to 3').
+    """
+
+    return cross_dimer(primer, primer)
+
+def hairpin_loop_dg(loop: int) -> float:
+    """
+    Return the initiation free energy of a hairpin loop of the given length.
+
+    Args:
+        loop (int): Number of unpaired bases in the loop.
+    """
+
+    if loop in HAIRPIN_LOOP_DG:
+        return HAIRPIN_LOOP_DG[loop]
+
+    kt = GAS_CONSTANT * (TEMPERATURE + 273.15) / 1000
+
+    return HAIRPIN_LOOP_DG[10] + 2.44 * kt * math.log(loop / 10)
+
+def hairpin(primer: str, min_loop: int = 3, min_stem: int = 3) -> dict[str, float]:
+    """
+    Find the most stable single-stem hairpin of a primer.
+
+    Returns its free energy (kcal/mol, 37 °C; 0.0 if none forms), stem and
+    loop lengths, and whether the stem includes the 3' terminal base.
+
+    Args:
+        primer (str): Primer sequence (5' to 3').
+        min_loop (int, optional): Minimum number of bases in the loop. Defaults to 3.
+        min_stem (int, optional): Minimum number of base pairs in the stem. Defaults to 3.
+    """
+
+    codes = BASE_CODES[np.frombuffer(primer.encode("ascii"), dtype=np.uint8)].astype(np.intp)
+    length = len(codes)
+    best = {"dg": 0.0, "stem": 0, "loop": 0, "three_prime": False}
+
+    # (i, j) is the outermost pair of the stem, which extends inwards with pairs (i + k, j - k).
+    for i in range(length):
+        for j in range(i + min_loop + 1, length):
+            if codes[i] > 3 or codes[i] + codes[j] != 3:
+                continue
+
+            if i > 0 and j + 1 < length and codes[i - 1] < 4 and codes[i - 1] + codes[j + 1] == 3:
+                continue
+
+            stem = 1
+            dg = 0.0
+
+            while j - i - 2 * stem - 1 >= min_loop and codes[i + stem] < 4 and codes[i + stem] + codes[j - stem] == 3:
+                dg += NN_DG[codes[i + stem - 1] * 5 + codes[i + stem]]
+                stem += 1
+
+            if stem < min_stem:
+                continue
+
+            loop = (j - stem) - (i + stem) + 1
+            total = float(dg + hairpin_loop_dg(loop))
+
+            if total < best["dg"]:
+                best = {"dg": total, "stem": stem, "loop": loop, "three_prime": j == length - 1}
+
+    return best
+
+def analyze_primers(names: list[str], primers: list[str]) -> tuple[list[dict], list[dict]]:
+    """
+    Run hairpin, self-dimer and all-vs-all cross-dimer analysis on a primer set.
+
+    Returns one report per primer and one per flagged pair (dimer ΔG below
+    DIMER_DG_THRESHOLD or a 3' complementary run of at least
+    THREE_PRIME_RUN_THRESHOLD bases).
+
+    Args:
+        names (list[str]): Primer names.
+        primers (list[str]): Primer sequences (5' to 3').
+    """
+
+    scores = dimer_matrix(primers)
+    reports = []
+
+    for index, (name, primer) in enumerate(zip(names, primers)):
+        fold = hairpin(primer)
+        reports.append({
+            "name": name,
+            "hairpin_dg": fold["dg"],
+            "hairpin_stem": fold["stem"],
+            "self_dimer_dg": scores["dg"][index, index].item(),
+            "self_three_prime_run": scores["three_prime_run"][index, index].item(),
+            "flagged": fold["dg"] < HAIRPIN_DG_THRESHOLD
+                or scores["dg"][index, index] < DIMER_DG_THRESHOLD
+                or scores["three_prime_run"][index, index] >= THREE_PRIME_RUN_THRESHOLD,
+        })
+
+    flagged = (scores["dg"] < DIMER_DG_THRESHOLD) | (scores["three_prime_run"] >= THREE_PRIME_RUN_THRESHOLD)
+    pairs = [
+        {
+            "a": names[i],
+            "b": names[j],
+            "dg": scores["dg"][i, j].item(),
+            "three_prime_run": scores["three_prime_run"][i, j].item(),
+            "max_run": scores["max_run"][i, j].item(),
+        }
+        for i, j in zip(*np.nonzero(np.triu(flagged, k=1)))
+    ]
+
+    return reports, pairs
\ No newline at end of file
@@ -0,0 +1,209 @@
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+from len import slice_length
+from primer import reverse_complement
+
+
+AMPLICON_FIELDS = [
+    "template",
+    "pair",
+    "kind",
+    "start",
+    "end",
+    "length",
+    "forward_mismatches",
+    "reverse_mismatches",
+]
+
+
+def find_all(text: str, pattern: str) -> Iterator[int]:
+    """
+    Yield the start of every (possibly overlapping) exact occurrence of a pattern.
+
+    Args:
+        text (str): Text to search.
+        pattern (str): Pattern to find.
+    """
+
+    position = text.find(pattern)
+
+    while position != -1:
+        yield position
+        position = text.find(pattern, position + 1)
+
+def count_mismatches(a: str, b: str) -> int:
+    """
+    Count the positions where two equally long sequences differ.
+
+    Args:
+        a (str): First sequence.
+        b (str): Second sequence.
+    """
+
+    return sum(x != y for x, y in zip(a, b))
+
+def binding_sites(template: str, primer: str, anneal: int = 15, mismatches: int = 2, seed: int = 5) -> list[dict]:
+    """
+    Find every site where the 3' end of a primer can anneal to a template, on either strand.
+
+    The last `seed` bases of the primer must match exactly and the last
+    `anneal` bases with at most `mismatches` substitutions; anything further
+    5' may be an overhang (RE site, tag). Each site reports the template
+    coordinates of the annealed region, extended 5' while the primer keeps
+    matching, its mismatches and the length of the remaining overhang.
+    Strand "+" means the primer extends towards higher positions.
+
+    Args:
+        template (str): Upper-case template sequence (5' to 3').
+        primer (str): Upper-case primer sequence (5' to 3').
+        anneal (int, optional): Number of 3' bases that must anneal. Defaults to 15.
+        mismatches (int, optional): Maximum number of mismatches within the annealed bases. Defaults to 2.
+        seed (int, optional): Number of 3' bases that must match exactly. Defaults to 5.
+    """
+
+    anneal = min(anneal, len(primer))
+    seed = min(seed, anneal)
+    core = primer[-anneal:]
+    core_rc = reverse_complement(core)
+    length = len(template)
+    sites = []
+
+    if seed == 0:
+        return sites
+
+    for position in find_all(template, core[-seed:]):
+        start = position + seed - anneal
+
+        if start < 0:
+            continue
+
+        count = count_mismatches(core[:anneal - seed], template[start:position])
+
+        if count <= mismatches:
+            extension = 0
+
+            while extension < len(primer) - anneal and start - extension > 0 and primer[-anneal - extension - 1] == template[start - extension - 1]:
+                extension += 1
+
+            sites.append({"strand": "+", "start": start - extension, "end": start + anneal, "mismatches": count, "overhang": len(primer) - anneal - extension})
+
+    primer_rc = reverse_complement(primer)
+
+    for start in find_all(template, core_rc[:seed]):
+        if start + anneal > length:
+            continue
+
+        count = count_mismatches(core_rc[seed:], template[start + seed:start + anneal])
+
+        if count <= mismatches:
+            end = start + anneal
+
+            while end - start < len(primer) and end < length and primer_rc[end - start] == template[end]:
+                end += 1
+
+            sites.append({"strand": "-", "start": start, "end": end, "mismatches": count, "overhang": len(primer) - (end - start)})
+
+    return sites
+
+def find_amplicons(
+        template: str,
+        primers: dict[str, str],
+        anneal: int = 15,
+        mismatches: int = 2,
+        seed: int = 5,
+        max_size: int = 10000,
+        sites: dict[str, list[dict]] | None = None
+    ) -> list[dict]:
+    """
+    List every product a set of primers can amplify from a template.
+
+    Any primer annealing on the "+" strand can pair with any primer annealing
+    downstream on the "-" strand, so besides the intended forward/reverse
+    product this also reports off-target products and products of a single
+    primer (e.g. forward/forward). Product lengths include the 5' overhangs
+    and are worked out from the site coordinates without building the product.
+
+    Args:
+        template (str): Upper-case template sequence (5' to 3').
+        primers (dict[str, str]): Mapping of primer role (e.g. "F", "R") to primer sequence.
+        anneal (int, optional): Number of 3' bases that must anneal. Defaults to 15.
+        mismatches (int, optional): Maximum number of mismatches within the annealed bases. Defaults to 2.
+        seed (int, optional): Number of 3' bases that must match exactly. Defaults to 5.
+        max_size (int, optional): Largest product reported, in bp. Defaults to 10000.
+        sites (dict[str, list[dict]] | None, optional): Binding sites already found for each role. Defaults to None.
+    """
+
+    if sites is None:
+        sites = {role: binding_sites(template, primer, anneal, mismatches, seed) for role, primer in primers.items()}
+
+    forward_sites = sorted(
+        ((site["start"], role, site) for role in primers for site in sites[role] if site["strand"] == "+"),
+        key=lambda item: item[0]
+    )
+    reverse_sites = sorted(
+        ((site["end"], role, site) for role in primers for site in sites[role] if site["strand"] == "-"),
+        key=lambda item: item[0]
+    )
+    reverse_ends = [end for end, _, _ in reverse_sites]
+    amplicons = []
+
+    for start, forward_role, forward_site in forward_sites:
+        for end, reverse_role, reverse_site in reverse_sites[bisect_left(reverse_ends, forward_site["end"]):]:
+            if end - start > max_size:
+                break
+
+            length = forward_site["overhang"] + slice_length(template, start, end) + reverse_site["overhang"]
+
+            if reverse_site["start"] < start or length > max_size:
+                continue
+
+            amplicons.append({
+                "kind": f"{forward_role}-{reverse_role}",
+                "start": start,
+                "end": end,
+                "length": length,
+                "forward_mismatches": forward_site["mismatches"],
+                "reverse_mismatches": reverse_site["mismatches"],
+            })
+
+    return amplicons
+
+def run_pcr(
+        templates: Iterable[tuple[str, str]],
+        pairs: list[tuple[str, str, str]],
+        anneal: int = 15,
+        mismatches: int = 2,
+        seed: int = 5,
+        max_size: int = 10000
+    ) -> Iterator[dict]:
+    """
+    Run in-silico PCR of every primer pair of a panel on every template.
+
+    Binding sites are searched once per distinct primer and template, then
+    combined for each pair.
+
+    Args:
+        templates (Iterable[tuple[str, str]]): (name, sequence) of each template.
+        pairs (list[tuple[str, str, str]]): (name, forward primer, reverse primer) of each pair.
+        anneal (int, optional): Number of 3' bases that must anneal. Defaults to 15.
+        mismatches (int, optional): Maximum number of mismatches within the annealed bases. Defaults to 2.
+        seed (int, optional): Number of 3' bases that must match exactly. Defaults to 5.
+        max_size (int, optional): Largest product reported, in bp. Defaults to 10000.
+    """
+
+    for template_name, template in templates:
+        template = str(template).upper()
+        primer_sites = {}
+
+        for _, forward, reverse in pairs:
+            for primer in (forward, reverse):
+                if primer not in primer_sites:
+                    primer_sites[primer] = binding_sites(template, primer, anneal, mismatches, seed)
+
+        for pair_name, forward, reverse in pairs:
+            primers = {"F": forward, "R": reverse} if forward != reverse else {"F": forward}
+            sites = {role: primer_sites[primer] for role, primer in primers.items()}
+
+            for amplicon in find_amplicons(template, primers, anneal, mismatches, seed, max_size, sites):
+                yield {"template": template_name, "pair": pair_name, **amplicon}
\ No newline at end of file
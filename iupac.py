@@ -0,0 +1,69 @@
+from itertools import product
+from math import prod
+from typing import Iterator
+
+
+IUPAC_CODES = {
+    "A": "A", "C": "C", "G": "G", "T": "T",
+    "R": "AG", "Y": "CT", "S": "CG", "W": "AT", "K": "GT", "M": "AC",
+    "B": "CGT", "D": "AGT", "H": "ACT", "V": "ACG", "N": "ACGT",
+}
+
+# Degenerate codes are complemented by the code standing for the complementary bases (e.g. K <-> M).
+IUPAC_COMPLEMENT = str.maketrans("ACGTRYSWKMBDHVNacgtryswkmbdhvn", "TGCAYRSWMKVHDBNtgcayrswmkvhdbn")
+
+IUPAC_COMPLEMENT_BYTES = bytes.maketrans(b"ACGTRYSWKMBDHVN", b"TGCAYRSWMKVHDBN")
+
+# Deletes the concrete bases, so only degenerate (or invalid) characters are left.
+CONCRETE_BASES = str.maketrans("", "", "ACGT")
+
+
+def degenerate_options(sequence: str) -> list[str]:
+    """
+    Return the concrete bases each position of a degenerate (IUPAC) sequence stands for.
+
+    Args:
+        sequence (str): DNA sequence, possibly with IUPAC codes (case-insensitive).
+    """
+
+    try:
+        return [IUPAC_CODES[base] for base in str(sequence).upper()]
+    except KeyError as exc:
+        raise ValueError(f"Invalid base {exc.args[0]!r} in sequence {sequence!r}.") from None
+
+def is_degenerate(sequence: str) -> bool:
+    """
+    Return whether a sequence holds anything other than upper-case A, C, G and T.
+
+    Args:
+        sequence (str): DNA sequence.
+    """
+
+    return bool(str(sequence).translate(CONCRETE_BASES))
+
+def degeneracy(sequence: str) -> int:
+    """
+    Return the number of concrete sequences a degenerate sequence stands for, without expanding it.
+
+    Args:
+        sequence (str): DNA sequence, possibly with IUPAC codes.
+    """
+
+    return prod(len(bases) for bases in degenerate_options(sequence))
+
+def expand_degenerate(sequence: str) -> Iterator[str]:
+    """
+    Lazily yield every concrete sequence a degenerate sequence stands for.
+
+    Variants are generated one at a time in lexicographic order of the IUPAC
+    code expansions (the last position varies fastest), so memory stays
+    constant however many there are. The sequence is validated before the
+    first variant is requested.
+
+    Args:
+        sequence (str): DNA sequence, possibly with IUPAC codes.
+    """
+
+    options = degenerate_options(sequence)
+
+    return ("".join(bases) for bases in product(*options))
\ No newline at end of file
@@ -1,21 +1,48 @@
-def get_length(target_seq_a: str, target_seq_b: str, forward_primer: str, reverse_primer: str, mut_primer: str, nmer: int) -> int:
+def slice_length(sequence, start: int, stop: int) -> int:
+    """
+    Return len(sequence[start:stop]) without building the slice.
+
+    Args:
+        sequence: Any sized sequence, e.g. a str or a memory-mapped record.
+        start (int): Slice start, negative values count from the end.
+        stop (int): Slice stop, negative values count from the end.
+    """
+
+    return len(range(len(sequence))[start:stop])
+
+def get_length(
+        target_seq_a: str,
+        target_seq_b: str,
+        forward_primer: str,
+        reverse_primer: str,
+        mut_primer: str,
+        nmer: int,
+        reverse_nmer: int | None = None,
+        mut_nmers: tuple[int, int] | None = None
+    ) -> int:
     """
     Calculate the length of the PCR product given the target sequence and primers.
 
+    Only the lengths of the template slices are needed, so they are worked
+    out arithmetically instead of concatenating the product.
+
     Args:
         target_seq (str): The DNA sequence of the target gene.
         forward_primer (str): The sequence of the forward primer.
         reverse_primer (str): The sequence of the reverse primer.
+        nmer (int): Number of template nucleotides in the primers.
+        reverse_nmer (int | None, optional): Template nucleotides in the reverse primer, if different from nmer. Defaults to None.
+        mut_nmers (tuple[int, int] | None, optional): Template nucleotides from sequence A and B in the mutation primer, if different from nmer. Defaults to None.
     """
-    if target_seq_b == "":
-        target_seq = target_seq_a[3 + nmer : -3 - nmer]
-        pcr_product = forward_primer + target_seq + reverse_primer
+    reverse_nmer = nmer if reverse_nmer is None else reverse_nmer
+    mut_nmer_a, mut_nmer_b = (nmer, nmer) if mut_nmers is None else mut_nmers
 
-        return len(pcr_product)
-    
-    target_seq_a = target_seq_a[3 + nmer : -nmer]
-    target_seq_b = target_seq_b[nmer : -3 - nmer]
+    if len(target_seq_b) == 0:
+        target_length = slice_length(target_seq_a, 3 + nmer, -3 - reverse_nmer)
 
-    pcr_product = forward_primer + target_seq_a + mut_primer + target_seq_b + reverse_primer
+        return len(forward_primer) + target_length + len(reverse_primer)
+    
+    target_length_a = slice_length(target_seq_a, 3 + nmer, -mut_nmer_a)
+    target_length_b = slice_length(target_seq_b, mut_nmer_b, -3 - reverse_nmer)
 
-    return len(pcr_product)
\ No newline at end of file
+    return len(forward_primer) + target_length_a + len(mut_primer) + target_length_b + len(reverse_primer)
\ No newline at end of file
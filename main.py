@@ -1,10 +1,429 @@
 import argparse
+import os
+import sys
+import time
+from contextlib import nullcontext, redirect_stdout
+from typing import ContextManager, Iterable
 
-from primer import construct_mutation_primers_single, construct_primers
-from temp import calculate_tm
+from batch import RESULT_FIELDS, read_manifest, run_batch
+from primer import construct_mutation_primers_single, construct_primers, iter_scanning_mutation_primers
+from codons import CODON_USAGE, parse_positions
+from temp import TM_MODELS, calculate_tm_batch, calculate_tm_model, calculate_tm_range
+from iupac import degeneracy, is_degenerate
 from len import get_length
+from seqio import SequenceRecord, load_record
+from optimize import optimize_primers
+from specificity import DEFAULT_K, open_index, screen_primer
+from restriction import DEFAULT_TOP_PAIRS, ENZYMES, RESTRICTION_FIELDS, SiteScanner, find_internal_sites, pair_rank, sticky_end, suggest_enzyme_pairs
+from seqio import iter_records
+from dimer import DIMER_FIELDS, analyze_primers, dimer_matrix
+from cache import DEFAULT_CACHE_PATH, DesignCache, design_inputs, open_cache
+from serve import serve
+from ispcr import AMPLICON_FIELDS, run_pcr
+from assembly import ASSEMBLY_FIELDS, design_assembly
+from panel import PANEL_FIELDS, design_panel
+from metrics import METRICS_FORMATS, profiling, stage
+from writers import BATCH_SIZE, WRITER_FORMATS, open_writer
 
 
+def read_sequence(text: str | None, path: str | None, record: str | None) -> str | SequenceRecord:
+    """
+    Return the target sequence given inline or as a FASTA/GenBank file.
+
+    Inline sequences are normalized to upper case without whitespace; file
+    records are memory-mapped and normalized lazily, so large templates are
+    never copied in full.
+
+    Args:
+        text (str | None): Inline sequence from the command line.
+        path (str | None): Path to a FASTA or GenBank file.
+        record (str | None): Name of the record to use from the file. Defaults to the first record.
+    """
+
+    if path:
+        return load_record(path, record)
+
+    return "".join(text.upper().split()) if text else ""
+
+def read_primer_file(path: str) -> tuple[list[str], list[str]]:
+    """
+    Read a primer list file with one primer per line.
+
+    Each line holds either a primer sequence or a name followed by the
+    sequence, separated by whitespace or a comma. Blank lines and lines
+    starting with '#' are ignored.
+
+    Args:
+        path (str): Path to the primer list file.
+    """
+
+    names, primers = [], []
+
+    with open(path) as handle:
+        for line in handle:
+            fields = line.replace(",", " ").split()
+
+            if not fields or fields[0].startswith("#"):
+                continue
+
+            name = fields[0] if len(fields) > 1 else f"primer{len(primers) + 1}"
+            names.append(name)
+            primers.append("".join(fields[1:] if len(fields) > 1 else fields).upper())
+
+    return names, primers
+
+def read_primer_pair_file(path: str) -> list[tuple[str, str, str]]:
+    """
+    Read a primer pair panel with one pair per line.
+
+    Each line holds a name, the forward primer and the reverse primer,
+    separated by whitespace or a comma; the name may be omitted. Blank lines
+    and lines starting with '#' are ignored.
+
+    Args:
+        path (str): Path to the primer pair file.
+    """
+
+    pairs = []
+
+    with open(path) as handle:
+        for line in handle:
+            fields = line.replace(",", " ").split()
+
+            if not fields or fields[0].startswith("#"):
+                continue
+
+            if len(fields) == 2:
+                fields = [f"pair{len(pairs) + 1}", *fields]
+
+            if len(fields) != 3:
+                raise ValueError(f"Invalid primer pair line: {line.strip()!r}")
+
+            pairs.append((fields[0], fields[1].upper(), fields[2].upper()))
+
+    return pairs
+
+def add_tm_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the Tm model selection and reaction condition options to a subparser.
+
+    Args:
+        parser (argparse.ArgumentParser): Subparser to extend.
+    """
+
+    parser.add_argument("--tm-model", dest="tm_model", choices=TM_MODELS, default="wallace",
+                        help="Melting temperature model: Wallace rule or SantaLucia nearest-neighbor.")
+    parser.add_argument("--na", dest="na", type=float, default=50.0,
+                        help="Monovalent cation concentration in mM (nearest-neighbor model only).")
+    parser.add_argument("--mg", dest="mg", type=float, default=0.0,
+                        help="Mg2+ concentration in mM (nearest-neighbor model only).")
+    parser.add_argument("--dntp", dest="dntp", type=float, default=0.0,
+                        help="dNTP concentration in mM (nearest-neighbor model only).")
+    parser.add_argument("--primer-conc", dest="primer_conc", type=float, default=250.0,
+                        help="Primer concentration in nM (nearest-neighbor model only).")
+    parser.add_argument("--ta-offset", dest="ta_offset", type=float, default=5.0,
+                        help="Annealing temperature is reported as Tm minus this offset.")
+
+def add_nmer_search_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options that choose each primer's nmer automatically to hit a target Tm.
+
+    Args:
+        parser (argparse.ArgumentParser): Subparser to extend.
+    """
+
+    parser.add_argument("--target-tm", dest="target_tm", type=float, required=False,
+                        help="Choose the nmer of each primer end to hit this Tm instead of using --nmer.")
+    parser.add_argument("--tm-window", dest="tm_window", type=float, default=2.5,
+                        help="Allowed deviation from --target-tm.")
+    parser.add_argument("--min-nmer", dest="min_nmer", type=int, default=15,
+                        help="Shortest nmer considered with --target-tm.")
+    parser.add_argument("--max-nmer", dest="max_nmer", type=int, default=35,
+                        help="Longest nmer considered with --target-tm.")
+    parser.add_argument("--gc-clamp", dest="gc_clamp", action="store_true",
+                        help="With --target-tm, require a G/C at the 3' end and at most 3 G/C in the last 5 bases.")
+
+def add_specificity_arguments(parser: argparse.ArgumentParser, required: bool = False) -> None:
+    """
+    Add the options for screening primers against a local reference k-mer index.
+
+    Args:
+        parser (argparse.ArgumentParser): Subparser to extend.
+        required (bool, optional): Whether screening is the purpose of the subcommand. Defaults to False.
+    """
+
+    screening = "" if required else " Primers are only screened when an index or reference is given."
+
+    parser.add_argument("--specificity-index", dest="specificity_index", required=False,
+                        help="Path of the k-mer index of the reference. Built from --reference if it does not exist." + screening)
+    parser.add_argument("--reference", dest="reference", required=False,
+                        help="Reference FASTA/GenBank file to build the k-mer index from (saved as <reference>.kidx by default).")
+    parser.add_argument("--kmer", dest="kmer", type=int, default=None,
+                        help=f"k-mer length of the index (default: that of an existing index, or {DEFAULT_K} when building). An index built with another k is rebuilt.")
+    parser.add_argument("--region", dest="region", type=int, default=15,
+                        help="Number of bases at the primer 3' end that must bind.")
+    parser.add_argument("--mismatches", dest="mismatches", type=int, default=1,
+                        help="Maximum number of mismatches allowed within the 3' region.")
+
+def screen_primers(args: argparse.Namespace, names: list[str], primers: list[str]) -> list[tuple[str, dict]]:
+    """
+    Screen primers against the reference index selected on the command line.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        names (list[str]): Primer names.
+        primers (list[str]): Primer sequences (5' to 3').
+    """
+
+    index = open_index(args.specificity_index, args.reference, args.kmer)
+
+    return [
+        (name, hit)
+        for name, primer in zip(names, primers) if primer != ""
+        for hit in screen_primer(index, primer, args.region, args.mismatches)
+    ]
+
+def tm_conditions(args: argparse.Namespace) -> dict:
+    """
+    Return the reaction conditions selected on the command line for the nearest-neighbor model.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+
+    if args.tm_model != "nn":
+        return {}
+
+    return {"na": args.na, "mg": args.mg, "dntp": args.dntp, "primer_conc": args.primer_conc}
+
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options of the persistent design cache to a subparser.
+
+    Args:
+        parser (argparse.ArgumentParser): Subparser to extend.
+    """
+
+    parser.add_argument("--cache", dest="cache", nargs="?", const=DEFAULT_CACHE_PATH, required=False,
+                        help=f"Reuse designs from a persistent SQLite cache, optionally at the given path (default {DEFAULT_CACHE_PATH}).")
+    parser.add_argument("--cache-max-entries", dest="cache_max_entries", type=int, default=100000,
+                        help="Maximum number of designs kept in the cache; least recently used ones are evicted.")
+    parser.add_argument("--cache-max-mb", dest="cache_max_mb", type=float, default=256.0,
+                        help="Maximum size of the cached results in MB; least recently used ones are evicted.")
+
+def cache_settings(args: argparse.Namespace) -> dict | None:
+    """
+    Return the cache settings selected on the command line, or None if caching is off.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+
+    if not args.cache:
+        return None
+
+    return {"path": args.cache, "max_entries": args.cache_max_entries, "max_mb": args.cache_max_mb}
+
+def write_records(args: argparse.Namespace, records: Iterable[dict], fields: list[str] | None = None) -> None:
+    """
+    Write result records to standard output in the structured --format given on the command line.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        records (Iterable[dict]): Records to write.
+        fields (list[str] | None, optional): Columns to write, in order; taken from the first record if None. Defaults to None.
+    """
+
+    with open_writer(args.format, None, fields) as writer:
+        writer.write_many(records)
+
+def report_output(args: argparse.Namespace) -> ContextManager:
+    """
+    Return a context sending text reports to standard error when a structured --format keeps standard output for records.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+
+    return nullcontext() if args.format == "text" else redirect_stdout(sys.stderr)
+
+def primer_record(primers: list[str], nmers: dict) -> dict:
+    """
+    Return the primers and annealing lengths of a design as a flat record.
+
+    Args:
+        primers (list[str]): Forward, mutation reverse, mutation forward and reverse primers ("" when absent).
+        nmers (dict): (nmer, Tm) of each primer end, keyed "forward", "mut_reverse", "mut_forward" and "reverse".
+    """
+
+    keys = ("forward", "mut_reverse", "mut_forward", "reverse")
+    record = {f"{key}_primer": primer for key, primer in zip(keys, primers)}
+    record.update(
+        (f"{key}_nmer", nmers[key][0] if primer != "" and key in nmers else None)
+        for key, primer in zip(keys, primers)
+    )
+
+    return record
+
+def design_all(
+        args: argparse.Namespace,
+        target_seq: str | SequenceRecord,
+        target_seq_b: str | SequenceRecord,
+        mut: str,
+        forward_re_site: str,
+        reverse_re_site: str,
+        forward_tag: str,
+        reverse_tag: str
+    ) -> dict:
+    """
+    Compute the primers, per-end nmers, Tm values and product length of the `all` subcommand.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        target_seq (str | SequenceRecord): Target DNA sequence.
+        target_seq_b (str | SequenceRecord): Target DNA sequence of gene B, or "".
+        mut (str): Mutation sequence, or "".
+        forward_re_site (str): Restriction enzyme site for the forward primer.
+        reverse_re_site (str): Restriction enzyme site for the reverse primer.
+        forward_tag (str): Additional tag sequence for the forward primer.
+        reverse_tag (str): Additional tag sequence for the reverse primer.
+    """
+
+    with stage("construct"):
+        if args.target_tm is not None:
+            primers, nmers = optimize_primers(
+                target_seq,
+                target_seq_b,
+                mut,
+                forward_re_site,
+                reverse_re_site,
+                forward_tag,
+                reverse_tag,
+                args.target_tm,
+                args.tm_window,
+                args.min_nmer,
+                args.max_nmer,
+                args.gc_clamp,
+                args.tm_model,
+                **tm_conditions(args)
+            )
+        else:
+            primers = construct_primers(
+                target_seq,
+                target_seq_b,
+                mut,
+                args.nmer,
+                forward_re_site,
+                reverse_re_site,
+                forward_tag,
+                reverse_tag
+            )
+            nmers = {key: (args.nmer, None) for key in ("forward", "mut_reverse", "mut_forward", "reverse")}
+
+    primer_a, primer_b, primer_c, primer_d = primers
+
+    with stage("tm"):
+        forward_tm = calculate_tm_model(primer_a, nmers["forward"][0], args.tm_model, **tm_conditions(args))
+        reverse_tm = calculate_tm_model(primer_d, nmers["reverse"][0], args.tm_model, **tm_conditions(args))
+
+    with stage("length"):
+        product_length = get_length(
+            target_seq,
+            target_seq_b,
+            primer_a,
+            primer_d,
+            primer_b,
+            nmers["forward"][0],
+            nmers["reverse"][0],
+            (nmers["mut_reverse"][0], nmers["mut_forward"][0]) if primer_b != "" else None
+        )
+
+    return {
+        "primers": list(primers),
+        "nmers": nmers,
+        "forward_tm": forward_tm,
+        "reverse_tm": reverse_tm,
+        "product_length": product_length,
+    }
+
+def fmt_tm_batch_print(names: list[str], primers: list[str], tms, gc_percents, ta_offset: float = 5.0) -> None:
+    lines = ["name\tprimer\ttm\tta\tgc_percent"]
+    lines.extend(
+        f"{name}\t{primer}\t{tm:.2f}\t{tm - ta_offset:.2f}\t{gc:.2f}"
+        for name, primer, tm, gc in zip(names, primers, tms.tolist(), gc_percents.tolist())
+    )
+    print("\n".join(lines))
+
+def fmt_pcr_print(amplicons) -> None:
+    print("\t".join(AMPLICON_FIELDS))
+
+    for amplicon in amplicons:
+        print("\t".join(str(amplicon[field]) for field in AMPLICON_FIELDS))
+
+def fmt_assembly_print(records: list[dict]) -> None:
+    print("")
+    print("="*60)
+    print("Junction Overlaps")
+    print("="*60)
+    print("junction\toverlap\tlength\tshift\ttm\tgc_percent\tshared_kmers")
+    for record in records:
+        if record["overlap"] is not None:
+            print(
+                f"{record['name']}|{record['next']}\t{record['overlap']}\t{record['overlap_length']}\t{record['overlap_shift']}\t"
+                f"{record['overlap_tm']:.2f}\t{record['overlap_gc_percent']:.2f}\t{record['shared_kmers']}"
+            )
+    print("")
+    print("="*60)
+    print("Fragment Primers")
+    print("="*60)
+    print("fragment\tforward_primer\treverse_primer\tforward_tm\treverse_tm\tproduct_length")
+    for record in records:
+        print(
+            f"{record['name']}\t{record['forward_primer']}\t{record['reverse_primer']}\t"
+            f"{record['forward_tm']:.2f}\t{record['reverse_tm']:.2f}\t{record['product_length']}"
+        )
+    print("")
+    print(
+        '\033[91m' +\
+        '\033[1m' +\
+        "Note:\n" +\
+        " - Shift is the number of overlap bases taken from the left fragment; the rest come from the right one\n" +\
+        " - Tm values of primers refer to their annealing part only, without the overlap tail\n" +\
+        " - Overlaps sharing k-mers with another junction (shared_kmers > 0) may join the wrong fragments" +\
+        '\033[0m' +\
+        '\033[0m'
+    )
+    print("")
+
+def fmt_panel_print(records: list[dict]) -> None:
+    print("")
+    print("="*60)
+    print("Multiplex Panel")
+    print("="*60)
+    print("target\tforward_primer\treverse_primer\tforward_tm\treverse_tm\tproduct_length\tsize_gap\tthree_prime_run")
+    for record in records:
+        print(
+            f"{record['name']}\t{record['forward_primer']}\t{record['reverse_primer']}\t"
+            f"{record['forward_tm']:.2f}\t{record['reverse_tm']:.2f}\t{record['product_length']}\t"
+            f"{'' if record['size_gap'] is None else record['size_gap']}\t{record['three_prime_run']}"
+        )
+    print("-"*60)
+    tms = [tm for record in records for tm in (record["forward_tm"], record["reverse_tm"])]
+    print("Tm range of the panel: " + '\033[94m' + '\033[1m' + f"{min(tms):.2f} to {max(tms):.2f} °C" + '\033[0m' + '\033[0m')
+    print("="*60)
+    print("")
+    print(
+        '\033[91m' +\
+        '\033[1m' +\
+        "Note:\n" +\
+        " - size_gap is the size difference to the closest other amplicon of the panel\n" +\
+        " - three_prime_run is the longest complementary run at the 3' end of a primer of this pair with any primer of the panel (runs under 4 bases are not counted)\n" +\
+        " - Check the final panel with the dimer and pcr subcommands" +\
+        '\033[0m' +\
+        '\033[0m'
+    )
+    print("")
+
 def fmt_tm_print(forward_tm: float, forward_ta: float, reverse_tm: float, reverse_ta: float) -> None:
     print("")
     print("="*60)
@@ -25,6 +444,12 @@ def fmt_tm_print(forward_tm: float, forward_ta: float, reverse_tm: float, revers
     )
     print("")
 
+def fmt_tm_range_print(tm_ranges: dict[str, tuple[int, tuple[float, float, float]]]) -> None:
+    print("Degenerate primers (Tm above is the mean over all variants):")
+    for label, (variants, (low, high, mean)) in tm_ranges.items():
+        print(f"{label.capitalize()} primer: " + '\033[94m' + '\033[1m' + f"{variants} variants" + '\033[0m' + '\033[0m' + f", Tm {low:.2f} to {high:.2f} °C (mean {mean:.2f} °C)")
+    print("")
+
 def fmt_len_print(pcr_product_length: int) -> None:
     print("")
     print("="*60)
@@ -43,6 +468,153 @@ def fmt_len_print(pcr_product_length: int) -> None:
     )
     print("")
 
+def fmt_nmer_print(nmers: dict) -> None:
+    labels = {
+        "forward": "Forward Primer",
+        "mut_reverse": "Mutation Reverse Primer",
+        "mut_forward": "Mutation Forward Primer",
+        "reverse": "Reverse Primer",
+    }
+    print("")
+    print("="*60)
+    print("Optimized Annealing Lengths")
+    print("="*60)
+    for key, label in labels.items():
+        if key in nmers:
+            nmer, tm = nmers[key]
+            print(f"{label}: " + '\033[94m' + '\033[1m' + f"{nmer} nt" + '\033[0m' + '\033[0m' + f" (Tm {tm:.2f} °C)")
+    print("")
+
+def fmt_scan_print(results) -> None:
+    print("position\twild_type\tmutant\tcodon\tforward_primer\treverse_primer")
+    for position, wild_type, mutant, codon, forward_primer, reverse_primer in results:
+        print(f"{position}\t{wild_type}\t{mutant}\t{codon}\t{forward_primer}\t{reverse_primer}")
+
+def fmt_specificity_print(hits: list[tuple[str, dict]]) -> None:
+    print("")
+    print("="*60)
+    print("Primer Binding Sites in Reference")
+    print("="*60)
+    print("primer\tstrand\trecord\tstart\tend\tmismatches")
+    for name, hit in hits:
+        print(f"{name}\t{hit['strand']}\t{hit['record']}\t{hit['start']}\t{hit['end']}\t{hit['mismatches']}")
+    print("")
+    print(
+        '\033[91m' +\
+        '\033[1m' +\
+        "Note:\n" +\
+        " - Coordinates are 0-based and cover the primer's 3' region only\n" +\
+        " - A specific primer should have exactly one binding site" +\
+        '\033[0m' +\
+        '\033[0m'
+    )
+    print("")
+
+def fmt_re_warning_print(internal_sites: dict[str, dict[str, list[int]]]) -> None:
+    print(
+        '\033[91m' +\
+        '\033[1m' +\
+        "Warning:\n" +\
+        "\n".join(
+            f" - The {site} RE site occurs inside {target} at position(s) {', '.join(str(start + 1) for start in starts)}"
+            for target, sites in internal_sites.items()
+            for site, starts in sites.items()
+        ) +\
+        '\033[0m' +\
+        '\033[0m'
+    )
+    print("")
+
+def fmt_enzyme_end(name: str, site: str) -> str:
+    end = sticky_end(name, site)
+
+    if end is None:
+        return site
+
+    return f"{site}, {end[0]} {end[1]}" if end[1] else f"{site}, blunt"
+
+def fmt_restriction_print(hits: list[tuple[str, str, str, int]], non_cutters: list[str], pairs: list[tuple[str, str]], enzymes: dict[str, str]) -> None:
+    print("")
+    print("="*60)
+    print("Restriction Sites")
+    print("="*60)
+    print("sequence\tenzyme\tstrand\tposition")
+    for name, enzyme, strand, start in hits:
+        print(f"{name}\t{enzyme}\t{strand}\t{start + 1}")
+    print("")
+    print("="*60)
+    print("Enzymes that do not cut any sequence")
+    print("="*60)
+    print(", ".join(non_cutters) if non_cutters else "None")
+    print("")
+    print("="*60)
+    print("Suggested enzyme pairs")
+    print("="*60)
+    for enzyme_a, enzyme_b in pairs:
+        print(f"{enzyme_a} ({fmt_enzyme_end(enzyme_a, enzymes[enzyme_a])}) + {enzyme_b} ({fmt_enzyme_end(enzyme_b, enzymes[enzyme_b])})")
+    print("")
+    print(
+        '\033[91m' +\
+        '\033[1m' +\
+        "Note:\n" +\
+        " - Positions are 1-based and refer to the first base of the site on the forward strand\n" +\
+        " - Check the vector's multiple cloning site and methylation sensitivity before choosing enzymes" +\
+        '\033[0m' +\
+        '\033[0m'
+    )
+    print("")
+
+def fmt_dimer_print(reports: list[dict], pairs: list[dict]) -> None:
+    print("")
+    print("="*60)
+    print("Secondary Structure (ΔG in kcal/mol at 37 °C)")
+    print("="*60)
+    print("primer\thairpin_dg\tself_dimer_dg\tself_3'_run\tflag")
+    for report in reports:
+        flag = '\033[91m' + "CHECK" + '\033[0m' if report["flagged"] else "ok"
+        print(f"{report['name']}\t{report['hairpin_dg']:.2f}\t{report['self_dimer_dg']:.2f}\t{report['self_three_prime_run']}\t{flag}")
+    print("")
+    print("="*60)
+    print("Flagged Cross-Dimers")
+    print("="*60)
+    print("primer_a\tprimer_b\tdg\t3'_run\tmax_run")
+    for pair in pairs:
+        print(f"{pair['a']}\t{pair['b']}\t{pair['dg']:.2f}\t{pair['three_prime_run']}\t{pair['max_run']}")
+    print("")
+    print(
+        '\033[91m' +\
+        '\033[1m' +\
+        "Note:\n" +\
+        " - Primers are flagged when a hairpin is below -3 kcal/mol, a dimer is below -6 kcal/mol, or 4 or more 3' bases are complementary\n" +\
+        " - Free energies are nearest-neighbor estimates for a single stem or duplex" +\
+        '\033[0m' +\
+        '\033[0m'
+    )
+    print("")
+
+def fmt_dimer_matrix_print(names: list[str], scores: dict) -> None:
+    print("primer_a\tprimer_b\tdg\tthree_prime_run\tmax_run\tmatches")
+    for i, name_a in enumerate(names):
+        print("\n".join(
+            f"{name_a}\t{name_b}\t{scores['dg'][i, j]:.2f}\t{scores['three_prime_run'][i, j]}\t{scores['max_run'][i, j]}\t{scores['matches'][i, j]}"
+            for j, name_b in enumerate(names)
+        ))
+
+def fmt_cache_stats_print(stats: dict) -> None:
+    print(f"\n\033[1mCache:\033[0m {stats['path']}")
+    print(f"Entries: {stats['entries']} / {stats['max_entries']}")
+    print(f"Size: {stats['bytes'] / 1024 / 1024:.2f} MB / {stats['max_bytes'] / 1024 / 1024:.2f} MB")
+    print(f"Hits: {stats['hits']}\n")
+
+def fmt_cache_list_print(entries: list[dict]) -> None:
+    lines = ["key\tsize\tcreated\tlast_access\thits"]
+    lines.extend(
+        f"{entry['key']}\t{entry['size']}\t{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['created']))}\t"
+        f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['last_access']))}\t{entry['hits']}"
+        for entry in entries
+    )
+    print("\n".join(lines))
+
 def fmt_primer_print(forward_primer: str, reverse_primer: str) -> None:
     print("")
     print("="*60)
@@ -91,17 +663,38 @@ def fmt_primer_mutation_print(forward_primer: str, mut_reverse_primer: str, mut_
     print("")
 
 
-def main():
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Primer Design Utilities")
+    parser.add_argument("--metrics", dest="metrics", required=False,
+                        help="Record wall time and calls of each stage and write them to this file (\"-\" for standard error).")
+    parser.add_argument("--metrics-format", dest="metrics_format", choices=METRICS_FORMATS, default="json",
+                        help="Format of --metrics output.")
+    parser.add_argument("--metrics-memory", dest="metrics_memory", action="store_true",
+                        help="Also record the peak traced memory of each stage in --metrics (starts tracemalloc, which slows the run down).")
+    parser.add_argument("--profile", dest="profile", required=False,
+                        help="Dump cProfile statistics of the run to this file (readable with pstats or snakeviz).")
+    parser.add_argument("--tracemalloc", dest="tracemalloc", required=False,
+                        help="Write the top memory allocation sites of the run to this file.")
+    parser.add_argument("--format", dest="format", choices=WRITER_FORMATS, default="text",
+                        help="Output format: formatted text, or records as JSON lines, CSV, TSV, Arrow or Parquet (reports other than the results go to standard error).")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     # Subparser for primer generation
     primer_parser = subparsers.add_parser("primer", help="Construct forward and reverse primer sequences.")
-    primer_parser.add_argument("--seq", dest="input_string", required=True,
+    primer_parser_seq = primer_parser.add_mutually_exclusive_group(required=True)
+    primer_parser_seq.add_argument("--seq", dest="input_string",
                         help="Input full DNA sequence (5' to 3') of target gene.")
+    primer_parser_seq.add_argument("--seq-file", dest="seq_file",
+                        help="FASTA or GenBank file containing the target gene, instead of --seq.")
+    primer_parser.add_argument("--seq-record", dest="seq_record", required=False,
+                        help="Name of the record to use from --seq-file. Defaults to the first record.")
     primer_parser.add_argument("--seq-b", dest="input_string_b", required=False,
                         help="Input full DNA sequence (5' to 3') of target gene B (for mutation primers).")
-    primer_parser.add_argument("--nmer", dest="nmer", type=int, required=True,
+    primer_parser.add_argument("--seq-b-file", dest="seq_b_file", required=False,
+                        help="FASTA or GenBank file containing target gene B, instead of --seq-b.")
+    primer_parser.add_argument("--seq-b-record", dest="seq_b_record", required=False,
+                        help="Name of the record to use from --seq-b-file. Defaults to the first record.")
+    primer_parser.add_argument("--nmer", dest="nmer", type=int, required=False,
                         help="Length of the DNA to be added to the primers.")
     primer_parser.add_argument("--mut", dest="mut", required=False,
                         help="The sequence of the mutation to be introduced in the primers.")
@@ -113,33 +706,59 @@ def main():
                         help="Additional tag sequence for the forward primer.")
     primer_parser.add_argument("--reverse-tag", dest="reverse_tag", required=False,
                         help="Additional tag sequence for the reverse primer.")
+    add_nmer_search_arguments(primer_parser)
+    add_tm_arguments(primer_parser)
+    add_specificity_arguments(primer_parser)
     
     # Subparser for mutation primer generation
     mut_primer_parser = subparsers.add_parser("mut-primer", help="Construct mutation primer pair, given a single sequence and mutation position.")
-    mut_primer_parser.add_argument("--seq", dest="seq", required=True,
+    mut_primer_parser_seq = mut_primer_parser.add_mutually_exclusive_group(required=True)
+    mut_primer_parser_seq.add_argument("--seq", dest="seq",
                         help="Input full DNA sequence (5' to 3') of target gene A.")
+    mut_primer_parser_seq.add_argument("--seq-file", dest="seq_file",
+                        help="FASTA or GenBank file containing target gene A, instead of --seq.")
+    mut_primer_parser.add_argument("--seq-record", dest="seq_record", required=False,
+                        help="Name of the record to use from --seq-file. Defaults to the first record.")
     mut_primer_parser.add_argument("--nmer", dest="nmer", type=int, required=True,
                         help="Length of the DNA to be added to the primers.")
-    mut_primer_parser.add_argument("--pos", dest="pos", type=int, required=True,
+    mut_primer_parser.add_argument("--pos", dest="pos", type=int, required=False,
                         help="Position of the mutation in the sequence, e.g. F64L; pos = 64.")
-    mut_primer_parser.add_argument("--mut", dest="mut", required=True,
+    mut_primer_parser.add_argument("--mut", dest="mut", required=False,
                         help="The sequence of the mutation to be introduced in the primers.")
+    mut_primer_parser.add_argument("--scan", dest="scan", choices=("alanine", "saturation"), required=False,
+                        help="Design primer pairs for every position: alanine scanning or all 19 alternative amino acids.")
+    mut_primer_parser.add_argument("--positions", dest="positions", required=False,
+                        help="Codon positions to scan, e.g. '2-50,64'. Defaults to every codon between the start and stop codons.")
+    mut_primer_parser.add_argument("--codon-usage", dest="codon_usage", choices=tuple(CODON_USAGE), default="ecoli",
+                        help="Organism whose most frequent codon is used for each amino acid when scanning.")
 
     # Subparser for Tm calculation
     tm_parser = subparsers.add_parser("temp", help="Calculate the melting temperature (Tm) and annealing temperature (Ta) of a given primer sequence.")
-    tm_parser.add_argument("--forward", dest="forward_primer", required=True,
+    tm_parser.add_argument("--forward", dest="forward_primer", required=False,
                            help="Input full DNA sequence (5' to 3') of the forward primer.")
-    tm_parser.add_argument("--reverse", dest="reverse_primer", required=True,
+    tm_parser.add_argument("--reverse", dest="reverse_primer", required=False,
                            help="Input full DNA sequence (5' to 3') of the reverse primer.")
+    tm_parser.add_argument("--file", dest="primer_file", required=False,
+                           help="File with one primer per line (optionally 'name primer'), scored in a single vectorized batch.")
     tm_parser.add_argument("--nmer", dest="nmer", type=int, required=True,
                            help="Length of the DNA segment from the 3' end to consider for Tm calculation.")
+    add_tm_arguments(tm_parser)
 
     # Subparser for length calculation
     len_parser = subparsers.add_parser("len", help="Output the length of a given DNA sequence.")
-    len_parser.add_argument("--seq", dest="input_string", required=True,
-                            help="Input full DNA sequence (5' to 3') of target gene.")
+    len_parser_seq = len_parser.add_mutually_exclusive_group(required=True)
+    len_parser_seq.add_argument("--seq", dest="input_string",
+                                help="Input full DNA sequence (5' to 3') of target gene.")
+    len_parser_seq.add_argument("--seq-file", dest="seq_file",
+                                help="FASTA or GenBank file containing the target gene, instead of --seq.")
+    len_parser.add_argument("--seq-record", dest="seq_record", required=False,
+                            help="Name of the record to use from --seq-file. Defaults to the first record.")
     len_parser.add_argument("--seq-b", dest="input_string_b", required=False,
                             help="Input full DNA sequence (5' to 3') of target gene B (for mutation primers).")
+    len_parser.add_argument("--seq-b-file", dest="seq_b_file", required=False,
+                            help="FASTA or GenBank file containing target gene B, instead of --seq-b.")
+    len_parser.add_argument("--seq-b-record", dest="seq_b_record", required=False,
+                            help="Name of the record to use from --seq-b-file. Defaults to the first record.")
     len_parser.add_argument("--mut-primer", dest="mut_primer", required=False,
                             help="Input full DNA sequence (5' to 3') of the mutation primer (for mutation primers).")
     len_parser.add_argument("--forward", dest="forward_primer", required=True,
@@ -151,13 +770,22 @@ def main():
     
     # Subparser for all available functions
     all_parser = subparsers.add_parser("all", help="Run all available functions with the provided inputs.")
-    all_parser.add_argument("--seq", dest="input_string", required=True,
-                            help="Input full DNA sequence (5' to 3') of target gene.")
+    all_parser_seq = all_parser.add_mutually_exclusive_group(required=True)
+    all_parser_seq.add_argument("--seq", dest="input_string",
+                                help="Input full DNA sequence (5' to 3') of target gene.")
+    all_parser_seq.add_argument("--seq-file", dest="seq_file",
+                                help="FASTA or GenBank file containing the target gene, instead of --seq.")
+    all_parser.add_argument("--seq-record", dest="seq_record", required=False,
+                            help="Name of the record to use from --seq-file. Defaults to the first record.")
     all_parser.add_argument("--seq-b", dest="input_string_b", required=False,
                             help="Input full DNA sequence (5' to 3') of target gene B (for mutation primers).")
+    all_parser.add_argument("--seq-b-file", dest="seq_b_file", required=False,
+                            help="FASTA or GenBank file containing target gene B, instead of --seq-b.")
+    all_parser.add_argument("--seq-b-record", dest="seq_b_record", required=False,
+                            help="Name of the record to use from --seq-b-file. Defaults to the first record.")
     all_parser.add_argument("--mut", dest="mut", required=False,
                             help="The sequence of the mutation to be introduced in the primers.")
-    all_parser.add_argument("--nmer", dest="nmer", type=int, required=True,
+    all_parser.add_argument("--nmer", dest="nmer", type=int, required=False,
                             help="Length of the DNA to be added to the primers or considered for Tm calculation.")
     all_parser.add_argument("--forward-re", dest="forward_re_site", required=True,
                             help="Sequence of the RE site (5' to 3') of the forward primer.")
@@ -167,29 +795,247 @@ def main():
                             help="Additional tag sequence for the forward primer.")
     all_parser.add_argument("--reverse-tag", dest="reverse_tag", required=False,
                             help="Additional tag sequence for the reverse primer.")
+    add_nmer_search_arguments(all_parser)
+    add_tm_arguments(all_parser)
+    add_specificity_arguments(all_parser)
+    all_parser.add_argument("--dimers", dest="dimers", action="store_true",
+                            help="Check the primers for hairpins, self-dimers and cross-dimers.")
+    add_cache_arguments(all_parser)
+
+    # Subparser for batch primer design
+    batch_parser = subparsers.add_parser("batch", help="Run all available functions for every construct in a manifest file.")
+    batch_parser.add_argument("--manifest", dest="manifest", required=True,
+                              help="TSV, CSV or FASTA manifest with one construct per row/record.")
+    batch_parser.add_argument("--output", dest="output", required=False,
+                              help="Path of the TSV results file. Defaults to standard output.")
+    batch_parser.add_argument("--workers", dest="workers", type=int, required=False,
+                              help="Number of worker processes. Defaults to the number of CPUs.")
+    batch_parser.add_argument("--chunksize", dest="chunksize", type=int, default=64,
+                              help="Number of constructs sent to a worker at once.")
+    batch_parser.add_argument("--nmer", dest="nmer", type=int, required=False,
+                              help="Default nmer for rows that do not specify one.")
+    batch_parser.add_argument("--forward-re", dest="forward_re_site", required=False,
+                              help="Default forward RE site for rows that do not specify one.")
+    batch_parser.add_argument("--reverse-re", dest="reverse_re_site", required=False,
+                              help="Default reverse RE site for rows that do not specify one.")
+    batch_parser.add_argument("--forward-tag", dest="forward_tag", required=False,
+                              help="Default forward tag for rows that do not specify one.")
+    batch_parser.add_argument("--reverse-tag", dest="reverse_tag", required=False,
+                              help="Default reverse tag for rows that do not specify one.")
+    add_tm_arguments(batch_parser)
+    add_cache_arguments(batch_parser)
+
+    # Subparser for off-target specificity screening
+    specificity_parser = subparsers.add_parser("specificity", help="Find the binding sites of primers in a local reference genome.")
+    specificity_parser.add_argument("--primer", dest="primers", action="append", default=[],
+                                    help="Primer sequence (5' to 3'). Can be given multiple times.")
+    specificity_parser.add_argument("--file", dest="primer_file", required=False,
+                                    help="File with one primer per line (optionally 'name primer').")
+    add_specificity_arguments(specificity_parser, required=True)
+
+    # Subparser for restriction site scanning
+    restriction_parser = subparsers.add_parser("restriction", help="Find restriction sites in sequences and suggest enzyme pairs that cut none of them.")
+    restriction_parser.add_argument("--seq", dest="sequences", action="append", default=[],
+                                    help="Input full DNA sequence (5' to 3'). Can be given multiple times.")
+    restriction_parser.add_argument("--seq-file", dest="seq_file", required=False,
+                                    help="FASTA or GenBank file; every record is scanned.")
+    restriction_parser.add_argument("--enzymes", dest="enzymes", required=False,
+                                    help="Comma-separated enzyme names to consider, e.g. the vector's MCS. Defaults to the whole library.")
+    restriction_parser.add_argument("--site", dest="sites", action="append", default=[],
+                                    help="Extra recognition site as NAME=SITE (IUPAC codes allowed). Can be given multiple times.")
+    restriction_parser.add_argument("--top", dest="top", type=int, default=DEFAULT_TOP_PAIRS,
+                                    help=f"Number of best enzyme pairs to suggest, 0 for all (default {DEFAULT_TOP_PAIRS}).")
 
-    args = parser.parse_args()
+    # Subparser for secondary structure analysis
+    dimer_parser = subparsers.add_parser("dimer", help="Check primers for hairpins, self-dimers and cross-dimers.")
+    dimer_parser.add_argument("--primer", dest="primers", action="append", default=[],
+                              help="Primer sequence (5' to 3'). Can be given multiple times.")
+    dimer_parser.add_argument("--file", dest="primer_file", required=False,
+                              help="File with one primer per line (optionally 'name primer').")
+    dimer_parser.add_argument("--matrix", dest="matrix", action="store_true",
+                              help="Output the full all-vs-all score matrix as TSV instead of the summary.")
 
-    if args.command == "temp":
-        forward_primer: str = "".join(args.forward_primer.upper().split())
-        reverse_primer: str = "".join(args.reverse_primer.upper().split())
+    # Subparser for managing the design cache
+    cache_parser = subparsers.add_parser("cache", help="Inspect or purge the persistent design cache.")
+    cache_parser.add_argument("action", choices=("stats", "list", "purge"),
+                              help="Show cache statistics, list the most recently used entries, or delete entries.")
+    cache_parser.add_argument("--path", dest="path", default=DEFAULT_CACHE_PATH,
+                              help="Path of the cache database.")
+    cache_parser.add_argument("--limit", dest="limit", type=int, default=20,
+                              help="Number of entries shown by 'list'.")
+    cache_parser.add_argument("--older-than", dest="older_than", type=float, required=False,
+                              help="With 'purge', only delete entries not used for this many days.")
+
+    # Subparser for in-silico PCR
+    pcr_parser = subparsers.add_parser("pcr", help="Find primer binding sites on templates and list every product they amplify.")
+    pcr_parser.add_argument("--seq", dest="sequences", action="append", default=[],
+                            help="Template DNA sequence (5' to 3'). Can be given multiple times.")
+    pcr_parser.add_argument("--seq-file", dest="seq_file", required=False,
+                            help="FASTA or GenBank file; every record is used as a template.")
+    pcr_parser.add_argument("--forward", dest="forward_primer", required=False,
+                            help="Forward primer sequence (5' to 3'), including any overhang.")
+    pcr_parser.add_argument("--reverse", dest="reverse_primer", required=False,
+                            help="Reverse primer sequence (5' to 3'), including any overhang.")
+    pcr_parser.add_argument("--pairs", dest="pair_file", required=False,
+                            help="File with one primer pair per line ('name forward reverse').")
+    pcr_parser.add_argument("--anneal", dest="anneal", type=int, default=15,
+                            help="Number of bases at the primer 3' end that must anneal; further 5' bases may overhang.")
+    pcr_parser.add_argument("--mismatches", dest="mismatches", type=int, default=2,
+                            help="Maximum number of mismatches within the annealed bases.")
+    pcr_parser.add_argument("--seed", dest="seed", type=int, default=5,
+                            help="Number of bases at the primer 3' end that must match exactly.")
+    pcr_parser.add_argument("--max-size", dest="max_size", type=int, default=10000,
+                            help="Largest product reported, in bp.")
+
+    # Subparser for multi-fragment assembly design
+    assembly_parser = subparsers.add_parser("assembly", help="Design primers joining fragments by Gibson or overlap-extension assembly.")
+    assembly_parser.add_argument("--seq", dest="sequences", action="append", default=[],
+                                 help="Fragment DNA sequence (5' to 3'). Can be given multiple times; fragments are joined in order.")
+    assembly_parser.add_argument("--seq-file", dest="seq_file", required=False,
+                                 help="FASTA or GenBank file; every record is a fragment, joined after any --seq fragments.")
+    assembly_parser.add_argument("--linear", dest="linear", action="store_true",
+                                 help="Do not join the last fragment back to the first (e.g. overlap-extension PCR without a vector).")
+    assembly_parser.add_argument("--min-overlap", dest="min_overlap", type=int, default=20,
+                                 help="Shortest overlap between fragments.")
+    assembly_parser.add_argument("--max-overlap", dest="max_overlap", type=int, default=40,
+                                 help="Longest overlap between fragments.")
+    assembly_parser.add_argument("--overlap-tm", dest="overlap_tm", type=float, default=60.0,
+                                 help="Desired Tm of every overlap.")
+    assembly_parser.add_argument("--anneal-tm", dest="anneal_tm", type=float, default=60.0,
+                                 help="Desired Tm of the annealing part of every primer.")
+    assembly_parser.add_argument("--tm-window", dest="tm_window", type=float, default=2.5,
+                                 help="Allowed deviation from --anneal-tm.")
+    assembly_parser.add_argument("--min-nmer", dest="min_nmer", type=int, default=15,
+                                 help="Shortest annealing part considered.")
+    assembly_parser.add_argument("--max-nmer", dest="max_nmer", type=int, default=35,
+                                 help="Longest annealing part considered.")
+    assembly_parser.add_argument("--gc-clamp", dest="gc_clamp", action="store_true",
+                                 help="Require a G/C at the 3' end and at most 3 G/C in the last 5 bases.")
+    add_tm_arguments(assembly_parser)
+
+    # Subparser for multiplex panel design
+    panel_parser = subparsers.add_parser("panel", help="Design one compatible primer pair per target for a multiplex PCR panel.")
+    panel_parser.add_argument("--seq", dest="sequences", action="append", default=[],
+                              help="Target DNA sequence (5' to 3'), amplified between its ends. Can be given multiple times.")
+    panel_parser.add_argument("--seq-file", dest="seq_file", required=False,
+                              help="FASTA or GenBank file; every record is a target.")
+    panel_parser.add_argument("--target-tm", dest="target_tm", type=float, default=60.0,
+                              help="Desired Tm of every primer.")
+    panel_parser.add_argument("--tm-window", dest="tm_window", type=float, default=2.5,
+                              help="Allowed deviation from --target-tm.")
+    panel_parser.add_argument("--min-nmer", dest="min_nmer", type=int, default=18,
+                              help="Shortest annealing part considered.")
+    panel_parser.add_argument("--max-nmer", dest="max_nmer", type=int, default=30,
+                              help="Longest annealing part considered.")
+    panel_parser.add_argument("--search", dest="search", type=int, default=60,
+                              help="Number of start positions considered for the primers at each end of a target.")
+    panel_parser.add_argument("--candidates", dest="candidates", type=int, default=24,
+                              help="Largest number of candidate pairs per target, spread over the amplicon sizes.")
+    panel_parser.add_argument("--min-spacing", dest="min_spacing", type=int, default=20,
+                              help="Smallest size difference (bp) wanted between two amplicons.")
+    panel_parser.add_argument("--forward-tag", dest="forward_tag", default="",
+                              help="5' tail added to every forward primer (e.g. an adapter).")
+    panel_parser.add_argument("--reverse-tag", dest="reverse_tag", default="",
+                              help="5' tail added to every reverse primer (e.g. an adapter).")
+    panel_parser.add_argument("--restarts", dest="restarts", type=int, default=8,
+                              help="Number of simulated annealing runs.")
+    panel_parser.add_argument("--iterations", dest="iterations", type=int, default=100000,
+                              help="Steps per simulated annealing run.")
+    panel_parser.add_argument("--workers", dest="workers", type=int, required=False,
+                              help="Number of worker processes. Defaults to the number of CPUs.")
+    panel_parser.add_argument("--seed", dest="seed", type=int, default=0,
+                              help="Random seed; the same seed gives the same panel.")
+    add_tm_arguments(panel_parser)
+
+    # Subparser for the long-running daemon mode
+    serve_parser = subparsers.add_parser("serve", help="Answer primer, mut-primer, len and temp requests as JSON without restarting.")
+    serve_parser.add_argument("--http", dest="http", action="store_true",
+                              help="Listen for HTTP requests on a local socket instead of JSON lines on standard input.")
+    serve_parser.add_argument("--host", dest="host", default="127.0.0.1",
+                              help="Interface to bind with --http.")
+    serve_parser.add_argument("--port", dest="port", type=int, default=8765,
+                              help="Port to listen on with --http.")
+    serve_parser.add_argument("--workers", dest="workers", type=int, default=1,
+                              help="Number of worker processes handling requests concurrently.")
+
+    args = parser.parse_args(argv)
+
+    if args.command in ("primer", "all") and args.nmer is None and args.target_tm is None:
+        parser.error("--nmer is required unless --target-tm is given.")
+
+    with profiling(args.command, args.metrics, args.metrics_format, args.profile, args.tracemalloc, args.metrics_memory):
+        run_command(args, subparsers.choices)
+
+def run_command(args: argparse.Namespace, parsers: dict[str, argparse.ArgumentParser]) -> None:
+    """
+    Run the subcommand selected on the command line.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        parsers (dict[str, argparse.ArgumentParser]): Subcommand parsers by name, used to report usage errors.
+    """
+
+    if args.command == "temp" and args.primer_file:
+        with stage("normalize"):
+            names, primers = read_primer_file(args.primer_file)
+
+        with stage("tm"):
+            tms, gc_percents = calculate_tm_batch(primers, args.nmer, args.tm_model, **tm_conditions(args))
+
+        with stage("print"):
+            if args.format == "text":
+                fmt_tm_batch_print(names, primers, tms, gc_percents, args.ta_offset)
+            else:
+                write_records(args, (
+                    {"name": name, "primer": primer, "tm": tm, "ta": tm - args.ta_offset, "gc_percent": gc}
+                    for name, primer, tm, gc in zip(names, primers, tms.tolist(), gc_percents.tolist())
+                ))
+
+    elif args.command == "temp":
+        if args.forward_primer is None or args.reverse_primer is None:
+            parsers["temp"].error("--forward and --reverse are required unless --file is given.")
+
+        with stage("normalize"):
+            forward_primer: str = "".join(args.forward_primer.upper().split())
+            reverse_primer: str = "".join(args.reverse_primer.upper().split())
 
         if args.nmer > len(forward_primer):
             raise ValueError("nmer cannot be greater than the length of the forward primer sequence.")
 
-        forward_tm = calculate_tm(forward_primer, args.nmer)
-        reverse_tm = calculate_tm(reverse_primer, args.nmer)
-        forward_ta = forward_tm - 5
-        reverse_ta = reverse_tm - 5
+        with stage("tm"):
+            # Degenerate primers get their Tm range over every variant, whose mean is reported as their Tm.
+            tm_ranges = {
+                label: (degeneracy(primer[-args.nmer:]), calculate_tm_range(primer, args.nmer, args.tm_model, **tm_conditions(args)))
+                for label, primer in (("forward", forward_primer), ("reverse", reverse_primer))
+                if is_degenerate(primer[-args.nmer:])
+            }
+            forward_tm = tm_ranges["forward"][1][2] if "forward" in tm_ranges else calculate_tm_model(forward_primer, args.nmer, args.tm_model, **tm_conditions(args))
+            reverse_tm = tm_ranges["reverse"][1][2] if "reverse" in tm_ranges else calculate_tm_model(reverse_primer, args.nmer, args.tm_model, **tm_conditions(args))
+
+        forward_ta = forward_tm - args.ta_offset
+        reverse_ta = reverse_tm - args.ta_offset
+
+        with stage("print"):
+            if args.format == "text":
+                fmt_tm_print(forward_tm, forward_ta, reverse_tm, reverse_ta)
+
+                if tm_ranges:
+                    fmt_tm_range_print(tm_ranges)
+            else:
+                record = {"forward_tm": forward_tm, "forward_ta": forward_ta, "reverse_tm": reverse_tm, "reverse_ta": reverse_ta}
+
+                for label, (variants, (low, high, _)) in tm_ranges.items():
+                    record.update({f"{label}_variants": variants, f"{label}_tm_min": low, f"{label}_tm_max": high})
 
-        fmt_tm_print(forward_tm, forward_ta, reverse_tm, reverse_ta)
+                write_records(args, [record])
     
     elif args.command == "len":
-        target_seq: str = "".join(args.input_string.upper().split())
-        target_seq_b: str = "".join(args.input_string_b.upper().split()) if args.input_string_b else ""
-        forward_primer: str = "".join(args.forward_primer.upper().split())
-        reverse_primer: str = "".join(args.reverse_primer.upper().split())
-        forward_mutation_primer: str = "".join(args.mut_primer.upper().split()) if args.mut_primer else ""
+        with stage("normalize"):
+            target_seq = read_sequence(args.input_string, args.seq_file, args.seq_record)
+            target_seq_b = read_sequence(args.input_string_b, args.seq_b_file, args.seq_b_record)
+            forward_primer: str = "".join(args.forward_primer.upper().split())
+            reverse_primer: str = "".join(args.reverse_primer.upper().split())
+            forward_mutation_primer: str = "".join(args.mut_primer.upper().split()) if args.mut_primer else ""
 
         if target_seq_b == "" and forward_mutation_primer != "":
             raise ValueError("Mutation primer should not be provided when only one sequence is given.")
@@ -197,24 +1043,30 @@ def main():
         if target_seq_b != "" and forward_mutation_primer == "":
             raise ValueError("Mutation primer must be provided when two sequences are given.")
         
-        pcr_product_length = get_length(
-            target_seq,
-            target_seq_b,
-            forward_primer,
-            reverse_primer,
-            forward_mutation_primer,
-            args.nmer
-        )
+        with stage("length"):
+            pcr_product_length = get_length(
+                target_seq,
+                target_seq_b,
+                forward_primer,
+                reverse_primer,
+                forward_mutation_primer,
+                args.nmer
+            )
 
-        fmt_len_print(pcr_product_length)
+        with stage("print"):
+            if args.format == "text":
+                fmt_len_print(pcr_product_length)
+            else:
+                write_records(args, [{"product_length": pcr_product_length}])
     elif args.command == "primer":
-        target_seq: str = "".join(args.input_string.upper().split())
-        target_seq_b: str = "".join(args.input_string_b.upper().split()) if args.input_string_b else ""
-        forward_re_site: str = "".join(args.forward_re_site.upper().split())
-        reverse_re_site: str = "".join(args.reverse_re_site.upper().split())
-        forward_tag: str = "".join(args.forward_tag.upper().split()) if args.forward_tag else ""
-        reverse_tag: str = "".join(args.reverse_tag.upper().split()) if args.reverse_tag else ""
-        mut: str = "".join(args.mut.upper().split()) if args.mut else ""
+        with stage("normalize"):
+            target_seq = read_sequence(args.input_string, args.seq_file, args.seq_record)
+            target_seq_b = read_sequence(args.input_string_b, args.seq_b_file, args.seq_b_record)
+            forward_re_site: str = "".join(args.forward_re_site.upper().split())
+            reverse_re_site: str = "".join(args.reverse_re_site.upper().split())
+            forward_tag: str = "".join(args.forward_tag.upper().split()) if args.forward_tag else ""
+            reverse_tag: str = "".join(args.reverse_tag.upper().split()) if args.reverse_tag else ""
+            mut: str = "".join(args.mut.upper().split()) if args.mut else ""
 
         if mut != "" and target_seq_b == "":
             raise ValueError("For mutation primers, sequence B must be provided.")
@@ -222,43 +1074,125 @@ def main():
         if target_seq_b != "" and mut == "":
             raise ValueError("Mutation sequence must be provided when sequence B is given.")
         
-        primer_a, primer_b, primer_c, primer_d = construct_primers(
-            target_seq,
-            target_seq_b,
-            mut,
-            args.nmer,
-            forward_re_site,
-            reverse_re_site,
-            forward_tag,
-            reverse_tag
-        )
+        with stage("construct"):
+            if args.target_tm is not None:
+                (primer_a, primer_b, primer_c, primer_d), nmers = optimize_primers(
+                    target_seq,
+                    target_seq_b,
+                    mut,
+                    forward_re_site,
+                    reverse_re_site,
+                    forward_tag,
+                    reverse_tag,
+                    args.target_tm,
+                    args.tm_window,
+                    args.min_nmer,
+                    args.max_nmer,
+                    args.gc_clamp,
+                    args.tm_model,
+                    **tm_conditions(args)
+                )
+            else:
+                primer_a, primer_b, primer_c, primer_d = construct_primers(
+                    target_seq,
+                    target_seq_b,
+                    mut,
+                    args.nmer,
+                    forward_re_site,
+                    reverse_re_site,
+                    forward_tag,
+                    reverse_tag
+                )
+                nmers = {key: (args.nmer, None) for key in ("forward", "mut_reverse", "mut_forward", "reverse")}
+
+        if args.format == "text":
+            with stage("print"):
+                if args.target_tm is not None:
+                    fmt_nmer_print(nmers)
 
-        if primer_b == "" and primer_c == "":
-            fmt_primer_print(primer_a, primer_d)
+                if primer_b == "" and primer_c == "":
+                    fmt_primer_print(primer_a, primer_d)
+                else:
+                    fmt_primer_mutation_print(primer_a, primer_b, primer_c, primer_d)
         else:
-            fmt_primer_mutation_print(primer_a, primer_b, primer_c, primer_d)
+            with stage("print"):
+                write_records(args, [primer_record([primer_a, primer_b, primer_c, primer_d], nmers)])
+
+        with stage("restriction"):
+            internal_sites = {
+                target: find_internal_sites(sequence, {"forward": forward_re_site, "reverse": reverse_re_site})
+                for target, sequence in (("sequence A", target_seq), ("sequence B", target_seq_b)) if len(sequence) > 0
+            }
+
+        if any(internal_sites.values()):
+            with stage("print"), report_output(args):
+                fmt_re_warning_print(internal_sites)
+
+        if args.specificity_index or args.reference:
+            with stage("specificity"):
+                hits = screen_primers(
+                    args,
+                    ["forward", "mut_reverse", "mut_forward", "reverse"],
+                    [primer_a, primer_b, primer_c, primer_d]
+                )
+
+            with stage("print"), report_output(args):
+                fmt_specificity_print(hits)
+    elif args.command == "mut-primer" and args.scan:
+        with stage("normalize"):
+            target_seq = str(read_sequence(args.seq, args.seq_file, args.seq_record))
+
+        codon_count = len(target_seq) // 3
+        positions = parse_positions(args.positions, codon_count) if args.positions else range(2, codon_count)
+
+        # Primers are designed lazily while printing, so this stage covers both.
+        with stage("construct"):
+            results = iter_scanning_mutation_primers(target_seq, args.nmer, positions, args.scan, args.codon_usage)
+
+            if args.format == "text":
+                fmt_scan_print(results)
+            else:
+                fields = ["position", "wild_type", "mutant", "codon", "forward_primer", "reverse_primer"]
+                write_records(args, (dict(zip(fields, result)) for result in results), fields)
+
     elif args.command == "mut-primer":
+        if args.mut is None:
+            parsers["mut-primer"].error("--mut is required unless --scan is given.")
+
         mut: str = "".join(args.mut.upper().split())
 
         if args.pos is None:
             raise ValueError("Position of mutation must be provided when only one sequence is given.")
         
         aa_idx = (args.pos - 1) * 3
-        target_a: str = "".join(args.seq[:aa_idx].upper().split())
-        target_b: str = "".join(args.seq[aa_idx + 3:].upper().split())
 
-        forward_primer, reverse_primer = construct_mutation_primers_single(target_a, target_b, args.nmer, mut)
+        with stage("normalize"):
+            if args.seq_file:
+                record = load_record(args.seq_file, args.seq_record)
+                target_a = record.subview(0, aa_idx)
+                target_b = record.subview(aa_idx + 3)
+            else:
+                target_a: str = "".join(args.seq[:aa_idx].upper().split())
+                target_b: str = "".join(args.seq[aa_idx + 3:].upper().split())
 
-        fmt_primer_print(forward_primer, reverse_primer)
+        with stage("construct"):
+            forward_primer, reverse_primer = construct_mutation_primers_single(target_a, target_b, args.nmer, mut)
+
+        with stage("print"):
+            if args.format == "text":
+                fmt_primer_print(forward_primer, reverse_primer)
+            else:
+                write_records(args, [{"forward_primer": forward_primer, "reverse_primer": reverse_primer}])
             
     elif args.command == "all":
-        target_seq: str = "".join(args.input_string.upper().split())
-        target_seq_b: str = "".join(args.input_string_b.upper().split()) if args.input_string_b else ""
-        mut: str = "".join(args.mut.upper().split()) if args.mut else ""
-        forward_re_site: str = "".join(args.forward_re_site.upper().split())
-        reverse_re_site: str = "".join(args.reverse_re_site.upper().split())
-        forward_tag: str = "".join(args.forward_tag.upper().split()) if args.forward_tag else ""
-        reverse_tag: str = "".join(args.reverse_tag.upper().split()) if args.reverse_tag else ""
+        with stage("normalize"):
+            target_seq = read_sequence(args.input_string, args.seq_file, args.seq_record)
+            target_seq_b = read_sequence(args.input_string_b, args.seq_b_file, args.seq_b_record)
+            mut: str = "".join(args.mut.upper().split()) if args.mut else ""
+            forward_re_site: str = "".join(args.forward_re_site.upper().split())
+            reverse_re_site: str = "".join(args.reverse_re_site.upper().split())
+            forward_tag: str = "".join(args.forward_tag.upper().split()) if args.forward_tag else ""
+            reverse_tag: str = "".join(args.reverse_tag.upper().split()) if args.reverse_tag else ""
 
         if mut != "" and target_seq_b == "":
             raise ValueError("For mutation primers, sequence B must be provided.")
@@ -266,40 +1200,382 @@ def main():
         if target_seq_b != "" and mut == "":
             raise ValueError("Mutation sequence must be provided when sequence B is given.")
         
-        primer_a, primer_b, primer_c, primer_d = construct_primers(
-            target_seq,
-            target_seq_b,
-            mut,
-            args.nmer,
-            forward_re_site,
-            reverse_re_site,
-            forward_tag,
-            reverse_tag
-        )
+        def compute() -> dict:
+            return design_all(args, target_seq, target_seq_b, mut, forward_re_site, reverse_re_site, forward_tag, reverse_tag)
+
+        if args.cache:
+            inputs = design_inputs(
+                "all",
+                {"seq_a": target_seq, "seq_b": target_seq_b},
+                mut=mut,
+                nmer=args.nmer,
+                forward_re_site=forward_re_site,
+                reverse_re_site=reverse_re_site,
+                forward_tag=forward_tag,
+                reverse_tag=reverse_tag,
+                target_tm=args.target_tm,
+                tm_window=args.tm_window,
+                min_nmer=args.min_nmer,
+                max_nmer=args.max_nmer,
+                gc_clamp=args.gc_clamp,
+                tm_model=args.tm_model,
+                conditions=tm_conditions(args)
+            )
 
-        if primer_b == "" and primer_c == "":
-            fmt_primer_print(primer_a, primer_d)
+            with stage("cache"):
+                cache = open_cache(**cache_settings(args))
+                design = cache.get_or_compute(inputs, compute)
+                cache.evict()
         else:
-            fmt_primer_mutation_print(primer_a, primer_b, primer_c, primer_d)
+            design = compute()
 
-        forward_tm = calculate_tm(primer_a, args.nmer)
-        reverse_tm = calculate_tm(primer_d, args.nmer)
-        forward_ta = forward_tm - 5
-        reverse_ta = reverse_tm - 5
+        primer_a, primer_b, primer_c, primer_d = design["primers"]
+        nmers = design["nmers"]
 
-        fmt_tm_print(forward_tm, forward_ta, reverse_tm, reverse_ta)
+        if args.format == "text":
+            with stage("print"):
+                if args.target_tm is not None:
+                    fmt_nmer_print(nmers)
 
-        pcr_product_length = get_length(
-            target_seq,
-            target_seq_b,
-            primer_a,
-            primer_d,
-            primer_b, 
-            args.nmer
-        )
+                if primer_b == "" and primer_c == "":
+                    fmt_primer_print(primer_a, primer_d)
+                else:
+                    fmt_primer_mutation_print(primer_a, primer_b, primer_c, primer_d)
 
-        fmt_len_print(pcr_product_length)
-            
+        with stage("restriction"):
+            internal_sites = {
+                target: find_internal_sites(sequence, {"forward": forward_re_site, "reverse": reverse_re_site})
+                for target, sequence in (("sequence A", target_seq), ("sequence B", target_seq_b)) if len(sequence) > 0
+            }
+
+        if any(internal_sites.values()):
+            with stage("print"), report_output(args):
+                fmt_re_warning_print(internal_sites)
+
+        if args.specificity_index or args.reference:
+            with stage("specificity"):
+                hits = screen_primers(
+                    args,
+                    ["forward", "mut_reverse", "mut_forward", "reverse"],
+                    [primer_a, primer_b, primer_c, primer_d]
+                )
+
+            with stage("print"), report_output(args):
+                fmt_specificity_print(hits)
+
+        forward_ta = design["forward_tm"] - args.ta_offset
+        reverse_ta = design["reverse_tm"] - args.ta_offset
+
+        if args.format == "text":
+            with stage("print"):
+                fmt_tm_print(design["forward_tm"], forward_ta, design["reverse_tm"], reverse_ta)
+
+        if args.dimers:
+            names, primers = zip(*(
+                (name, primer)
+                for name, primer in zip(("forward", "mut_reverse", "mut_forward", "reverse"), (primer_a, primer_b, primer_c, primer_d))
+                if primer != ""
+            ))
+
+            with stage("dimer"):
+                reports = analyze_primers(list(names), list(primers))
+
+            with stage("print"), report_output(args):
+                fmt_dimer_print(*reports)
+
+        with stage("print"):
+            if args.format == "text":
+                fmt_len_print(design["product_length"])
+            else:
+                write_records(args, [{
+                    **primer_record(design["primers"], nmers),
+                    "forward_tm": design["forward_tm"],
+                    "forward_ta": forward_ta,
+                    "reverse_tm": design["reverse_tm"],
+                    "reverse_ta": reverse_ta,
+                    "product_length": design["product_length"],
+                }])
+
+    elif args.command == "batch":
+        defaults = {
+            "nmer": str(args.nmer) if args.nmer is not None else "",
+            "forward_re": args.forward_re_site,
+            "reverse_re": args.reverse_re_site,
+            "forward_tag": args.forward_tag,
+            "reverse_tag": args.reverse_tag,
+            "tm_model": args.tm_model,
+            "ta_offset": args.ta_offset,
+            "conditions": tm_conditions(args),
+            "cache": cache_settings(args),
+        }
+        failed = 0
+        # Line-oriented output is written once per chunk, so results keep streaming to a pipe.
+        batch_size = BATCH_SIZE if args.format in ("arrow", "parquet") else args.chunksize
+
+        with open_writer("tsv" if args.format == "text" else args.format, args.output, RESULT_FIELDS, batch_size) as writer:
+            for result in run_batch(read_manifest(args.manifest), defaults, args.workers, args.chunksize):
+                with stage("print"):
+                    writer.write(result)
+
+                if result.get("error"):
+                    failed += 1
+                    print(f"Row {result['row']} ({result['name']}): {result['error']}", file=sys.stderr)
+
+        if failed:
+            sys.exit(1)
+
+    elif args.command == "cache":
+        if not os.path.exists(args.path):
+            parsers["cache"].error(f"No cache found at {args.path}.")
+
+        with stage("read"):
+            cache = DesignCache(args.path)
+
+        with stage("cache"):
+            if args.action == "stats":
+                records = [cache.stats()]
+            elif args.action == "list":
+                records = cache.entries(args.limit)
+            else:
+                records = [{"removed": cache.purge(args.older_than * 86400 if args.older_than is not None else None)}]
+
+        with stage("print"):
+            if args.action == "stats" and args.format == "text":
+                fmt_cache_stats_print(records[0])
+            elif args.action == "stats":
+                write_records(args, records)
+            elif args.action == "list" and args.format == "text":
+                fmt_cache_list_print(records)
+            elif args.action == "list":
+                write_records(args, records, ["key", "size", "created", "last_access", "hits"])
+            elif args.format == "text":
+                print(f"Removed {records[0]['removed']} cached designs.")
+            else:
+                write_records(args, records)
+
+        cache.connection.close()
+
+    elif args.command == "pcr":
+        with stage("read"):
+            pairs = read_primer_pair_file(args.pair_file) if args.pair_file else []
+
+            if args.forward_primer and args.reverse_primer:
+                pairs.insert(0, ("pair", "".join(args.forward_primer.upper().split()), "".join(args.reverse_primer.upper().split())))
+
+            if not pairs:
+                parsers["pcr"].error("--forward and --reverse, or --pairs, are required.")
+
+            templates = [(f"seq{i + 1}", "".join(sequence.upper().split())) for i, sequence in enumerate(args.sequences)]
+
+            if args.seq_file:
+                templates.extend((record.name, record) for record in iter_records(args.seq_file))
+
+            if not args.sequences and not args.seq_file:
+                parsers["pcr"].error("--seq or --seq-file is required.")
+
+        with stage("pcr"):
+            amplicons = run_pcr(templates, pairs, args.anneal, args.mismatches, args.seed, args.max_size)
+
+        with stage("print"):
+            if args.format == "text":
+                fmt_pcr_print(amplicons)
+            else:
+                write_records(args, amplicons, AMPLICON_FIELDS)
+
+    elif args.command == "assembly":
+        with stage("normalize"):
+            fragments = [(f"fragment{i + 1}", "".join(sequence.upper().split())) for i, sequence in enumerate(args.sequences)]
+
+            if args.seq_file:
+                fragments.extend((record.name, record) for record in iter_records(args.seq_file))
+
+        if len(fragments) < 2:
+            parsers["assembly"].error("At least two fragments are required (--seq or --seq-file).")
+
+        with stage("construct"):
+            records = design_assembly(
+                fragments,
+                not args.linear,
+                args.min_overlap,
+                args.max_overlap,
+                args.overlap_tm,
+                args.anneal_tm,
+                args.tm_window,
+                args.min_nmer,
+                args.max_nmer,
+                args.gc_clamp,
+                args.tm_model,
+                **tm_conditions(args)
+            )
+
+        with stage("print"):
+            if args.format == "text":
+                fmt_assembly_print(records)
+            else:
+                write_records(args, records, ASSEMBLY_FIELDS)
+
+    elif args.command == "panel":
+        with stage("normalize"):
+            targets = [(f"target{i + 1}", "".join(sequence.upper().split())) for i, sequence in enumerate(args.sequences)]
+
+            if args.seq_file:
+                targets.extend((record.name, record) for record in iter_records(args.seq_file))
+
+        if not targets:
+            parsers["panel"].error("At least one target is required (--seq or --seq-file).")
+
+        with stage("construct"):
+            records = design_panel(
+                targets,
+                args.target_tm,
+                args.tm_window,
+                args.min_nmer,
+                args.max_nmer,
+                args.search,
+                args.candidates,
+                args.min_spacing,
+                "".join(args.forward_tag.upper().split()),
+                "".join(args.reverse_tag.upper().split()),
+                args.restarts,
+                args.iterations,
+                args.workers,
+                args.seed,
+                args.tm_model,
+                **tm_conditions(args)
+            )
+
+        with stage("print"):
+            if args.format == "text":
+                fmt_panel_print(records)
+            else:
+                write_records(args, records, PANEL_FIELDS)
+
+    elif args.command == "serve":
+        if args.format != "text":
+            parsers["serve"].error("--format does not apply to serve, which always answers in JSON.")
+
+        serve("http" if args.http else "stdio", args.host, args.port, args.workers)
+
+    elif args.command == "specificity":
+        if not args.specificity_index and not args.reference:
+            parsers["specificity"].error("--specificity-index or --reference is required.")
+
+        with stage("read"):
+            names = [f"primer{i + 1}" for i in range(len(args.primers))]
+            primers = ["".join(primer.upper().split()) for primer in args.primers]
+
+            if args.primer_file:
+                file_names, file_primers = read_primer_file(args.primer_file)
+                names.extend(file_names)
+                primers.extend(file_primers)
+
+        if not primers:
+            parsers["specificity"].error("At least one --primer or a --file is required.")
+
+        with stage("specificity"):
+            hits = screen_primers(args, names, primers)
+
+        with stage("print"):
+            if args.format == "text":
+                fmt_specificity_print(hits)
+            else:
+                write_records(args, ({"primer": name, **hit} for name, hit in hits), ["primer", "strand", "record", "start", "end", "mismatches"])
+
+    elif args.command == "restriction":
+        enzymes = dict(ENZYMES)
+
+        if args.enzymes:
+            names = [name.strip() for name in args.enzymes.split(",") if name.strip()]
+            unknown = [name for name in names if name not in ENZYMES]
+
+            if unknown:
+                raise ValueError(f"Unknown enzyme(s): {', '.join(unknown)}.")
+
+            enzymes = {name: ENZYMES[name] for name in names}
+
+        for site in args.sites:
+            name, sep, sequence = site.partition("=")
+
+            if not sep:
+                raise ValueError(f"Extra sites must be given as NAME=SITE, got {site!r}.")
+
+            enzymes[name] = "".join(sequence.upper().split())
+
+        with stage("read"):
+            targets = [(f"seq{i + 1}", "".join(sequence.upper().split())) for i, sequence in enumerate(args.sequences)]
+
+            if args.seq_file:
+                targets.extend((record.name, record) for record in iter_records(args.seq_file))
+
+        if not targets:
+            parsers["restriction"].error("At least one --seq or a --seq-file is required.")
+
+        with stage("restriction"):
+            scanner = SiteScanner(enzymes)
+            hits = [(name, enzyme, strand, start) for name, sequence in targets for enzyme, strand, start in scanner.scan(sequence)]
+            non_cutters, pairs = suggest_enzyme_pairs([sequence for _, sequence in targets], enzymes, args.top or None)
+
+        with stage("print"):
+            if args.format == "text":
+                fmt_restriction_print(hits, non_cutters, pairs, enzymes)
+            else:
+                write_records(args, [
+                    *(
+                        {"record": "site", "sequence": name, "enzyme": enzyme, "site": enzymes[enzyme], "strand": strand, "position": start + 1}
+                        for name, enzyme, strand, start in hits
+                    ),
+                    *({"record": "non_cutter", "enzyme": enzyme, "site": enzymes[enzyme]} for enzyme in non_cutters),
+                    *(
+                        {
+                            "record": "pair",
+                            "rank": rank,
+                            "enzyme_a": enzyme_a,
+                            "enzyme_b": enzyme_b,
+                            "score": pair_rank(sticky_end(enzyme_a, enzymes[enzyme_a]), sticky_end(enzyme_b, enzymes[enzyme_b])),
+                        }
+                        for rank, (enzyme_a, enzyme_b) in enumerate(pairs, start=1)
+                    ),
+                ], RESTRICTION_FIELDS)
+
+    elif args.command == "dimer":
+        with stage("read"):
+            names = [f"primer{i + 1}" for i in range(len(args.primers))]
+            primers = ["".join(primer.upper().split()) for primer in args.primers]
+
+            if args.primer_file:
+                file_names, file_primers = read_primer_file(args.primer_file)
+                names.extend(file_names)
+                primers.extend(file_primers)
+
+        if not primers:
+            parsers["dimer"].error("At least one --primer or a --file is required.")
+
+        if args.matrix:
+            with stage("dimer"):
+                scores = dimer_matrix(primers)
+
+            with stage("print"):
+                if args.format == "text":
+                    fmt_dimer_matrix_print(names, scores)
+                else:
+                    fields = ["dg", "three_prime_run", "max_run", "matches"]
+                    write_records(args, (
+                        {"primer_a": name_a, "primer_b": name_b, **{field: scores[field][i, j].item() for field in fields}}
+                        for i, name_a in enumerate(names)
+                        for j, name_b in enumerate(names)
+                    ))
+        else:
+            with stage("dimer"):
+                reports, pairs = analyze_primers(names, primers)
+
+            with stage("print"):
+                if args.format == "text":
+                    fmt_dimer_print(reports, pairs)
+                else:
+                    write_records(args, [
+                        *({"record": "primer", **report} for report in reports),
+                        *({"record": "pair", "primer_a": pair["a"], "primer_b": pair["b"], **pair} for pair in pairs),
+                    ], DIMER_FIELDS)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,319 @@
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Iterator
+
+
+METRICS_FORMATS = ("json", "prometheus")
+
+PROMETHEUS_PREFIX = "primer_design"
+
+TRACEMALLOC_TOP = 25
+
+# Returned by stage() while metrics are off, so a disabled hook is one attribute check.
+NULL_STAGE = nullcontext()
+
+
+class Stage:
+    """
+    Context manager timing one entry into a named stage.
+
+    Args:
+        metrics (StageMetrics): Collector the timing is recorded into.
+        name (str): Stage name.
+    """
+
+    __slots__ = ("metrics", "name", "start", "peak")
+
+    def __init__(self, metrics: "StageMetrics", name: str) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+        self.peak = 0
+
+    def __enter__(self) -> "Stage":
+        stack = self.metrics.stack
+
+        if self.metrics.track_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.metrics.peak = max(self.metrics.peak, peak)
+
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+
+            tracemalloc.reset_peak()
+
+        stack.append(self)
+        self.start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.start
+        stack = self.metrics.stack
+        path = "/".join(stage.name for stage in stack)
+        stack.pop()
+
+        if self.metrics.track_memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            self.metrics.peak = max(self.metrics.peak, self.peak)
+
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+
+            tracemalloc.reset_peak()
+
+        entry = self.metrics.stages.setdefault(path, {"calls": 0, "seconds": 0.0, "peak_bytes": 0})
+        entry["calls"] += 1
+        entry["seconds"] += elapsed
+        entry["peak_bytes"] = max(entry["peak_bytes"], self.peak)
+
+class StageMetrics:
+    """
+    Collects wall time, call counts and peak traced memory for named, nestable stages.
+
+    Stages are recorded under their nesting path (e.g. "design/tm"). While
+    disabled, stage() returns a shared no-op context manager and records
+    nothing.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.track_memory = False
+        self.stages: dict[str, dict] = {}
+        self.stack: list[Stage] = []
+        self.peak = 0
+
+    def enable(self, track_memory: bool = False) -> None:
+        """
+        Start recording stages, optionally with peak memory (which starts tracemalloc and slows allocations down).
+
+        Args:
+            track_memory (bool, optional): Record the peak traced memory of each stage. Defaults to False.
+        """
+
+        self.enabled = True
+        self.track_memory = track_memory
+        self.stages = {}
+        self.peak = 0
+
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self) -> None:
+        """
+        Stop recording stages, e.g. in worker processes that inherited an enabled collector.
+        """
+
+        self.enabled = False
+        self.stack = []
+
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        self.track_memory = False
+
+    def stage(self, name: str) -> ContextManager:
+        """
+        Return a context manager recording the enclosed code as one call of a stage.
+
+        Args:
+            name (str): Stage name.
+        """
+
+        if not self.enabled:
+            return NULL_STAGE
+
+        return Stage(self, name)
+
+    def merge(self, stages: dict) -> None:
+        """
+        Add stage metrics recorded in another process, nested under the stage currently running here.
+
+        Calls and seconds are summed; peak memory keeps the largest value.
+
+        Args:
+            stages (dict): Stages as recorded by another collector, keyed by path.
+        """
+
+        if not self.enabled:
+            return
+
+        prefix = "/".join(stage.name for stage in self.stack)
+
+        for path, values in stages.items():
+            entry = self.stages.setdefault(f"{prefix}/{path}" if prefix else path, {"calls": 0, "seconds": 0.0, "peak_bytes": 0})
+            entry["calls"] += values["calls"]
+            entry["seconds"] += values["seconds"]
+            entry["peak_bytes"] = max(entry["peak_bytes"], values["peak_bytes"])
+
+    def report(self, command: str, seconds: float) -> dict:
+        """
+        Return the recorded metrics of a run as a JSON-serializable dict.
+
+        Args:
+            command (str): Subcommand that was run.
+            seconds (float): Total wall time of the run.
+        """
+
+        return {
+            "command": command,
+            "seconds": seconds,
+            "peak_bytes": max(self.peak, tracemalloc.get_traced_memory()[1]) if self.track_memory else None,
+            "stages": self.stages,
+        }
+
+METRICS = StageMetrics()
+
+stage = METRICS.stage
+
+
+def collect_stages(track_memory: bool, func: Callable, *args) -> tuple[object, dict]:
+    """
+    Call a function with stage metrics enabled, returning its result and the stages it recorded.
+
+    Meant to run in worker processes, whose stages are then merged into the
+    parent collector with StageMetrics.merge.
+
+    Args:
+        track_memory (bool): Record the peak traced memory of each stage.
+        func (Callable): Function to call.
+        *args: Arguments of the function.
+    """
+
+    METRICS.enable(track_memory)
+
+    try:
+        result = func(*args)
+    finally:
+        stages = METRICS.stages
+        METRICS.disable()
+
+    return result, stages
+
+def prometheus_label(value: str) -> str:
+    """
+    Escape a Prometheus label value.
+
+    Args:
+        value (str): Raw label value.
+    """
+
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def format_prometheus(report: dict) -> str:
+    """
+    Render a metrics report in the Prometheus text exposition format.
+
+    Args:
+        report (dict): Report as returned by StageMetrics.report.
+    """
+
+    command = prometheus_label(report["command"])
+    lines = [
+        f"# HELP {PROMETHEUS_PREFIX}_run_seconds Wall time of the whole run.",
+        f"# TYPE {PROMETHEUS_PREFIX}_run_seconds gauge",
+        f'{PROMETHEUS_PREFIX}_run_seconds{{command="{command}"}} {report["seconds"]}',
+    ]
+
+    if report["peak_bytes"] is not None:
+        lines.extend([
+            f"# HELP {PROMETHEUS_PREFIX}_run_peak_bytes Peak traced memory of the whole run.",
+            f"# TYPE {PROMETHEUS_PREFIX}_run_peak_bytes gauge",
+            f'{PROMETHEUS_PREFIX}_run_peak_bytes{{command="{command}"}} {report["peak_bytes"]}',
+        ])
+
+    for metric, kind, key, description in (
+        ("stage_seconds_total", "counter", "seconds", "Wall time spent in each stage."),
+        ("stage_calls_total", "counter", "calls", "Number of times each stage ran."),
+        ("stage_peak_bytes", "gauge", "peak_bytes", "Peak traced memory while each stage ran."),
+    ):
+        if key == "peak_bytes" and report["peak_bytes"] is None:
+            continue
+
+        lines.append(f"# HELP {PROMETHEUS_PREFIX}_{metric} {description}")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{metric} {kind}")
+        lines.extend(
+            f'{PROMETHEUS_PREFIX}_{metric}{{command="{command}",stage="{prometheus_label(name)}"}} {values[key]}'
+            for name, values in report["stages"].items()
+        )
+
+    return "\n".join(lines) + "\n"
+
+def write_text(path: str, text: str) -> None:
+    """
+    Write text to a file, or to standard error when the path is "-".
+
+    Args:
+        path (str): Output path or "-".
+        text (str): Text to write.
+    """
+
+    if path == "-":
+        sys.stderr.write(text)
+        return
+
+    with open(path, "w") as handle:
+        handle.write(text)
+
+@contextmanager
+def profiling(
+        command: str,
+        metrics_path: str | None = None,
+        metrics_format: str = "json",
+        profile_path: str | None = None,
+        tracemalloc_path: str | None = None,
+        track_memory: bool = False
+    ) -> Iterator[None]:
+    """
+    Collect the requested metrics and profiles around a run and write them out when it ends.
+
+    Reports are written even if the run fails or exits early.
+
+    Args:
+        command (str): Subcommand being run.
+        metrics_path (str | None, optional): Where to write the stage metrics ("-" for standard error). Defaults to None.
+        metrics_format (str, optional): "json" or "prometheus". Defaults to "json".
+        profile_path (str | None, optional): Where to dump cProfile statistics (pstats format). Defaults to None.
+        tracemalloc_path (str | None, optional): Where to write the top allocation sites. Defaults to None.
+        track_memory (bool, optional): Also record the peak traced memory of each stage in the metrics. Defaults to False.
+    """
+
+    if metrics_path is None and profile_path is None and tracemalloc_path is None:
+        yield
+        return
+
+    if tracemalloc_path is not None:
+        tracemalloc.start()
+
+    if metrics_path is not None:
+        METRICS.enable(track_memory)
+
+    profiler = cProfile.Profile() if profile_path is not None else None
+    start = time.perf_counter()
+
+    if profiler is not None:
+        profiler.enable()
+
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+
+        if metrics_path is not None:
+            report = METRICS.report(command, time.perf_counter() - start)
+            write_text(metrics_path, json.dumps(report, indent=2) + "\n" if metrics_format == "json" else format_prometheus(report))
+
+        if tracemalloc_path is not None:
+            statistics = tracemalloc.take_snapshot().statistics("lineno")[:TRACEMALLOC_TOP]
+            write_text(tracemalloc_path, "\n".join(str(statistic) for statistic in statistics) + "\n")
+
+        METRICS.disable()
+
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
\ No newline at end of file
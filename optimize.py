@@ -0,0 +1,212 @@
+import numpy as np
+
+from primer import complement, construct_forward_primer, construct_mutation_primers, construct_reverse_primer, reverse
+from temp import BASE_CODES, GC_MASK, NN_INIT_DH, NN_INIT_DS, WALLACE_WEIGHTS, nn_prefix_sums, salt_corrected_tm
+
+
+def annealing_tms(region: str, model: str = "wallace", **conditions) -> np.ndarray:
+    """
+    Return the Tm of every prefix of an annealing region, indexed by prefix length.
+
+    The region is oriented like the primer's 3' segment, so a primer with
+    nmer annealing bases anneals with region[:nmer]. Prefix sums make each
+    length an O(1) lookup; lengths that cannot be scored are NaN. As in
+    calculate_tm_nn, self-complementary prefixes get the symmetry correction.
+
+    Args:
+        region (str): Longest candidate annealing segment (5' to 3').
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    raw = np.frombuffer(region.encode("ascii"), dtype=np.uint8)
+
+    if model == "wallace":
+        return np.concatenate(([np.nan], np.cumsum(WALLACE_WEIGHTS[raw]).astype(np.float64)))
+
+    if model != "nn":
+        raise ValueError(f"Unknown Tm model {model!r}.")
+
+    tms = np.full(len(raw) + 1, np.nan)
+
+    if len(raw) < 2:
+        return tms
+
+    codes = BASE_CODES[raw]
+    dh_prefix, ds_prefix = nn_prefix_sums(region)
+    lengths = np.arange(2, len(raw) + 1)
+    dh = dh_prefix[lengths - 1] + NN_INIT_DH[codes[0]] + NN_INIT_DH[codes[lengths - 1]]
+    ds = ds_prefix[lengths - 1] + NN_INIT_DS[codes[0]] + NN_INIT_DS[codes[lengths - 1]]
+    partners = np.where(codes < 4, 3 - codes.astype(np.int16), -1)
+    self_complementary = np.array([np.array_equal(codes[:length], partners[:length][::-1]) for length in lengths])
+    tms[2:] = salt_corrected_tm(dh, ds, lengths, self_complementary=self_complementary, **conditions)
+
+    return tms
+
+def gc_clamp_mask(region: str) -> np.ndarray:
+    """
+    Return, for every prefix length, whether that prefix satisfies the GC clamp rules.
+
+    A prefix passes when its 3' terminal base is G or C and its last five
+    bases hold no more than three G/C.
+
+    Args:
+        region (str): Longest candidate annealing segment (5' to 3').
+    """
+
+    gc = GC_MASK[np.frombuffer(region.encode("ascii"), dtype=np.uint8)]
+    gc_prefix = np.concatenate(([0], np.cumsum(gc)))
+    lengths = np.arange(len(region) + 1)
+    last_five = gc_prefix - gc_prefix[np.maximum(lengths - 5, 0)]
+    terminal = np.concatenate(([0], gc)).astype(bool)
+
+    return terminal & (last_five <= 3)
+
+def annealing_candidates(
+        region: str,
+        min_nmer: int,
+        max_nmer: int,
+        target_tm: float,
+        tm_window: float,
+        gc_clamp: bool = False,
+        model: str = "wallace",
+        **conditions
+    ) -> list[tuple[int, float]]:
+    """
+    List the annealing lengths whose Tm falls within target_tm ± tm_window.
+
+    Args:
+        region (str): Longest candidate annealing segment (5' to 3').
+        min_nmer (int): Shortest annealing length to consider.
+        max_nmer (int): Longest annealing length to consider.
+        target_tm (float): Desired melting temperature.
+        tm_window (float): Allowed deviation from target_tm.
+        gc_clamp (bool, optional): Whether to require a GC clamp. Defaults to False.
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    tms = annealing_tms(region, model, **conditions)
+    lengths = np.arange(max(min_nmer, 1), min(max_nmer, len(region)) + 1)
+    keep = np.abs(tms[lengths] - target_tm) <= tm_window
+
+    if gc_clamp:
+        keep &= gc_clamp_mask(region)[lengths]
+
+    return [(int(nmer), float(tm)) for nmer, tm in zip(lengths[keep], tms[lengths][keep])]
+
+def choose_balanced_pair(
+        candidates_a: list[tuple[int, float]],
+        candidates_b: list[tuple[int, float]],
+        target_tm: float
+    ) -> tuple[tuple[int, float], tuple[int, float]]:
+    """
+    Pick one candidate per primer so that the pair's Tm values are as close as possible.
+
+    Ties are broken by closeness of the mean Tm to the target, then by the
+    shortest total length.
+
+    Args:
+        candidates_a (list[tuple[int, float]]): (nmer, Tm) candidates of the first primer.
+        candidates_b (list[tuple[int, float]]): (nmer, Tm) candidates of the second primer.
+        target_tm (float): Desired melting temperature.
+    """
+
+    nmer_a, tm_a = np.array(candidates_a).T
+    nmer_b, tm_b = np.array(candidates_b).T
+
+    difference = np.abs(tm_a[:, np.newaxis] - tm_b[np.newaxis, :]).ravel()
+    offset = np.abs((tm_a[:, np.newaxis] + tm_b[np.newaxis, :]) / 2 - target_tm).ravel()
+    total = (nmer_a[:, np.newaxis] + nmer_b[np.newaxis, :]).ravel()
+
+    best = np.lexsort((total, offset, difference))[0]
+    i, j = divmod(int(best), len(candidates_b))
+
+    return candidates_a[i], candidates_b[j]
+
+def optimize_primers(
+        seq_a: str,
+        seq_b: str,
+        mut: str,
+        forward_re_site: str,
+        reverse_re_site: str,
+        forward_tag: str,
+        reverse_tag: str,
+        target_tm: float,
+        tm_window: float = 2.5,
+        min_nmer: int = 15,
+        max_nmer: int = 35,
+        gc_clamp: bool = False,
+        model: str = "wallace",
+        **conditions
+    ) -> tuple[tuple[str, str, str, str], dict]:
+    """
+    Construct primers with annealing lengths chosen independently for each end to hit a target Tm.
+
+    Returns the primers in the same order as construct_primers, and a dict
+    mapping "forward", "reverse" and, with two sequences, "mut_reverse" and
+    "mut_forward" to their (nmer, Tm). Lengths are balanced per PCR: the
+    forward/reverse pair for one sequence, or forward/mutation reverse and
+    mutation forward/reverse for two.
+
+    Args:
+        seq_a (str): Target DNA sequence.
+        seq_b (str): Target DNA sequence of the other target gene, or "".
+        mut (str): Mutation sequence to be introduced between the targets, or "".
+        forward_re_site (str): Restriction enzyme site for the forward primer.
+        reverse_re_site (str): Restriction enzyme site for the reverse primer.
+        forward_tag (str): Additional tag sequence for the forward primer.
+        reverse_tag (str): Additional tag sequence for the reverse primer.
+        target_tm (float): Desired melting temperature.
+        tm_window (float, optional): Allowed deviation from target_tm. Defaults to 2.5.
+        min_nmer (int, optional): Shortest annealing length to consider. Defaults to 15.
+        max_nmer (int, optional): Longest annealing length to consider. Defaults to 35.
+        gc_clamp (bool, optional): Whether to require a GC clamp. Defaults to False.
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    if min_nmer > max_nmer:
+        raise ValueError("min_nmer cannot be greater than max_nmer.")
+
+    def candidates(name: str, region: str) -> list[tuple[int, float]]:
+        found = annealing_candidates(region, min_nmer, max_nmer, target_tm, tm_window, gc_clamp, model, **conditions)
+
+        if not found:
+            raise ValueError(f"No {name} primer length between {min_nmer} and {max_nmer} reaches {target_tm} ± {tm_window} °C.")
+
+        return found
+
+    def reverse_region(sequence: str) -> str:
+        return complement(reverse(str(sequence[-max_nmer-3:-3])))
+
+    last_seq = seq_b if seq_b != "" else seq_a
+    forward = candidates("forward", str(seq_a[3:max_nmer+3]))
+    reverse_end = candidates("reverse", reverse_region(last_seq))
+
+    if seq_b == "":
+        (forward_nmer, forward_tm), (reverse_nmer, reverse_tm) = choose_balanced_pair(forward, reverse_end, target_tm)
+        nmers = {"forward": (forward_nmer, forward_tm), "reverse": (reverse_nmer, reverse_tm)}
+
+        return (
+            construct_forward_primer(seq_a, forward_nmer, forward_re_site, forward_tag),
+            "",
+            "",
+            construct_reverse_primer(seq_a, reverse_nmer, reverse_re_site, reverse_tag)
+        ), nmers
+
+    mut_reverse = candidates("mutation reverse", reverse_region(seq_a))
+    mut_forward = candidates("mutation forward", str(seq_b[3:max_nmer+3]))
+
+    nmers = {}
+    nmers["forward"], nmers["mut_reverse"] = choose_balanced_pair(forward, mut_reverse, target_tm)
+    nmers["mut_forward"], nmers["reverse"] = choose_balanced_pair(mut_forward, reverse_end, target_tm)
+
+    primer_c, primer_b = construct_mutation_primers(seq_a, seq_b, nmers["mut_reverse"][0], mut, nmers["mut_forward"][0])
+
+    return (
+        construct_forward_primer(seq_a, nmers["forward"][0], forward_re_site, forward_tag),
+        primer_b,
+        primer_c,
+        construct_reverse_primer(seq_b, nmers["reverse"][0], reverse_re_site, reverse_tag)
+    ), nmers
\ No newline at end of file
@@ -0,0 +1,291 @@
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from iupac import IUPAC_COMPLEMENT, IUPAC_COMPLEMENT_BYTES
+from temp import BASE_CODES
+
+
+LETTERS = np.frombuffer(b"ACGT", dtype=np.uint8)
+
+# Masked (N/IUPAC) bases are complemented by their IUPAC partner.
+COMPLEMENT = IUPAC_COMPLEMENT_BYTES
+
+ENCODE_CHUNK = 1 << 20
+
+# Decoded bases of every packed byte, used for short ranges where NumPy call overhead dominates.
+BYTE_BASES = ["".join("ACGT"[(byte >> shift) & 3] for shift in (6, 4, 2, 0)) for byte in range(256)]
+
+SHORT_FETCH = 256
+
+# Decoded short windows kept per sequence or view; the cache is emptied when full.
+WINDOW_CACHE = 1024
+
+
+def pack_codes(codes: np.ndarray) -> bytes:
+    """
+    Pack 2-bit base codes four to a byte, first base in the high bits.
+
+    Args:
+        codes (np.ndarray): Base codes (A=0, C=1, G=2, T=3).
+    """
+
+    padded = np.zeros((len(codes) + 3) // 4 * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    quads = padded.reshape(-1, 4)
+
+    return ((quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]).tobytes()
+
+def unpack_codes(data: memoryview, start: int, stop: int) -> np.ndarray:
+    """
+    Unpack the 2-bit codes of bases [start, stop) without copying the rest of the buffer.
+
+    Args:
+        data (memoryview): Packed bases.
+        start (int): First base.
+        stop (int): Base after the last one.
+    """
+
+    first = start // 4
+    packed = np.frombuffer(data[first:(stop + 3) // 4], dtype=np.uint8)
+    codes = np.empty((len(packed), 4), dtype=np.uint8)
+
+    for column, shift in enumerate((6, 4, 2, 0)):
+        codes[:, column] = (packed >> shift) & 3
+
+    return codes.ravel()[start - first * 4:stop - first * 4]
+
+class PackedSeq:
+    """
+    Immutable DNA sequence stored with 2 bits per base.
+
+    Bases other than A/C/G/T (N and IUPAC codes) are kept in a sparse mask of
+    positions and letters, so a mostly unambiguous template takes a quarter of
+    the memory of a str. Slicing returns a view sharing the same buffer, and
+    the reverse complement is a view of the same buffer read backwards with
+    complemented codes, built once and cached. Slices of at most SHORT_FETCH
+    bases (e.g. primer windows) are decoded straight to a str instead, since
+    they are read right away; only the bases actually read are ever decoded.
+    Sequences are stored in upper case.
+
+    Args:
+        sequence (str | Iterable[str]): DNA sequence, or anything providing it in pieces (e.g. a SequenceRecord).
+    """
+
+    __slots__ = ("data", "mask_positions", "mask_bases", "offset", "length", "reverse", "rc", "windows")
+
+    def __init__(self, sequence: str | Iterable[str]) -> None:
+        if isinstance(sequence, str):
+            chunks = (sequence[start:start + ENCODE_CHUNK] for start in range(0, len(sequence), ENCODE_CHUNK))
+        elif hasattr(sequence, "iter_chunks"):
+            chunks = sequence.iter_chunks()
+        else:
+            chunks = sequence
+
+        packed, positions, bases = bytearray(), [], bytearray()
+        carry = ""
+        length = 0
+
+        for chunk in chunks:
+            text = carry + chunk.upper()
+            usable = len(text) // 4 * 4
+            carry = text[usable:]
+            self.encode(text[:usable], length, packed, positions, bases)
+            length += usable
+
+        self.encode(carry, length, packed, positions, bases)
+
+        self.data = memoryview(bytes(packed))
+        self.mask_positions = np.concatenate(positions) if positions else np.zeros(0, dtype=np.int64)
+        self.mask_bases = bytes(bases)
+        self.offset = 0
+        self.length = length + len(carry)
+        self.reverse = False
+        self.rc = None
+        self.windows = {}
+
+    @staticmethod
+    def encode(text: str, start: int, packed: bytearray, positions: list, bases: bytearray) -> None:
+        """
+        Append the packed codes and masked bases of a piece of sequence.
+
+        Args:
+            text (str): Upper-case sequence piece; its length must be a multiple of 4 unless it is the last one.
+            start (int): Position of the piece in the whole sequence.
+            packed (bytearray): Packed bases, extended in place.
+            positions (list): Arrays of masked positions, extended in place.
+            bases (bytearray): Masked letters, extended in place.
+        """
+
+        raw = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        codes = BASE_CODES[raw]
+        masked = np.nonzero(codes > 3)[0]
+
+        if len(masked):
+            positions.append(masked.astype(np.int64) + start)
+            bases.extend(raw[masked].tobytes())
+            codes = np.where(codes > 3, 0, codes).astype(np.uint8)
+
+        packed.extend(pack_codes(codes))
+
+    def view(self, start: int, stop: int, reverse: bool) -> "PackedSeq":
+        """
+        Return a view of bases [start, stop) of this sequence sharing the same buffer.
+
+        Args:
+            start (int): First base of the view, relative to this sequence.
+            stop (int): Base after the last one, relative to this sequence.
+            reverse (bool): Whether the view reads the reverse complement of that range.
+        """
+
+        view = PackedSeq.__new__(PackedSeq)
+        view.data = self.data
+        view.mask_positions = self.mask_positions
+        view.mask_bases = self.mask_bases
+        view.offset = self.offset + (self.length - stop if self.reverse else start)
+        view.length = stop - start
+        view.reverse = self.reverse != reverse
+        view.rc = None
+        view.windows = {}
+
+        return view
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"PackedSeq(length={self.length}, reverse={self.reverse})"
+
+    def __str__(self) -> str:
+        return self.fetch(0, self.length)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (str, PackedSeq)):
+            return self.length == len(other) and str(self) == str(other)
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __getitem__(self, key: int | slice) -> "str | PackedSeq":
+        if isinstance(key, int):
+            if key < 0:
+                key += self.length
+
+            if not 0 <= key < self.length:
+                raise IndexError("sequence index out of range")
+
+            return self.fetch(key, key + 1)
+
+        # Short windows (e.g. primer ends) are decoded right away, and only once: a view would be decoded on every use.
+        window = (key.start, key.stop, key.step)
+        text = self.windows.get(window)
+
+        if text is not None:
+            return text
+
+        start, stop, step = key.indices(self.length)
+
+        if step != 1:
+            return str(self)[key]
+
+        stop = max(start, stop)
+
+        if stop - start <= SHORT_FETCH:
+            if len(self.windows) >= WINDOW_CACHE:
+                self.windows.clear()
+
+            text = self.windows[window] = self.fetch(start, stop)
+
+            return text
+
+        return self.view(start, stop, False)
+
+    def fetch(self, start: int, stop: int) -> str:
+        """
+        Decode bases [start, stop) of this view into a str.
+
+        Args:
+            start (int): First base.
+            stop (int): Base after the last one.
+        """
+
+        if start >= stop:
+            return ""
+
+        if self.reverse:
+            start, stop = self.length - stop, self.length - start
+
+        first, last = self.offset + start, self.offset + stop
+
+        if last - first <= SHORT_FETCH:
+            skip = first & 3
+            text = "".join(map(BYTE_BASES.__getitem__, self.data[first >> 2:(last + 3) >> 2]))[skip:skip + last - first]
+
+            if self.mask_bases:
+                left, right = np.searchsorted(self.mask_positions, (first, last))
+
+                if left < right:
+                    letters = list(text)
+
+                    for position, base in zip(self.mask_positions[left:right].tolist(), self.mask_bases[left:right]):
+                        letters[position - first] = chr(base)
+
+                    text = "".join(letters)
+
+            return text.translate(IUPAC_COMPLEMENT)[::-1] if self.reverse else text
+
+        left, right = np.searchsorted(self.mask_positions, (first, last)) if len(self.mask_bases) else (0, 0)
+        text = LETTERS[unpack_codes(self.data, first, last)]
+        text[self.mask_positions[left:right] - first] = np.frombuffer(self.mask_bases, dtype=np.uint8)[left:right]
+        text = text.tobytes()
+
+        if self.reverse:
+            return text.translate(COMPLEMENT)[::-1].decode("ascii")
+
+        return text.decode("ascii")
+
+    def codes(self) -> np.ndarray:
+        """
+        Return the base codes of this view (A=0, C=1, G=2, T=3, masked bases 4), as used by temp.BASE_CODES.
+        """
+
+        first = self.offset
+        codes = unpack_codes(self.data, first, first + self.length).copy()
+        left, right = np.searchsorted(self.mask_positions, (first, first + self.length))
+        codes[self.mask_positions[left:right] - first] = 4
+
+        if self.reverse:
+            return np.where(codes < 4, 3 - codes, 4).astype(np.uint8)[::-1]
+
+        return codes
+
+    def complement(self) -> str:
+        """
+        Return the complement of this view as a str.
+        """
+
+        return str(self).encode("ascii").translate(COMPLEMENT).decode("ascii")
+
+    def reverse_complement(self) -> "PackedSeq":
+        """
+        Return the reverse complement of this view; the view is built on first use and cached.
+        """
+
+        if self.rc is None:
+            self.rc = self.view(0, self.length, True)
+            self.rc.rc = self
+
+        return self.rc
+
+    def iter_chunks(self, size: int = ENCODE_CHUNK) -> Iterator[str]:
+        """
+        Yield the sequence of this view in pieces of at most `size` bases.
+
+        Args:
+            size (int, optional): Number of bases per piece. Defaults to ENCODE_CHUNK.
+        """
+
+        for start in range(0, self.length, size):
+            yield self.fetch(start, min(start + size, self.length))
\ No newline at end of file
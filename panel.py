@@ -0,0 +1,526 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from assembly import window_tms
+from dimer import THREE_PRIME_RUN_THRESHOLD
+from len import slice_length
+from metrics import METRICS, collect_stages, stage
+from primer import reverse_complement
+from temp import BASE_CODES
+
+
+PANEL_FIELDS = [
+    "name",
+    "forward_primer",
+    "reverse_primer",
+    "forward_start",
+    "forward_nmer",
+    "forward_tm",
+    "reverse_start",
+    "reverse_nmer",
+    "reverse_tm",
+    "product_length",
+    "size_gap",
+    "three_prime_run",
+]
+
+# Cost of a panel: Tm spread (sum of squared deviations from the panel mean, °C²),
+# amplicon size shortfall below the required spacing (bp) and 3' complementarity,
+# each weighted by these factors.
+TM_WEIGHT = 1.0
+SIZE_WEIGHT = 0.5
+DIMER_WEIGHT = 2.0
+
+# Simulated annealing temperature, lowered geometrically from start to end over a run.
+ANNEAL_START = 10.0
+ANNEAL_END = 0.01
+
+
+def primer_candidates(
+        region: str,
+        search: int,
+        min_nmer: int,
+        max_nmer: int,
+        target_tm: float,
+        tm_window: float,
+        model: str = "wallace",
+        **conditions
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find, for every start within `search` bases of a template end, the annealing length whose Tm is closest to the target.
+
+    Starts where no length reaches target_tm ± tm_window, or where every
+    window holds a base other than A/C/G/T, are dropped. Returns the starts,
+    lengths and Tm values of the remaining candidates.
+
+    Args:
+        region (str): Template end, oriented like the primer (5' to 3').
+        search (int): Number of start positions considered.
+        min_nmer (int): Shortest annealing length.
+        max_nmer (int): Longest annealing length.
+        target_tm (float): Desired melting temperature.
+        tm_window (float): Allowed deviation from target_tm.
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    starts, lengths = np.meshgrid(np.arange(search), np.arange(min_nmer, max_nmer + 1), indexing="ij")
+    fits = starts + lengths <= len(region)
+    tms = np.full(starts.shape, np.nan)
+    tms[fits] = window_tms(region, starts[fits], lengths[fits], model, **conditions)
+
+    unknown = np.concatenate(([0], np.cumsum(BASE_CODES[np.frombuffer(region.encode("ascii"), dtype=np.uint8)] == 4)))
+    clipped = np.minimum(starts, len(region))
+    ends = np.minimum(starts + lengths, len(region))
+    deviation = np.where(fits & (unknown[ends] == unknown[clipped]), np.abs(tms - target_tm), np.inf)
+    deviation[deviation > tm_window] = np.inf
+
+    best = deviation.argmin(axis=1)
+    keep = np.isfinite(deviation[np.arange(len(best)), best])
+    rows = np.flatnonzero(keep)
+
+    return rows, lengths[rows, best[keep]], tms[rows, best[keep]]
+
+def pair_candidates(
+        template,
+        search: int,
+        count: int,
+        min_nmer: int,
+        max_nmer: int,
+        target_tm: float,
+        tm_window: float,
+        forward_tag: str = "",
+        reverse_tag: str = "",
+        model: str = "wallace",
+        **conditions
+    ) -> dict[str, np.ndarray]:
+    """
+    Generate up to `count` primer pairs for one target, spread over the amplicon sizes it allows.
+
+    Every forward candidate is paired with every reverse candidate that does
+    not overlap it. The size range is split into `count` equal bins and the
+    pair with the closest forward and reverse Tm is kept from each bin, so
+    the search has room to separate amplicons. Product lengths follow
+    get_length: both primers plus the template between their annealing parts.
+
+    Args:
+        template: Target sequence (str or SequenceRecord), amplified between its two ends.
+        search (int): Number of start positions considered at each end.
+        count (int): Largest number of pairs returned.
+        min_nmer (int): Shortest annealing length.
+        max_nmer (int): Longest annealing length.
+        target_tm (float): Desired melting temperature.
+        tm_window (float): Allowed deviation from target_tm.
+        forward_tag (str, optional): 5' tail of every forward primer. Defaults to "".
+        reverse_tag (str, optional): 5' tail of every reverse primer. Defaults to "".
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    length = len(template)
+    reach = min(search + max_nmer - 1, length)
+    head = str(template[:reach])
+    tail = reverse_complement(str(template[length - reach:]))
+    forward = primer_candidates(head, search, min_nmer, max_nmer, target_tm, tm_window, model, **conditions)
+    reverse = primer_candidates(tail, search, min_nmer, max_nmer, target_tm, tm_window, model, **conditions)
+
+    i, j = np.meshgrid(np.arange(len(forward[0])), np.arange(len(reverse[0])), indexing="ij")
+    i, j = i.ravel(), j.ravel()
+    inner = length - forward[0][i] - forward[1][i] - reverse[0][j] - reverse[1][j]
+    i, j, inner = i[inner >= 0], j[inner >= 0], inner[inner >= 0]
+    sizes = len(forward_tag) + forward[1][i] + inner + reverse[1][j] + len(reverse_tag)
+
+    if len(sizes):
+        balance = np.abs(forward[2][i] - reverse[2][j])
+        bins = (sizes - sizes.min()) * count // (np.ptp(sizes) + 1)
+        order = np.lexsort((balance, bins))
+        picked = order[np.unique(bins[order], return_index=True)[1]]
+        i, j, sizes = i[picked], j[picked], sizes[picked]
+
+    return {
+        "forward_primer": [forward_tag + head[start:start + nmer] for start, nmer in zip(forward[0][i], forward[1][i])],
+        "reverse_primer": [reverse_tag + tail[start:start + nmer] for start, nmer in zip(reverse[0][j], reverse[1][j])],
+        "forward_start": forward[0][i],
+        "forward_nmer": forward[1][i],
+        "forward_tm": forward[2][i],
+        "reverse_start": reverse[0][j],
+        "reverse_nmer": reverse[1][j],
+        "reverse_tm": reverse[2][j],
+        "product_length": sizes,
+    }
+
+def three_prime_runs(primers: list[str], k: int = THREE_PRIME_RUN_THRESHOLD) -> np.ndarray:
+    """
+    Return, for every pair of primers, the longest complementary run that includes the 3' end of either primer.
+
+    This matches dimer_matrix's "three_prime_run" for runs of at least k
+    bases (shorter runs are reported as 0), without aligning every pair: a
+    primer's 3' end can only pair with primers containing the reverse
+    complement of its last k bases. All k-mers are indexed once in a sorted
+    array, every seed is looked up with a binary search, and the hits are
+    extended base by base together in NumPy.
+
+    Args:
+        primers (list[str]): Primer sequences (5' to 3').
+        k (int, optional): Shortest run reported. Defaults to THREE_PRIME_RUN_THRESHOLD.
+    """
+
+    count = len(primers)
+    width = max((len(primer) for primer in primers), default=0)
+    runs = np.zeros((count, count), dtype=np.int64)
+
+    if width < k:
+        return runs
+
+    # Primers left-aligned and padded with code 4; reverse complements padded with 5, so padding never pairs.
+    codes = np.full((count, 2 * width), 4, dtype=np.int64)
+    tails = np.full((count, width), 5, dtype=np.int64)
+
+    for row, primer in enumerate(primers):
+        encoded = BASE_CODES[np.frombuffer(primer.encode("ascii"), dtype=np.uint8)]
+        codes[row, :len(primer)] = encoded
+        tails[row, :len(primer)] = np.where(encoded < 4, 3 - encoded.astype(np.int64), 5)[::-1]
+
+    powers = 5 ** np.arange(k - 1, -1, -1)
+    windows = np.lib.stride_tricks.sliding_window_view(codes[:, :width], k, axis=1)
+    kmers = (windows * powers).sum(axis=2).ravel()
+    valid = (windows < 4).all(axis=2).ravel()
+    owners, positions = np.divmod(np.flatnonzero(valid), windows.shape[1])
+    order = np.argsort(kmers[valid], kind="stable")
+    index, owners, positions = kmers[valid][order], owners[order], positions[order]
+
+    seeds = (tails[:, :k] * powers).sum(axis=1)
+    low = np.searchsorted(index, seeds, side="left")
+    high = np.searchsorted(index, seeds, side="right")
+    hits = np.where((tails[:, :k] < 4).all(axis=1), high - low, 0)
+    primer_a = np.repeat(np.arange(count), hits)
+    found = np.arange(hits.sum()) - np.repeat(np.cumsum(hits) - hits, hits) + np.repeat(low, hits)
+    primer_b, start = owners[found], positions[found]
+
+    run = np.full(len(found), k)
+    alive = np.ones(len(found), dtype=bool)
+
+    for offset in range(k, width):
+        alive &= tails[primer_a, offset] == codes[primer_b, start + offset]
+
+        if not alive.any():
+            break
+
+        run += alive
+
+    np.maximum.at(runs, (primer_a, primer_b), run)
+
+    return np.maximum(runs, runs.T)
+
+def build_problem(candidates: list[dict], min_spacing: int) -> dict:
+    """
+    Flatten the candidate pairs of every target into the arrays searched by greedy_panel and anneal_panel.
+
+    Candidates are numbered across the whole panel; "options" lists the
+    numbers belonging to each target. "penalty" holds the 3' complementarity
+    penalty of every pair of candidates (the worst of their four primer
+    combinations), and "intrinsic" the penalty of each pair with itself.
+
+    Args:
+        candidates (list[dict]): Output of pair_candidates for every target.
+        min_spacing (int): Smallest size difference (bp) between two amplicons that incurs no penalty.
+    """
+
+    counts = [len(found["product_length"]) for found in candidates]
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    forward = [primer for found in candidates for primer in found["forward_primer"]]
+    reverse = [primer for found in candidates for primer in found["reverse_primer"]]
+
+    with stage("dimer"):
+        runs = three_prime_runs(forward + reverse)
+
+    total = len(forward)
+    ends = (np.arange(total), np.arange(total) + total)
+    worst = np.zeros((total, total), dtype=np.int64)
+
+    for a in ends:
+        for b in ends:
+            worst = np.maximum(worst, runs[np.ix_(a, b)])
+
+    penalty = np.where(worst > 0, (worst - THREE_PRIME_RUN_THRESHOLD + 1.0) ** 2, 0.0)
+
+    return {
+        "options": [np.arange(offsets[index], offsets[index + 1]) for index in range(len(candidates))],
+        "tms": np.concatenate([np.stack((found["forward_tm"], found["reverse_tm"]), axis=1) for found in candidates]),
+        "sizes": np.concatenate([found["product_length"] for found in candidates]).astype(np.float64),
+        "runs": worst,
+        "penalty": DIMER_WEIGHT * penalty,
+        "intrinsic": DIMER_WEIGHT * np.diag(penalty).copy(),
+        "spacing": float(min_spacing),
+    }
+
+def panel_cost(problem: dict, assignment: np.ndarray) -> float:
+    """
+    Return the cost of a panel: Tm spread, amplicon size crowding and 3' complementarity.
+
+    Args:
+        problem (dict): Arrays from build_problem.
+        assignment (np.ndarray): Candidate number chosen for every target.
+    """
+
+    tms = problem["tms"][assignment]
+    sizes = problem["sizes"][assignment]
+    upper = np.triu_indices(len(assignment), k=1)
+    shortfall = np.maximum(problem["spacing"] - np.abs(sizes[:, np.newaxis] - sizes[np.newaxis, :]), 0.0)[upper]
+
+    return float(
+        TM_WEIGHT * ((tms - tms.mean()) ** 2).sum()
+        + SIZE_WEIGHT * shortfall.sum()
+        + problem["penalty"][np.ix_(assignment, assignment)][upper].sum()
+        + problem["intrinsic"][assignment].sum()
+    )
+
+def greedy_panel(problem: dict, target_tm: float) -> np.ndarray:
+    """
+    Choose a pair for every target in turn, fewest candidates first, minimizing the cost against the pairs already chosen.
+
+    Args:
+        problem (dict): Arrays from build_problem.
+        target_tm (float): Desired melting temperature, used until a pair is chosen.
+    """
+
+    options = problem["options"]
+    tms, sizes, penalty = problem["tms"], problem["sizes"], problem["penalty"]
+    assignment = np.zeros(len(options), dtype=np.intp)
+    placed: list[int] = []
+
+    for target in np.argsort([len(choices) for choices in options], kind="stable"):
+        choices = options[target]
+        chosen = assignment[placed]
+        mean = tms[chosen].mean() if placed else target_tm
+        shortfall = np.maximum(problem["spacing"] - np.abs(sizes[choices, np.newaxis] - sizes[np.newaxis, chosen]), 0.0)
+        cost = (
+            TM_WEIGHT * ((tms[choices] - mean) ** 2).sum(axis=1)
+            + SIZE_WEIGHT * shortfall.sum(axis=1)
+            + penalty[np.ix_(choices, chosen)].sum(axis=1)
+            + problem["intrinsic"][choices]
+        )
+        assignment[target] = choices[cost.argmin()]
+        placed.append(target)
+
+    return assignment
+
+def anneal_panel(problem: dict, start: np.ndarray, iterations: int, seed: int) -> tuple[float, np.ndarray]:
+    """
+    Improve a panel by simulated annealing, returning the best panel visited and its cost.
+
+    Every step moves one random target to another of its candidates. A
+    vector holding, for every candidate, its pair terms summed over the
+    current panel makes the change in cost O(1) to evaluate; it is updated
+    with one row of the pair matrix when a move is accepted. The Tm spread is
+    kept as running sums of the Tm values and their squares.
+
+    Args:
+        problem (dict): Arrays from build_problem.
+        start (np.ndarray): Initial candidate number of every target.
+        iterations (int): Number of steps.
+        seed (int): Random seed.
+    """
+
+    with stage("anneal"):
+        assignment = start.copy()
+        cost = panel_cost(problem, assignment)
+        movable = [target for target, choices in enumerate(problem["options"]) if len(choices) > 1]
+
+        if not movable or iterations < 1:
+            return cost, assignment
+
+        sizes = problem["sizes"]
+        pair_terms = problem["penalty"] + SIZE_WEIGHT * np.maximum(problem["spacing"] - np.abs(sizes[:, np.newaxis] - sizes[np.newaxis, :]), 0.0)
+        field = pair_terms[:, assignment].sum(axis=1)
+        first = [int(choices[0]) for choices in problem["options"]]
+        counts = [len(choices) for choices in problem["options"]]
+        tm_totals = problem["tms"].sum(axis=1).tolist()
+        tm_square_totals = (problem["tms"] ** 2).sum(axis=1).tolist()
+        intrinsic = problem["intrinsic"].tolist()
+
+        rng = np.random.default_rng(seed)
+        targets = np.array(movable)[rng.integers(len(movable), size=iterations)].tolist()
+        picks = rng.random(iterations).tolist()
+        thresholds = (-np.log(1.0 - rng.random(iterations))).tolist()
+        temperatures = (ANNEAL_START * (ANNEAL_END / ANNEAL_START) ** (np.arange(iterations) / max(iterations - 1, 1))).tolist()
+
+        count = problem["tms"].shape[1] * len(assignment)
+        tm_sum = sum(tm_totals[candidate] for candidate in assignment)
+        tm_squares = sum(tm_square_totals[candidate] for candidate in assignment)
+        best_cost, best = cost, assignment.copy()
+
+        for step in range(iterations):
+            target = targets[step]
+            old = int(assignment[target])
+            new = first[target] + int(picks[step] * (counts[target] - 1))
+            new += new >= old
+
+            new_sum = tm_sum - tm_totals[old] + tm_totals[new]
+            new_squares = tm_squares - tm_square_totals[old] + tm_square_totals[new]
+            delta = (
+                (field[new] - pair_terms[new, old]) - (field[old] - pair_terms[old, old])
+                + intrinsic[new] - intrinsic[old]
+                + TM_WEIGHT * ((new_squares - new_sum ** 2 / count) - (tm_squares - tm_sum ** 2 / count))
+            )
+
+            # Metropolis rule: accept a worse panel with probability exp(-delta / temperature).
+            if delta > 0 and delta > thresholds[step] * temperatures[step]:
+                continue
+
+            assignment[target] = new
+            field += pair_terms[new] - pair_terms[old]
+            tm_sum, tm_squares = new_sum, new_squares
+            cost += delta
+
+            if cost < best_cost - 1e-9:
+                best_cost, best = cost, assignment.copy()
+
+        return panel_cost(problem, best), best
+
+def search_panel(
+        problem: dict,
+        target_tm: float,
+        restarts: int = 8,
+        iterations: int = 100000,
+        workers: int | None = None,
+        seed: int = 0
+    ) -> tuple[float, np.ndarray]:
+    """
+    Find a low-cost panel: a greedy start, then independent simulated annealing runs on a process pool.
+
+    Each run uses its own seed, so the result does not depend on the number
+    of workers. Stage metrics recorded by the workers are merged into this
+    process.
+
+    Args:
+        problem (dict): Arrays from build_problem.
+        target_tm (float): Desired melting temperature.
+        restarts (int, optional): Number of annealing runs. Defaults to 8.
+        iterations (int, optional): Steps per annealing run. Defaults to 100000.
+        workers (int | None, optional): Number of worker processes. Defaults to the CPU count.
+        seed (int, optional): Seed of the first run; run r uses seed + r. Defaults to 0.
+    """
+
+    start = greedy_panel(problem, target_tm)
+    results = [(panel_cost(problem, start), start)]
+    seeds = [seed + run for run in range(restarts)]
+    workers = min(workers or os.cpu_count() or 1, max(restarts, 1))
+
+    if workers == 1:
+        results.extend(anneal_panel(problem, start, iterations, run_seed) for run_seed in seeds)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=METRICS.disable) as executor:
+            if METRICS.enabled:
+                for result, stages in executor.map(
+                    collect_stages, repeat(METRICS.track_memory), repeat(anneal_panel), repeat(problem), repeat(start), repeat(iterations), seeds
+                ):
+                    results.append(result)
+                    METRICS.merge(stages)
+            else:
+                results.extend(executor.map(anneal_panel, repeat(problem), repeat(start), repeat(iterations), seeds))
+
+    return min(results, key=lambda result: result[0])
+
+def design_panel(
+        targets: list[tuple[str, str]],
+        target_tm: float = 60.0,
+        tm_window: float = 2.5,
+        min_nmer: int = 18,
+        max_nmer: int = 30,
+        search: int = 60,
+        candidates: int = 24,
+        min_spacing: int = 20,
+        forward_tag: str = "",
+        reverse_tag: str = "",
+        restarts: int = 8,
+        iterations: int = 100000,
+        workers: int | None = None,
+        seed: int = 0,
+        model: str = "wallace",
+        **conditions
+    ) -> list[dict]:
+    """
+    Design a multiplex PCR panel: one compatible primer pair per target.
+
+    Each target is amplified between its two ends; primers may start
+    anywhere within `search` bases of them. Candidate pairs are generated
+    per target, then one is chosen per target to minimize the spread of all
+    primer Tm values, amplicons closer in size than `min_spacing`, and
+    complementary runs at the 3' end of any two primers. Returns one record
+    per target, in input order.
+
+    Args:
+        targets (list[tuple[str, str]]): (name, sequence) of every target; sequences may be SequenceRecords.
+        target_tm (float, optional): Desired melting temperature. Defaults to 60.0.
+        tm_window (float, optional): Allowed deviation from target_tm. Defaults to 2.5.
+        min_nmer (int, optional): Shortest annealing length. Defaults to 18.
+        max_nmer (int, optional): Longest annealing length. Defaults to 30.
+        search (int, optional): Number of start positions considered at each end of a target. Defaults to 60.
+        candidates (int, optional): Largest number of candidate pairs per target. Defaults to 24.
+        min_spacing (int, optional): Smallest size difference (bp) wanted between two amplicons. Defaults to 20.
+        forward_tag (str, optional): 5' tail of every forward primer. Defaults to "".
+        reverse_tag (str, optional): 5' tail of every reverse primer. Defaults to "".
+        restarts (int, optional): Number of simulated annealing runs. Defaults to 8.
+        iterations (int, optional): Steps per annealing run. Defaults to 100000.
+        workers (int | None, optional): Number of worker processes. Defaults to the CPU count.
+        seed (int, optional): Random seed. Defaults to 0.
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    if min_nmer > max_nmer:
+        raise ValueError("min_nmer cannot be greater than max_nmer.")
+
+    if search < 1 or candidates < 1:
+        raise ValueError("search and candidates must be at least 1.")
+
+    with stage("candidates"):
+        found = []
+
+        for name, sequence in targets:
+            pairs = pair_candidates(sequence, search, candidates, min_nmer, max_nmer, target_tm, tm_window, forward_tag, reverse_tag, model, **conditions)
+
+            if len(pairs["product_length"]) == 0:
+                raise ValueError(f"No primer pair for target {name!r} reaches {target_tm} ± {tm_window} °C within {search} bases of its ends.")
+
+            found.append(pairs)
+
+    problem = build_problem(found, min_spacing)
+
+    with stage("search"):
+        _, assignment = search_panel(problem, target_tm, restarts, iterations, workers, seed)
+
+    sizes = problem["sizes"][assignment]
+    gaps = np.abs(sizes[:, np.newaxis] - sizes[np.newaxis, :]) + np.diag(np.full(len(sizes), np.inf))
+    runs = problem["runs"][np.ix_(assignment, assignment)]
+    records = []
+
+    for index, ((name, sequence), pairs) in enumerate(zip(targets, found)):
+        choice = assignment[index] - problem["options"][index][0]
+        forward_start = int(pairs["forward_start"][choice])
+        reverse_start = int(pairs["reverse_start"][choice])
+        forward_nmer = int(pairs["forward_nmer"][choice])
+        reverse_nmer = int(pairs["reverse_nmer"][choice])
+
+        records.append({
+            "name": name,
+            "forward_primer": pairs["forward_primer"][choice],
+            "reverse_primer": pairs["reverse_primer"][choice],
+            "forward_start": forward_start + 1,
+            "forward_nmer": forward_nmer,
+            "forward_tm": float(pairs["forward_tm"][choice]),
+            "reverse_start": len(sequence) - reverse_start,
+            "reverse_nmer": reverse_nmer,
+            "reverse_tm": float(pairs["reverse_tm"][choice]),
+            "product_length": len(pairs["forward_primer"][choice])
+                + slice_length(sequence, forward_start + forward_nmer, len(sequence) - reverse_start - reverse_nmer)
+                + len(pairs["reverse_primer"][choice]),
+            "size_gap": int(gaps[index].min()) if len(targets) > 1 else None,
+            "three_prime_run": int(runs[index].max()),
+        })
+
+    return records
\ No newline at end of file
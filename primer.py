@@ -1,3 +1,9 @@
+from typing import Iterable, Iterator
+
+from codons import AMINO_ACIDS, CODON_USAGE, translate_codon
+from iupac import IUPAC_COMPLEMENT
+
+
 def reverse(str: str) -> str:
     """
     Return the reverse of the input DNA sequence.
@@ -12,13 +18,33 @@ def complement(str: str) -> str:
     """
     Return the complement of the input DNA sequence.
 
+    Degenerate (IUPAC) bases are complemented by their IUPAC partner, e.g.
+    NNK becomes NNM.
+
     Args:
         str (str): Input DNA sequence.
     """
 
-    complement_map = str.maketrans("ATCGatcg", "TAGCtagc")
+    return str.translate(IUPAC_COMPLEMENT)
 
-    return str.translate(complement_map)
+def reverse_complement(sequence) -> str:
+    """
+    Return the reverse complement of a DNA sequence.
+
+    PackedSeq and other sequence types providing `reverse_complement` return
+    their own (lazy) view; anything else goes through reverse and complement.
+
+    Args:
+        sequence: Input DNA sequence, a str or a PackedSeq.
+    """
+
+    if isinstance(sequence, str):
+        return complement(reverse(sequence))
+
+    if hasattr(sequence, "reverse_complement"):
+        return sequence.reverse_complement()
+
+    return complement(reverse(str(sequence)))
 
 def construct_forward_primer(sequence: str, nmer: int, forward_re_site: str, forward_tag: str) -> str:
     """
@@ -34,12 +60,14 @@ def construct_forward_primer(sequence: str, nmer: int, forward_re_site: str, for
     if nmer > len(sequence):
         raise ValueError("nmer cannot be greater than the length of the target sequence.")
 
-    start_codon = sequence[:3]
+    # One slice of the 5' end holds the start codon and the nmer, so a PackedSeq is decoded once.
+    head = str(sequence[:nmer+3])
+    start_codon = head[:3]
 
     if start_codon != "ATG":
         raise ValueError("The target sequence does not start with a valid start codon (ATG).")
     
-    remaining_sequence = sequence[3:nmer+3]
+    remaining_sequence = head[3:]
     forward_primer = forward_re_site + start_codon + forward_tag + remaining_sequence
 
     return forward_primer
@@ -58,23 +86,17 @@ def construct_reverse_primer(sequence: str, nmer: int, reverse_re_site: str, rev
     if nmer > len(sequence):
         raise ValueError("nmer cannot be greater than the length of the target sequence.")
 
-    stop_codon = sequence[-3:]
+    tail = str(sequence[-nmer-3:])
+    stop_codon = tail[-3:]
 
     if stop_codon not in ["TAA", "TAG", "TGA"]:
         raise ValueError("The target sequence does not end with a valid stop codon (TAA, TAG, TGA).")
     
-    remaining_sequence = sequence[-nmer-3:-3]
-
-    stop_complement = complement(stop_codon)
-    nmer_complement = complement(remaining_sequence)
+    # One reverse complement of the 3' end gives the stop codon followed by the nmer, both reverse complemented.
+    end_reverse_complement = reverse_complement(tail)
+    tag_reverse = reverse_complement(reverse_tag)
 
-    stop_reverse_complement = reverse(stop_complement)
-    nmer_reverse_complement = reverse(nmer_complement)
-
-    tag_complement = complement(reverse_tag)
-    tag_reverse = reverse(tag_complement)
-
-    reverse_primer = reverse_re_site + stop_reverse_complement + tag_reverse + nmer_reverse_complement
+    reverse_primer = reverse_re_site + end_reverse_complement[:3] + tag_reverse + end_reverse_complement[3:]
 
     return reverse_primer
 
@@ -100,7 +122,7 @@ def construct_primers(
         reverse_tag (str, optional): Additional tag sequence for the reverse primer. Defaults to "".
     """
 
-    if seq_b != "":
+    if len(seq_b):
         primer_a = construct_forward_primer(seq_a, nmer, forward_re_site, forward_tag)
         primer_d = construct_reverse_primer(seq_b, nmer, reverse_re_site, reverse_tag)
 
@@ -113,7 +135,7 @@ def construct_primers(
 
     return forward_primer, "", "", reverse_primer
 
-def construct_mutation_primers(a: str, b: str, nmer: int, mut: str) -> tuple[str, str]:
+def construct_mutation_primers(a: str, b: str, nmer: int, mut: str, nmer_b: int | None = None) -> tuple[str, str]:
     """
     Construct mutation primers for site-directed mutagenesis.
 
@@ -122,12 +144,15 @@ def construct_mutation_primers(a: str, b: str, nmer: int, mut: str) -> tuple[str
         b (str): Target DNA sequence B.
         nmer (int): Number of nucleotides from each end to include.
         mut (str): Mutation sequence to be introduced.
+        nmer_b (int | None, optional): Number of nucleotides to include from sequence B, if different from nmer. Defaults to None.
     """
 
-    target_a = a[-nmer-3:-3]
-    target_b = b[3:nmer+3]
+    nmer_b = nmer if nmer_b is None else nmer_b
+
+    target_a = str(a[-nmer-3:-3])
+    target_b = str(b[3:nmer_b+3])
     forward = target_a + mut + target_b
-    rev = complement(reverse(forward))
+    rev = reverse_complement(forward)
 
     return forward, rev
 
@@ -142,9 +167,68 @@ def construct_mutation_primers_single(a: str, b: str, nmer: int, mut: str) -> tu
         mut (str): Mutation sequence to be introduced.
     """
 
-    target_a = a[-nmer:]
-    target_b = b[:nmer]
+    target_a = str(a[-nmer:])
+    target_b = str(b[:nmer])
     forward = target_a + mut + target_b
-    rev = complement(reverse(forward))
+    rev = reverse_complement(forward)
+
+    return forward, rev
+
+def iter_scanning_mutation_primers(
+        sequence: str,
+        nmer: int,
+        positions: Iterable[int],
+        mode: str = "alanine",
+        codon_usage: str = "ecoli"
+    ) -> Iterator[tuple[int, str, str, str, str, str]]:
+    """
+    Yield mutation primer pairs for scanning or site-saturation mutagenesis.
+
+    For every 1-based codon position, the codon is replaced by alanine
+    ("alanine" mode, skipping wild-type alanines) or by each of the 19 other
+    amino acids ("saturation" mode), using the most frequent codon of the
+    chosen organism. Primers match construct_mutation_primers_single; the
+    reverse complement of the template is computed once and sliced for every
+    reverse primer. Yields (position, wild-type amino acid, mutant amino acid,
+    codon, forward primer, reverse primer).
+
+    Args:
+        sequence (str): Target DNA sequence (5' to 3').
+        nmer (int): Number of nucleotides on each side of the mutated codon to include.
+        positions (Iterable[int]): 1-based codon positions to mutate.
+        mode (str, optional): "alanine" or "saturation". Defaults to "alanine".
+        codon_usage (str, optional): Codon usage table from codons.CODON_USAGE. Defaults to "ecoli".
+    """
+
+    if mode not in ("alanine", "saturation"):
+        raise ValueError(f"Unknown scanning mode {mode!r}; expected 'alanine' or 'saturation'.")
+
+    if codon_usage not in CODON_USAGE:
+        raise ValueError(f"Unknown codon usage table {codon_usage!r}; expected one of {', '.join(CODON_USAGE)}.")
+
+    codons = CODON_USAGE[codon_usage]
+    codon_rcs = {amino_acid: complement(reverse(codon)) for amino_acid, codon in codons.items()}
+    sequence_rc = complement(reverse(sequence))
+    length = len(sequence)
+
+    for position in positions:
+        start = (position - 1) * 3
+
+        if start < 0 or start + 3 > length:
+            raise ValueError(f"Position {position} is outside the target sequence.")
+
+        wild_type = translate_codon(sequence[start:start + 3])
+        flank_a = sequence[max(0, start - nmer):start]
+        flank_b = sequence[start + 3:start + 3 + nmer]
+        flank_a_rc = sequence_rc[length - start:length - max(0, start - nmer)]
+        flank_b_rc = sequence_rc[max(0, length - start - 3 - nmer):length - start - 3]
+        targets = "A" if mode == "alanine" else AMINO_ACIDS
+
+        for amino_acid in targets:
+            if amino_acid == wild_type:
+                continue
+
+            forward = flank_a + codons[amino_acid] + flank_b
+            rev = flank_b_rc + codon_rcs[amino_acid] + flank_a_rc
 
-    return forward, rev
\ No newline at end of file
+            yield position, wild_type, amino_acid, codons[amino_acid], forward, rev
\ No newline at end of file
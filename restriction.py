@@ -0,0 +1,321 @@
+from collections import deque
+from itertools import combinations
+from typing import Iterable
+
+from iupac import IUPAC_COMPLEMENT, expand_degenerate, is_degenerate
+
+# Recognition sites (5' to 3') of commonly used commercially available enzymes.
+ENZYMES = {
+    "AatII": "GACGTC", "Acc65I": "GGTACC", "AfeI": "AGCGCT", "AflII": "CTTAAG",
+    "AgeI": "ACCGGT", "AleI": "CACNNNNGTG", "AluI": "AGCT", "ApaI": "GGGCCC",
+    "ApaLI": "GTGCAC", "AscI": "GGCGCGCC", "AseI": "ATTAAT", "AvaI": "CYCGRG",
+    "AvrII": "CCTAGG", "BamHI": "GGATCC", "BanII": "GRGCYC", "BbsI": "GAAGAC",
+    "BclI": "TGATCA", "BglII": "AGATCT", "BlpI": "GCTNAGC", "BmtI": "GCTAGC",
+    "BsaI": "GGTCTC", "BsiWI": "CGTACG", "BsmBI": "CGTCTC", "BspEI": "TCCGGA",
+    "BsrGI": "TGTACA", "BssHII": "GCGCGC", "BstBI": "TTCGAA", "BstEII": "GGTNACC",
+    "ClaI": "ATCGAT", "DpnI": "GATC", "DraI": "TTTAAA", "EagI": "CGGCCG",
+    "EcoNI": "CCTNNNNNAGG", "EcoRI": "GAATTC", "EcoRV": "GATATC", "FseI": "GGCCGGCC",
+    "FspI": "TGCGCA", "HaeIII": "GGCC", "HincII": "GTYRAC", "HindIII": "AAGCTT",
+    "HpaI": "GTTAAC", "KasI": "GGCGCC", "KpnI": "GGTACC", "MfeI": "CAATTG",
+    "MluI": "ACGCGT", "MscI": "TGGCCA", "NaeI": "GCCGGC", "NarI": "GGCGCC",
+    "NcoI": "CCATGG", "NdeI": "CATATG", "NheI": "GCTAGC", "NotI": "GCGGCCGC",
+    "NruI": "TCGCGA", "NsiI": "ATGCAT", "PacI": "TTAATTAA", "PciI": "ACATGT",
+    "PmeI": "GTTTAAAC", "PmlI": "CACGTG", "PshAI": "GACNNNNGTC", "PstI": "CTGCAG",
+    "PvuI": "CGATCG", "PvuII": "CAGCTG", "SacI": "GAGCTC", "SacII": "CCGCGG",
+    "SalI": "GTCGAC", "SapI": "GCTCTTC", "SbfI": "CCTGCAGG", "ScaI": "AGTACT",
+    "SfiI": "GGCCNNNNNGGCC", "SmaI": "CCCGGG", "SnaBI": "TACGTA", "SpeI": "ACTAGT",
+    "SphI": "GCATGC", "SspI": "AATATT", "StuI": "AGGCCT", "StyI": "CCWWGG",
+    "SwaI": "ATTTAAAT", "XbaI": "TCTAGA", "XhoI": "CTCGAG", "XmaI": "CCCGGG",
+    "ZraI": "GACGTC",
+}
+
+# Cut positions of each library enzyme on the top and bottom strands, counted
+# in bases from the start of the site on the top strand (e.g. EcoRI G^AATTC is
+# (1, 5)). Type IIS enzymes cut outside their site.
+CUT_POSITIONS = {
+    "AatII": (5, 1), "Acc65I": (1, 5), "AfeI": (3, 3), "AflII": (1, 5), "AgeI": (1, 5),
+    "AleI": (5, 5), "AluI": (2, 2), "ApaI": (5, 1), "ApaLI": (1, 5), "AscI": (2, 6),
+    "AseI": (2, 4), "AvaI": (1, 5), "AvrII": (1, 5), "BamHI": (1, 5), "BanII": (5, 1),
+    "BbsI": (8, 12), "BclI": (1, 5), "BglII": (1, 5), "BlpI": (2, 5), "BmtI": (5, 1),
+    "BsaI": (7, 11), "BsiWI": (1, 5), "BsmBI": (7, 11), "BspEI": (1, 5), "BsrGI": (1, 5),
+    "BssHII": (1, 5), "BstBI": (2, 4), "BstEII": (1, 6), "ClaI": (2, 4), "DpnI": (2, 2),
+    "DraI": (3, 3), "EagI": (1, 5), "EcoNI": (5, 6), "EcoRI": (1, 5), "EcoRV": (3, 3),
+    "FseI": (6, 2), "FspI": (3, 3), "HaeIII": (2, 2), "HincII": (3, 3), "HindIII": (1, 5),
+    "HpaI": (3, 3), "KasI": (1, 5), "KpnI": (5, 1), "MfeI": (1, 5), "MluI": (1, 5), "MscI": (3, 3),
+    "NaeI": (3, 3), "NarI": (2, 4), "NcoI": (1, 5), "NdeI": (2, 4), "NheI": (1, 5), "NotI": (2, 6),
+    "NruI": (3, 3), "NsiI": (5, 1), "PacI": (5, 3), "PciI": (1, 5), "PmeI": (4, 4), "PmlI": (3, 3),
+    "PshAI": (5, 5), "PstI": (5, 1), "PvuI": (4, 2), "PvuII": (3, 3), "SacI": (5, 1),
+    "SacII": (4, 2), "SalI": (1, 5), "SapI": (8, 11), "SbfI": (6, 2), "ScaI": (3, 3),
+    "SfiI": (8, 5), "SmaI": (3, 3), "SnaBI": (3, 3), "SpeI": (1, 5), "SphI": (5, 1),
+    "SspI": (3, 3), "StuI": (3, 3), "StyI": (1, 5), "SwaI": (4, 4), "XbaI": (1, 5), "XhoI": (1, 5),
+    "XmaI": (1, 5), "ZraI": (3, 3),
+}
+
+# Ranks of enzyme pairs, best first: the ends a pair leaves on the insert.
+PAIR_DIRECTIONAL = 0
+PAIR_STICKY_BLUNT = 1
+PAIR_UNKNOWN = 2
+PAIR_COMPATIBLE = 3
+PAIR_BLUNT = 4
+
+DEFAULT_TOP_PAIRS = 20
+
+# Columns of the structured restriction output: "site" records hold one site
+# found in a sequence, "non_cutter" records one enzyme cutting no sequence and
+# "pair" records one suggested enzyme pair, best first, with its PAIR_* score.
+RESTRICTION_FIELDS = [
+    "record",
+    "sequence",
+    "enzyme",
+    "site",
+    "strand",
+    "position",
+    "rank",
+    "enzyme_a",
+    "enzyme_b",
+    "score",
+]
+
+
+class SiteScanner:
+    """
+    Aho-Corasick automaton that finds every occurrence of many recognition sites in one pass.
+
+    Degenerate (IUPAC) sites are expanded into their concrete sequences, and
+    the reverse complement of every non-palindromic site is added, so a
+    single left-to-right scan reports hits on both strands. The scan is linear
+    in the length of the sequence whatever the number of sites loaded.
+
+    Args:
+        sites (dict[str, str]): Mapping of enzyme (or site) name to recognition site (5' to 3').
+    """
+
+    def __init__(self, sites: dict[str, str]) -> None:
+        self.sites = {name: site.upper() for name, site in sites.items()}
+        self.transitions: list[dict[str, int]] = [{}]
+        self.fail = [0]
+        self.outputs: list[list[tuple[str, str, int]]] = [[]]
+
+        for name, site in self.sites.items():
+            site_rc = site.translate(IUPAC_COMPLEMENT)[::-1]
+
+            for strand, pattern in (("+", site), ("-", site_rc)) if site_rc != site else (("+", site),):
+                for concrete in expand_site(pattern):
+                    self.add(concrete, (name, strand, len(concrete)))
+
+        self.link()
+
+    def add(self, pattern: str, output: tuple[str, str, int]) -> None:
+        """
+        Add a concrete pattern to the trie, reporting `output` when it is matched.
+
+        Args:
+            pattern (str): Concrete site sequence.
+            output (tuple[str, str, int]): Name, strand and length reported for the pattern.
+        """
+
+        state = 0
+
+        for base in pattern:
+            if base not in self.transitions[state]:
+                self.transitions.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.transitions[state][base] = len(self.transitions) - 1
+
+            state = self.transitions[state][base]
+
+        self.outputs[state].append(output)
+
+    def link(self) -> None:
+        """
+        Compute the failure links breadth-first and merge the outputs reachable through them.
+        """
+
+        queue = deque(self.transitions[0].values())
+
+        while queue:
+            state = queue.popleft()
+
+            for base, child in self.transitions[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+
+                while fallback and base not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+
+                self.fail[child] = self.transitions[fallback].get(base, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def scan(self, sequence: Iterable[str]) -> list[tuple[str, str, int]]:
+        """
+        Return (name, strand, 0-based start) for every site occurrence in the sequence.
+
+        Args:
+            sequence (Iterable[str]): DNA sequence (5' to 3') as a str, a SequenceRecord or an iterable of chunks.
+        """
+
+        transitions, fail, outputs = self.transitions, self.fail, self.outputs
+        hits = []
+        state = 0
+        position = 0
+
+        if isinstance(sequence, str):
+            chunks = [sequence]
+        elif hasattr(sequence, "iter_chunks"):
+            chunks = sequence.iter_chunks()
+        else:
+            chunks = sequence
+
+        for chunk in chunks:
+            for base in chunk.upper():
+                while state and base not in transitions[state]:
+                    state = fail[state]
+
+                state = transitions[state].get(base, 0)
+                position += 1
+
+                for name, strand, length in outputs[state]:
+                    hits.append((name, strand, position - length))
+
+        return sorted(set(hits), key=lambda hit: (hit[2], hit[0], hit[1]))
+
+def expand_site(site: str) -> list[str]:
+    """
+    Expand a recognition site with IUPAC degenerate bases into every concrete sequence.
+
+    Args:
+        site (str): Recognition site (5' to 3').
+    """
+
+    return list(expand_degenerate(site))
+
+def find_internal_sites(sequence: str, sites: dict[str, str]) -> dict[str, list[int]]:
+    """
+    Return the start positions of each given site inside the sequence, on either strand.
+
+    Args:
+        sequence (str): Target DNA sequence (5' to 3').
+        sites (dict[str, str]): Mapping of name to recognition site.
+    """
+
+    found = {name: [] for name in sites}
+
+    for name, _, start in SiteScanner({name: site for name, site in sites.items() if site}).scan(sequence):
+        if start not in found[name]:
+            found[name].append(start)
+
+    return {name: starts for name, starts in found.items() if starts}
+
+def sticky_end(name: str, site: str) -> tuple[str, str] | None:
+    """
+    Return the kind ("5'", "3'" or "blunt") and top-strand sequence of the end an enzyme leaves, or None if its cut is unknown.
+
+    Overhangs cut outside the site (Type IIS) are returned as N's.
+
+    Args:
+        name (str): Enzyme name.
+        site (str): Recognition site (5' to 3').
+    """
+
+    if name not in CUT_POSITIONS or ENZYMES.get(name) != site:
+        return None
+
+    top, bottom = CUT_POSITIONS[name]
+    padded = site + "N" * max(top, bottom)
+
+    if top < bottom:
+        return "5'", padded[top:bottom]
+
+    if top > bottom:
+        return "3'", padded[bottom:top]
+
+    return "blunt", ""
+
+def ends_compatible(end_a: tuple[str, str], end_b: tuple[str, str]) -> bool:
+    """
+    Return whether two sticky ends can be ligated to each other, so they do not orient an insert.
+
+    Overhangs made only of N's (e.g. Type IIS or SfiI) are chosen when the
+    primers are designed and are never considered compatible.
+
+    Args:
+        end_a (tuple[str, str]): Kind and overhang as returned by sticky_end.
+        end_b (tuple[str, str]): Kind and overhang as returned by sticky_end.
+    """
+
+    (kind_a, overhang_a), (kind_b, overhang_b) = end_a, end_b
+
+    if kind_a != kind_b or len(overhang_a) != len(overhang_b) or not overhang_a.strip("N") or not overhang_b.strip("N"):
+        return False
+
+    variants_b = set(expand_degenerate(overhang_b))
+    variants_b.update(variant.translate(IUPAC_COMPLEMENT)[::-1] for variant in list(variants_b))
+
+    return any(variant in variants_b for variant in expand_degenerate(overhang_a))
+
+def pair_rank(end_a: tuple[str, str] | None, end_b: tuple[str, str] | None) -> int:
+    """
+    Return how well two enzymes orient an insert, from PAIR_DIRECTIONAL (best) to PAIR_BLUNT.
+
+    Args:
+        end_a (tuple[str, str] | None): End left by the first enzyme, as returned by sticky_end.
+        end_b (tuple[str, str] | None): End left by the second enzyme, as returned by sticky_end.
+    """
+
+    if end_a is None or end_b is None:
+        return PAIR_UNKNOWN
+
+    blunt = (end_a[0] == "blunt") + (end_b[0] == "blunt")
+
+    if blunt == 2:
+        return PAIR_BLUNT
+
+    if blunt == 1:
+        return PAIR_STICKY_BLUNT
+
+    return PAIR_COMPATIBLE if ends_compatible(end_a, end_b) else PAIR_DIRECTIONAL
+
+def suggest_enzyme_pairs(
+        sequences: Iterable[str],
+        enzymes: dict[str, str] | None = None,
+        top: int | None = DEFAULT_TOP_PAIRS
+    ) -> tuple[list[str], list[tuple[str, str]]]:
+    """
+    Find enzymes that cut none of the sequences, and the best pairs of them for directional cloning.
+
+    Pairs leaving two incompatible sticky ends come first, then a sticky and
+    a blunt end, pairs with an unknown cut (extra sites), compatible sticky
+    ends and finally two blunt ends. Within each group, pairs of
+    non-degenerate and then of rare (longer) sites come first, and ties are
+    broken by name. Isoschizomers (enzymes with identical sites) are never paired with
+    each other.
+
+    Args:
+        sequences (Iterable[str]): Target DNA sequences.
+        enzymes (dict[str, str] | None, optional): Candidate enzymes. Defaults to ENZYMES.
+        top (int | None, optional): Maximum number of pairs returned; all of them if None. Defaults to DEFAULT_TOP_PAIRS.
+    """
+
+    enzymes = ENZYMES if enzymes is None else enzymes
+    scanner = SiteScanner(enzymes)
+    cutting = set()
+
+    for sequence in sequences:
+        cutting.update(name for name, _, _ in scanner.scan(sequence))
+
+    non_cutters = sorted(name for name in enzymes if name not in cutting)
+    ends = {name: sticky_end(name, enzymes[name]) for name in non_cutters}
+    ranked = sorted(
+        (
+            pair_rank(ends[a], ends[b]),
+            is_degenerate(enzymes[a]) + is_degenerate(enzymes[b]),
+            -min(len(enzymes[a]), len(enzymes[b])),
+            a,
+            b,
+        )
+        for a, b in combinations(non_cutters, 2)
+        if enzymes[a] != enzymes[b]
+    )
+
+    return non_cutters, [(a, b) for *_, a, b in ranked[:top]]
@@ -0,0 +1,258 @@
+import mmap
+import os
+from bisect import bisect_right
+from typing import Iterator
+
+
+CHUNK_SIZE = 1 << 16
+
+WHITESPACE = b" \t\r\n\v\f"
+DIGITS = b"0123456789"
+
+FASTA_EXTENSIONS = (".fa", ".fasta", ".fna", ".fas", ".ffn", ".faa")
+GENBANK_EXTENSIONS = (".gb", ".gbk", ".genbank", ".gbff")
+
+
+class SequenceRecord:
+    """
+    Read-only, memory-mapped view of a single sequence record.
+
+    The record keeps only a sparse index of (byte offset, base count)
+    checkpoints, one per CHUNK_SIZE bytes of file, so memory use does not grow
+    with the size of the sequence. Slicing and indexing return normalized
+    (upper case, whitespace-free) strings built from just the bytes that back
+    the requested bases; `subview` narrows the record without copying.
+
+    Args:
+        buffer (mmap.mmap): Memory map of the whole file.
+        name (str): Record name.
+        checkpoints (tuple[list[int], list[int]]): Byte offsets and the number of bases preceding each of them.
+        end (int): Byte offset where the record's sequence data ends.
+        deletechars (bytes): Bytes stripped while normalizing (whitespace, and digits for GenBank).
+        offset (int, optional): Index of the first base of this view within the record. Defaults to 0.
+        length (int | None, optional): Number of bases in this view. Defaults to the rest of the record.
+    """
+
+    def __init__(
+            self,
+            buffer: mmap.mmap,
+            name: str,
+            checkpoints: tuple[list[int], list[int]],
+            end: int,
+            deletechars: bytes,
+            offset: int = 0,
+            length: int | None = None
+        ) -> None:
+        self.buffer = buffer
+        self.name = name
+        self.checkpoints = checkpoints
+        self.end = end
+        self.deletechars = deletechars
+        self.offset = offset
+        self.length = checkpoints[1][-1] - offset if length is None else length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"SequenceRecord(name={self.name!r}, length={self.length})"
+
+    def __str__(self) -> str:
+        return self.fetch(0, self.length)
+
+    def __getitem__(self, key: int | slice) -> str:
+        if isinstance(key, int):
+            if key < 0:
+                key += self.length
+
+            if not 0 <= key < self.length:
+                raise IndexError("sequence index out of range")
+
+            return self.fetch(key, key + 1)
+
+        indices = range(self.length)[key]
+
+        if indices.step == 1:
+            return self.fetch(indices.start, indices.stop)
+
+        if len(indices) == 0:
+            return ""
+
+        low, high = min(indices[0], indices[-1]), max(indices[0], indices[-1]) + 1
+
+        return self.fetch(low, high)[indices.start - low::indices.step]
+
+    def subview(self, start: int, stop: int | None = None) -> "SequenceRecord":
+        """
+        Return a view of bases [start:stop] of this record without copying.
+
+        Args:
+            start (int): First base of the view (negative values count from the end).
+            stop (int | None, optional): End of the view (exclusive). Defaults to the end of the record.
+        """
+
+        indices = range(self.length)[start:stop]
+        length = max(0, indices.stop - indices.start)
+
+        return SequenceRecord(self.buffer, self.name, self.checkpoints, self.end, self.deletechars, self.offset + indices.start, length)
+
+    def fetch(self, start: int, stop: int) -> str:
+        """
+        Return the normalized bases [start:stop) of this view.
+
+        Args:
+            start (int): First base to return, relative to the view.
+            stop (int): End of the range (exclusive), relative to the view.
+        """
+
+        if stop <= start:
+            return ""
+
+        start += self.offset
+        stop += self.offset
+        offsets, counts = self.checkpoints
+        index = bisect_right(counts, start) - 1
+        position, seen = offsets[index], counts[index]
+        parts = []
+        remaining = stop - start
+
+        while remaining > 0 and position < self.end:
+            chunk = self.buffer[position:min(position + CHUNK_SIZE, self.end)].translate(None, self.deletechars)
+            position += CHUNK_SIZE
+            skip = max(0, start - seen)
+            seen += len(chunk)
+
+            if skip >= len(chunk):
+                continue
+
+            piece = chunk[skip:skip + remaining]
+            parts.append(piece)
+            remaining -= len(piece)
+
+        return b"".join(parts).decode("ascii").upper()
+
+    def iter_chunks(self, size: int = CHUNK_SIZE) -> Iterator[str]:
+        """
+        Yield the normalized sequence of this view in pieces of at most `size` bases.
+
+        Args:
+            size (int, optional): Number of bases per piece. Defaults to CHUNK_SIZE.
+        """
+
+        for start in range(0, self.length, size):
+            yield self.fetch(start, min(start + size, self.length))
+
+def index_record(buffer: mmap.mmap, start: int, end: int, deletechars: bytes) -> tuple[list[int], list[int]]:
+    """
+    Scan a record's sequence bytes once, in chunks, and build its checkpoint index.
+
+    Args:
+        buffer (mmap.mmap): Memory map of the whole file.
+        start (int): Byte offset where the record's sequence data starts.
+        end (int): Byte offset where the record's sequence data ends.
+        deletechars (bytes): Bytes stripped while normalizing.
+    """
+
+    offsets, counts = [start], [0]
+    bases = 0
+
+    for position in range(start, end, CHUNK_SIZE):
+        bases += len(buffer[position:min(position + CHUNK_SIZE, end)].translate(None, deletechars))
+        offsets.append(min(position + CHUNK_SIZE, end))
+        counts.append(bases)
+
+    return offsets, counts
+
+def iter_fasta_records(buffer: mmap.mmap) -> Iterator[SequenceRecord]:
+    """
+    Index and yield every record of a memory-mapped FASTA file.
+
+    Args:
+        buffer (mmap.mmap): Memory map of the FASTA file.
+    """
+
+    position = buffer.find(b">")
+
+    while position != -1:
+        header_end = buffer.find(b"\n", position)
+        header_end = len(buffer) if header_end == -1 else header_end
+        fields = buffer[position + 1:header_end].decode().split()
+        name = fields[0] if fields else ""
+
+        next_record = buffer.find(b"\n>", header_end)
+        end = len(buffer) if next_record == -1 else next_record + 1
+
+        yield SequenceRecord(buffer, name, index_record(buffer, header_end, end, WHITESPACE), end, WHITESPACE)
+
+        position = -1 if next_record == -1 else next_record + 1
+
+def iter_genbank_records(buffer: mmap.mmap) -> Iterator[SequenceRecord]:
+    """
+    Index and yield the ORIGIN sequence of every record of a memory-mapped GenBank file.
+
+    Args:
+        buffer (mmap.mmap): Memory map of the GenBank file.
+    """
+
+    deletechars = WHITESPACE + DIGITS
+    position = buffer.find(b"LOCUS")
+
+    while position != -1:
+        line_end = buffer.find(b"\n", position)
+        fields = buffer[position:line_end].decode().split()
+        name = fields[1] if len(fields) > 1 else ""
+
+        origin = buffer.find(b"\nORIGIN", position)
+
+        if origin == -1:
+            raise ValueError(f"GenBank record {name!r} has no ORIGIN section.")
+
+        start = buffer.find(b"\n", origin + 1)
+        end = buffer.find(b"\n//", start)
+        end = len(buffer) if end == -1 else end
+
+        yield SequenceRecord(buffer, name, index_record(buffer, start, end, deletechars), end, deletechars)
+
+        position = buffer.find(b"LOCUS", end)
+
+def iter_records(path: str) -> Iterator[SequenceRecord]:
+    """
+    Memory-map a FASTA or GenBank file and yield its records one by one.
+
+    The format is taken from the file extension, falling back to sniffing the
+    first byte. The memory map stays open for as long as any record refers to it.
+
+    Args:
+        path (str): Path to the FASTA or GenBank file.
+    """
+
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in GENBANK_EXTENSIONS or (extension not in FASTA_EXTENSIONS and buffer[:5] == b"LOCUS"):
+        yield from iter_genbank_records(buffer)
+    else:
+        yield from iter_fasta_records(buffer)
+
+def load_record(path: str, name: str | None = None) -> SequenceRecord:
+    """
+    Return one record of a FASTA or GenBank file.
+
+    Args:
+        path (str): Path to the FASTA or GenBank file.
+        name (str | None, optional): Name of the record to return. Defaults to the first record.
+    """
+
+    for record in iter_records(path):
+        if name is None or record.name == name:
+            return record
+
+    if name is None:
+        raise ValueError(f"No sequence records found in {path}.")
+
+    raise ValueError(f"Record {name!r} not found in {path}.")
\ No newline at end of file
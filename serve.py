@@ -0,0 +1,433 @@
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Callable
+
+from batch import normalize
+from len import get_length
+from optimize import optimize_primers
+from primer import construct_mutation_primers_single, construct_primers
+from restriction import find_internal_sites
+from temp import TM_MODELS, calculate_tm_batch, calculate_tm_model
+
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+CONDITION_FIELDS = ("na", "mg", "dntp", "primer_conc")
+
+
+def required(params: dict, name: str):
+    """
+    Return a mandatory request parameter.
+
+    Args:
+        params (dict): Request parameters.
+        name (str): Parameter name.
+    """
+
+    if params.get(name) in (None, ""):
+        raise ValueError(f"Missing parameter {name!r}.")
+
+    return params[name]
+
+def request_conditions(params: dict) -> tuple[str, dict]:
+    """
+    Return the Tm model and the nearest-neighbor reaction conditions of a request.
+
+    Args:
+        params (dict): Request parameters.
+    """
+
+    model = params.get("tm_model", "wallace")
+
+    if model not in TM_MODELS:
+        raise ValueError(f"Unknown Tm model {model!r}, expected one of {', '.join(TM_MODELS)}.")
+
+    if model != "nn":
+        return model, {}
+
+    return model, {field: float(params[field]) for field in CONDITION_FIELDS if params.get(field) is not None}
+
+def op_primer(params: dict) -> dict:
+    """
+    Construct forward, reverse and (with two sequences) mutation primers, like the `primer` subcommand.
+
+    Args:
+        params (dict): seq, seq_b, mut, nmer or target_tm (with tm_window, min_nmer, max_nmer, gc_clamp),
+            forward_re, reverse_re, forward_tag, reverse_tag and the Tm model options.
+    """
+
+    seq_a = normalize(required(params, "seq"))
+    seq_b = normalize(params.get("seq_b"))
+    mut = normalize(params.get("mut"))
+    forward_re_site = normalize(required(params, "forward_re"))
+    reverse_re_site = normalize(required(params, "reverse_re"))
+    forward_tag = normalize(params.get("forward_tag"))
+    reverse_tag = normalize(params.get("reverse_tag"))
+    model, conditions = request_conditions(params)
+
+    if mut != "" and seq_b == "":
+        raise ValueError("For mutation primers, sequence B must be provided.")
+
+    if seq_b != "" and mut == "":
+        raise ValueError("Mutation sequence must be provided when sequence B is given.")
+
+    if params.get("target_tm") is not None:
+        primers, nmers = optimize_primers(
+            seq_a,
+            seq_b,
+            mut,
+            forward_re_site,
+            reverse_re_site,
+            forward_tag,
+            reverse_tag,
+            float(params["target_tm"]),
+            float(params.get("tm_window", 2.5)),
+            int(params.get("min_nmer", 15)),
+            int(params.get("max_nmer", 35)),
+            bool(params.get("gc_clamp", False)),
+            model,
+            **conditions
+        )
+    else:
+        nmer = int(required(params, "nmer"))
+        primers = construct_primers(seq_a, seq_b, mut, nmer, forward_re_site, reverse_re_site, forward_tag, reverse_tag)
+        nmers = {key: (nmer, None) for key in ("forward", "mut_reverse", "mut_forward", "reverse")}
+
+    sites = {"forward": forward_re_site, "reverse": reverse_re_site}
+
+    return {
+        **dict(zip(("forward_primer", "mut_reverse_primer", "mut_forward_primer", "reverse_primer"), primers)),
+        "nmers": {key: {"nmer": nmer, "tm": tm} for key, (nmer, tm) in nmers.items()},
+        "internal_sites": {
+            target: found
+            for target, sequence in (("seq", seq_a), ("seq_b", seq_b)) if sequence
+            for found in [find_internal_sites(sequence, sites)] if found
+        },
+    }
+
+def op_mut_primer(params: dict) -> dict:
+    """
+    Construct a mutation primer pair for a single sequence, like the `mut-primer` subcommand.
+
+    Args:
+        params (dict): seq, pos (1-based codon position), mut and nmer.
+    """
+
+    seq = normalize(required(params, "seq"))
+    aa_idx = (int(required(params, "pos")) - 1) * 3
+    forward_primer, reverse_primer = construct_mutation_primers_single(
+        seq[:aa_idx],
+        seq[aa_idx + 3:],
+        int(required(params, "nmer")),
+        normalize(required(params, "mut"))
+    )
+
+    return {"forward_primer": forward_primer, "reverse_primer": reverse_primer}
+
+def op_len(params: dict) -> dict:
+    """
+    Calculate the PCR product length, like the `len` subcommand.
+
+    Args:
+        params (dict): seq, seq_b, forward_primer, reverse_primer, mut_primer and nmer.
+    """
+
+    seq_b = normalize(params.get("seq_b"))
+    mut_primer = normalize(params.get("mut_primer"))
+
+    if seq_b == "" and mut_primer != "":
+        raise ValueError("Mutation primer should not be provided when only one sequence is given.")
+
+    if seq_b != "" and mut_primer == "":
+        raise ValueError("Mutation primer must be provided when two sequences are given.")
+
+    return {
+        "product_length": get_length(
+            normalize(required(params, "seq")),
+            seq_b,
+            normalize(required(params, "forward_primer")),
+            normalize(required(params, "reverse_primer")),
+            mut_primer,
+            int(required(params, "nmer"))
+        ),
+    }
+
+def op_temp(params: dict) -> dict:
+    """
+    Calculate melting and annealing temperatures, like the `temp` subcommand.
+
+    Either a forward/reverse pair or a `primers` list (evaluated in one
+    vectorized batch) may be given.
+
+    Args:
+        params (dict): forward_primer and reverse_primer, or primers; nmer, ta_offset and the Tm model options.
+    """
+
+    nmer = int(required(params, "nmer"))
+    ta_offset = float(params.get("ta_offset", 5.0))
+    model, conditions = request_conditions(params)
+
+    if params.get("primers") is not None:
+        primers = [normalize(primer) for primer in params["primers"]]
+        tms, gc_percents = calculate_tm_batch(primers, nmer, model, **conditions)
+
+        return {
+            "primers": [
+                {"primer": primer, "tm": float(tm), "ta": float(tm) - ta_offset, "gc_percent": float(gc)}
+                for primer, tm, gc in zip(primers, tms, gc_percents)
+            ],
+        }
+
+    forward_primer = normalize(required(params, "forward_primer"))
+    reverse_primer = normalize(required(params, "reverse_primer"))
+
+    if nmer > len(forward_primer):
+        raise ValueError("nmer cannot be greater than the length of the forward primer sequence.")
+
+    forward_tm = calculate_tm_model(forward_primer, nmer, model, **conditions)
+    reverse_tm = calculate_tm_model(reverse_primer, nmer, model, **conditions)
+
+    return {"forward_tm": forward_tm, "forward_ta": forward_tm - ta_offset, "reverse_tm": reverse_tm, "reverse_ta": reverse_tm - ta_offset}
+
+OPERATIONS: dict[str, Callable[[dict], dict]] = {
+    "primer": op_primer,
+    "mut-primer": op_mut_primer,
+    "len": op_len,
+    "temp": op_temp,
+}
+
+
+def run_operation(op: str, params: dict) -> dict:
+    """
+    Run one operation in a worker, returning its result and the compute time in milliseconds.
+
+    Args:
+        op (str): Operation name, a key of OPERATIONS.
+        params (dict): Operation parameters.
+    """
+
+    start = time.perf_counter()
+    result = OPERATIONS[op](params)
+
+    return {"result": result, "compute_ms": (time.perf_counter() - start) * 1000}
+
+async def handle_request(payload: str | bytes, executor: Executor, op: str | None = None) -> dict:
+    """
+    Decode a request, run it on the executor and build the structured response.
+
+    Responses always carry the request `id` (if any), `ok`, and `elapsed_ms`
+    (time from receipt to response, including queueing); successful ones add
+    `result` and `compute_ms`, failed ones an `error` message.
+
+    Args:
+        payload (str | bytes): JSON request object with "op" and optional "id" and "params",
+            or only the parameters when `op` is given.
+        executor (Executor): Pool the operations run on.
+        op (str | None, optional): Operation name, when it is not part of the payload. Defaults to None.
+    """
+
+    start = time.perf_counter()
+    response = {"id": None}
+
+    try:
+        request = json.loads(payload)
+
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object.")
+
+        if op is not None:
+            request = {"op": op, "params": request}
+
+        response["id"] = request.get("id")
+        op = request.get("op")
+
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown op {op!r}, expected one of {', '.join(OPERATIONS)}.")
+
+        params = request.get("params", {})
+
+        if not isinstance(params, dict):
+            raise ValueError("params must be a JSON object.")
+
+        response["op"] = op
+        outcome = await asyncio.get_running_loop().run_in_executor(executor, run_operation, op, params)
+        response.update(ok=True, **outcome)
+    except Exception as exc:
+        response["ok"] = False
+        response["error"] = f"{type(exc).__name__}: {exc}"
+
+    response["elapsed_ms"] = (time.perf_counter() - start) * 1000
+
+    return response
+
+async def serve_stdio(executor: Executor, max_pending: int = 256) -> None:
+    """
+    Answer JSON-lines requests from standard input on standard output until EOF.
+
+    Requests run concurrently, so responses are written as they complete and
+    may come back out of order; clients match them by `id`.
+
+    Args:
+        executor (Executor): Pool the operations run on.
+        max_pending (int, optional): Maximum number of requests in flight. Defaults to 256.
+    """
+
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_pending)
+    tasks = set()
+
+    async def answer(line: str) -> None:
+        try:
+            response = await handle_request(line, executor)
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+        finally:
+            slots.release()
+
+    while True:
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+
+        if line == "":
+            break
+
+        if not line.strip():
+            continue
+
+        await slots.acquire()
+        task = asyncio.create_task(answer(line))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+async def write_http_response(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+    """
+    Send a JSON HTTP/1.1 response.
+
+    Args:
+        writer (asyncio.StreamWriter): Client connection.
+        status (int): HTTP status code.
+        payload (dict): JSON response body.
+        keep_alive (bool): Whether the connection stays open for further requests.
+    """
+
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode() + body)
+    await writer.drain()
+
+async def handle_http_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, executor: Executor) -> None:
+    """
+    Serve HTTP/1.1 requests on one keep-alive connection.
+
+    `POST /` takes a request object like the JSON-lines mode; `POST /<op>`
+    takes the operation parameters as the body. `GET /health` lists the
+    available operations.
+
+    Args:
+        reader (asyncio.StreamReader): Client input stream.
+        writer (asyncio.StreamWriter): Client output stream.
+        executor (Executor): Pool the operations run on.
+    """
+
+    try:
+        while True:
+            request_line = await reader.readline()
+
+            if not request_line.strip():
+                break
+
+            method, _, rest = request_line.decode("latin-1").partition(" ")
+            path = rest.split(" ", 1)[0].split("?", 1)[0]
+            headers = {}
+
+            while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = header.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            keep_alive = headers.get("connection", "").lower() != "close"
+            length = int(headers.get("content-length", 0) or 0)
+
+            if length > MAX_BODY_BYTES:
+                await write_http_response(writer, 413, {"ok": False, "error": "Request body too large."}, False)
+                break
+
+            body = await reader.readexactly(length) if length else b""
+
+            if method == "GET" and path == "/health":
+                await write_http_response(writer, 200, {"ok": True, "ops": list(OPERATIONS)}, keep_alive)
+            elif method != "POST":
+                await write_http_response(writer, 405, {"ok": False, "error": f"Method {method} not allowed."}, keep_alive)
+            elif path != "/" and path[1:] not in OPERATIONS:
+                await write_http_response(writer, 404, {"ok": False, "error": f"Unknown path {path}."}, keep_alive)
+            else:
+                response = await handle_request(body or b"{}", executor, None if path == "/" else path[1:])
+                await write_http_response(writer, 200 if response["ok"] else 400, response, keep_alive)
+
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+async def serve_http(executor: Executor, host: str = "127.0.0.1", port: int = 8765) -> None:
+    """
+    Serve requests over HTTP on a local socket until cancelled.
+
+    Args:
+        executor (Executor): Pool the operations run on.
+        host (str, optional): Interface to bind. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on. Defaults to 8765.
+    """
+
+    server = await asyncio.start_server(lambda reader, writer: handle_http_connection(reader, writer, executor), host, port)
+    address = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving on {address}", file=sys.stderr)
+
+    async with server:
+        await server.serve_forever()
+
+def warm_up() -> None:
+    """
+    Do nothing; submitted once per worker at startup so the process pool is started before the first request.
+    """
+
+def serve(mode: str = "stdio", host: str = "127.0.0.1", port: int = 8765, workers: int = 1) -> None:
+    """
+    Run the daemon in JSON-lines ("stdio") or HTTP ("http") mode.
+
+    With one worker, operations run on a single background thread; with more,
+    they run on a pool of processes, all started before the first request is
+    read, so CPU-bound requests proceed in parallel.
+
+    Args:
+        mode (str, optional): "stdio" or "http". Defaults to "stdio".
+        host (str, optional): Interface to bind in HTTP mode. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on in HTTP mode. Defaults to 8765.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+    """
+
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else ThreadPoolExecutor(max_workers=1)
+
+    try:
+        wait([executor.submit(warm_up) for _ in range(workers)])
+        asyncio.run(serve_stdio(executor) if mode == "stdio" else serve_http(executor, host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown(cancel_futures=True)
\ No newline at end of file
@@ -0,0 +1,312 @@
+import json
+import os
+from itertools import combinations, product
+
+import numpy as np
+
+from primer import complement, reverse
+from seqio import iter_records
+from temp import BASE_CODES
+
+
+INDEX_MAGIC = b"PDUKIDX1"
+
+DEFAULT_K = 12
+
+
+class KmerIndex:
+    """
+    Memory-mapped k-mer index of a reference FASTA/GenBank file.
+
+    The index file holds the 2-bit base codes of every record (separated by
+    an invalid code so k-mers never span records), the sorted codes of every
+    k-mer without ambiguous bases, and the matching start positions. All three
+    arrays are opened with np.memmap, so opening an index is instant and only
+    the pages touched by a query are read. The header also records k and the
+    size and modification time of the reference it was built from.
+
+    Args:
+        path (str): Path to an index written by build_index.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as handle:
+            if handle.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError(f"{path} is not a k-mer index file.")
+
+            header_length = int.from_bytes(handle.read(8), "little")
+            header = json.loads(handle.read(header_length))
+
+        self.path = path
+        self.k = header["k"]
+        self.reference = header.get("reference")
+        self.records = header["records"]
+        self.record_starts = np.array([start for _, start, _ in self.records], dtype=np.int64)
+        self.sequence = np.memmap(path, dtype=np.uint8, mode="r", offset=header["sequence_offset"], shape=(header["sequence_length"],))
+        self.kmers = np.memmap(path, dtype=np.uint64, mode="r", offset=header["kmers_offset"], shape=(header["kmer_count"],))
+        self.positions = np.memmap(path, dtype=np.uint32, mode="r", offset=header["positions_offset"], shape=(header["kmer_count"],))
+
+    def lookup(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Return the start positions of every k-mer whose code is in `codes`.
+
+        Args:
+            codes (np.ndarray): uint64 k-mer codes.
+        """
+
+        codes = np.asarray(codes, dtype=np.uint64)
+        left = np.searchsorted(self.kmers, codes, side="left")
+        right = np.searchsorted(self.kmers, codes, side="right")
+
+        if not np.any(right > left):
+            return np.zeros(0, dtype=np.int64)
+
+        return np.concatenate([self.positions[start:stop] for start, stop in zip(left, right) if stop > start]).astype(np.int64)
+
+    def locate(self, position: int) -> tuple[str, int]:
+        """
+        Convert a position in the concatenated reference into (record name, 0-based offset).
+
+        Args:
+            position (int): Position in the concatenated reference.
+        """
+
+        index = int(np.searchsorted(self.record_starts, position, side="right")) - 1
+        name, start, _ = self.records[index]
+
+        return name, position - start
+
+def reference_stamp(reference_path: str) -> dict:
+    """
+    Return the size and modification time of a reference file, stored in the index header to detect stale indexes.
+
+    Args:
+        reference_path (str): Path to the reference FASTA or GenBank file.
+    """
+
+    status = os.stat(reference_path)
+
+    return {"size": status.st_size, "mtime_ns": status.st_mtime_ns}
+
+def kmer_codes(codes: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the 2-bit packed code and start position of every k-mer without ambiguous bases.
+
+    Args:
+        codes (np.ndarray): Base codes (A=0, C=1, G=2, T=3, other=4).
+        k (int): k-mer length, at most 32.
+    """
+
+    if not 1 <= k <= 32:
+        raise ValueError("k must be between 1 and 32.")
+
+    count = len(codes) - k + 1
+
+    if count <= 0:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+
+    invalid = np.concatenate(([0], np.cumsum(codes > 3)))
+    valid = (invalid[k:] - invalid[:count]) == 0
+    values = np.zeros(count, dtype=np.uint64)
+    masked = np.minimum(codes, 3).astype(np.uint64)
+
+    for offset in range(k):
+        values = (values << np.uint64(2)) | masked[offset:offset + count]
+
+    starts = np.nonzero(valid)[0]
+
+    return values[starts], starts
+
+def build_index(reference_path: str, index_path: str, k: int = DEFAULT_K) -> KmerIndex:
+    """
+    Build a k-mer index of every record of a reference file and save it to disk.
+
+    Args:
+        reference_path (str): Path to the reference FASTA or GenBank file.
+        index_path (str): Path of the index file to write.
+        k (int, optional): k-mer length. Defaults to DEFAULT_K.
+    """
+
+    pieces, records = [], []
+    start = 0
+
+    for record in iter_records(reference_path):
+        codes = np.concatenate([BASE_CODES[np.frombuffer(chunk.encode("ascii"), dtype=np.uint8)] for chunk in record.iter_chunks()] or [np.zeros(0, dtype=np.uint8)])
+        records.append([record.name, start, len(codes)])
+        pieces.extend([codes, np.array([4], dtype=np.uint8)])
+        start += len(codes) + 1
+
+    sequence = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.uint8)
+
+    if len(sequence) >= 2 ** 32:
+        raise ValueError("References of 4 Gb or more are not supported.")
+
+    kmers, positions = kmer_codes(sequence, k)
+    order = np.argsort(kmers, kind="stable")
+    kmers, positions = kmers[order], positions[order].astype(np.uint32)
+
+    def aligned(offset: int) -> int:
+        return (offset + 7) // 8 * 8
+
+    header = {"k": k, "reference": reference_stamp(reference_path), "records": records, "sequence_length": len(sequence), "kmer_count": len(kmers)}
+    header_length = 4096
+
+    while True:
+        header["sequence_offset"] = aligned(len(INDEX_MAGIC) + 8 + header_length)
+        header["kmers_offset"] = aligned(header["sequence_offset"] + len(sequence))
+        header["positions_offset"] = header["kmers_offset"] + kmers.nbytes
+        encoded = json.dumps(header).encode()
+
+        if len(encoded) <= header_length:
+            break
+
+        header_length = aligned(len(encoded))
+
+    # Written aside and moved into place, so indexes still mapped from the old file stay valid.
+    with open(index_path + ".tmp", "wb") as handle:
+        handle.write(INDEX_MAGIC)
+        handle.write(header_length.to_bytes(8, "little"))
+        handle.write(encoded.ljust(header_length))
+        handle.seek(header["sequence_offset"])
+        handle.write(sequence.tobytes())
+        handle.seek(header["kmers_offset"])
+        handle.write(kmers.tobytes())
+        handle.write(positions.tobytes())
+
+    os.replace(index_path + ".tmp", index_path)
+
+    return KmerIndex(index_path)
+
+def open_index(index_path: str | None, reference_path: str | None = None, k: int | None = None) -> KmerIndex:
+    """
+    Open a k-mer index, building it from the reference first if it does not exist yet.
+
+    An existing index is rebuilt when it was built with another k, or from a
+    reference whose size or modification time has changed since. Without a
+    reference to rebuild from, an index built with another k is an error.
+
+    Args:
+        index_path (str | None): Path to the index file. Defaults to the reference path with a ".kidx" suffix.
+        reference_path (str | None, optional): Reference FASTA/GenBank file to build the index from. Defaults to None.
+        k (int | None, optional): k-mer length; None accepts the k of an existing index. Defaults to None (DEFAULT_K when building).
+    """
+
+    if index_path is None:
+        if reference_path is None:
+            raise ValueError("Either an index or a reference file must be provided.")
+
+        index_path = reference_path + ".kidx"
+
+    if os.path.exists(index_path):
+        index = KmerIndex(index_path)
+
+        if reference_path is None:
+            if k is not None and index.k != k:
+                raise ValueError(f"Index {index_path} was built with k={index.k}, not {k}; give the reference to rebuild it.")
+
+            return index
+
+        if (k is None or index.k == k) and index.reference == reference_stamp(reference_path):
+            return index
+
+        k = index.k if k is None else k
+
+    if reference_path is None:
+        raise ValueError(f"Index {index_path} does not exist and no reference was given to build it.")
+
+    return build_index(reference_path, index_path, DEFAULT_K if k is None else k)
+
+def seed_neighbors(seed: np.ndarray, mismatches: int) -> np.ndarray:
+    """
+    Return the k-mer codes of every sequence within `mismatches` substitutions of the seed.
+
+    Args:
+        seed (np.ndarray): Base codes of the seed (all in 0-3).
+        mismatches (int): Maximum number of substitutions.
+    """
+
+    variants = [seed]
+
+    for count in range(1, mismatches + 1):
+        for columns in combinations(range(len(seed)), count):
+            for shifts in product((1, 2, 3), repeat=count):
+                variant = seed.copy()
+                variant[list(columns)] = (variant[list(columns)] + np.array(shifts, dtype=np.uint8)) % 4
+                variants.append(variant)
+
+    codes = np.zeros(len(variants), dtype=np.uint64)
+
+    for offset in range(len(seed)):
+        codes = (codes << np.uint64(2)) | np.array([variant[offset] for variant in variants], dtype=np.uint64)
+
+    return codes
+
+def find_sites(index: KmerIndex, query: str, mismatches: int = 1, seed_at_end: bool = True) -> list[tuple[int, int]]:
+    """
+    Find every occurrence of `query` on the forward strand of the reference with up to `mismatches` substitutions.
+
+    A k-mer seed at one end of the query is looked up together with all its
+    mismatch variants, and each candidate is then verified over the whole
+    query. Returns sorted (position, mismatches) pairs.
+
+    Args:
+        index (KmerIndex): Reference k-mer index.
+        query (str): Query sequence, at least k bases long.
+        mismatches (int, optional): Maximum number of mismatches. Defaults to 1.
+        seed_at_end (bool, optional): Seed with the last k bases instead of the first k. Defaults to True.
+    """
+
+    k = index.k
+    codes = BASE_CODES[np.frombuffer(query.encode("ascii"), dtype=np.uint8)]
+
+    if len(codes) < k:
+        raise ValueError(f"Query must be at least {k} bases long.")
+
+    seed_start = len(codes) - k if seed_at_end else 0
+    seed = codes[seed_start:seed_start + k]
+
+    if np.any(seed > 3):
+        raise ValueError("Query seed region contains ambiguous bases.")
+
+    starts = np.unique(index.lookup(seed_neighbors(seed, min(mismatches, k))) - seed_start)
+    starts = starts[(starts >= 0) & (starts + len(codes) <= len(index.sequence))]
+
+    if len(starts) == 0:
+        return []
+
+    windows = np.asarray(index.sequence)[starts[:, np.newaxis] + np.arange(len(codes))]
+    # Windows reaching an ambiguous base or a record separator are rejected outright, like seeds.
+    counts = np.sum(windows != codes, axis=1)
+    keep = (counts <= mismatches) & ~np.any(windows > 3, axis=1)
+
+    return [(int(start), int(count)) for start, count in zip(starts[keep], counts[keep])]
+
+def screen_primer(index: KmerIndex, primer: str, region: int = 15, mismatches: int = 1) -> list[dict]:
+    """
+    Find the binding sites of a primer's 3' region on both strands of the reference.
+
+    Strand "+" means the primer's 3' region matches the forward strand (it
+    anneals to the reverse strand and extends towards higher positions).
+
+    Args:
+        index (KmerIndex): Reference k-mer index.
+        primer (str): Primer sequence (5' to 3').
+        region (int, optional): Number of 3' bases to match. Defaults to 15.
+        mismatches (int, optional): Maximum number of mismatches within the region. Defaults to 1.
+    """
+
+    query = primer[-region:]
+    hits = []
+
+    for strand, sequence, seed_at_end in (("+", query, True), ("-", complement(reverse(query)), False)):
+        for position, count in find_sites(index, sequence, mismatches, seed_at_end):
+            name, offset = index.locate(position)
+            hits.append({
+                "strand": strand,
+                "record": name,
+                "start": offset,
+                "end": offset + len(query),
+                "mismatches": count,
+            })
+
+    return hits
\ No newline at end of file
@@ -1,6 +1,77 @@
+from math import prod
+
+import numpy as np
+
+from iupac import IUPAC_CODES, degenerate_options
+
+
+WALLACE_WEIGHTS = np.zeros(256, dtype=np.int64)
+WALLACE_WEIGHTS[list(b"AT")] = 2
+WALLACE_WEIGHTS[list(b"CG")] = 4
+
+GC_MASK = np.zeros(256, dtype=np.int64)
+GC_MASK[list(b"CG")] = 1
+
+# Expected Wallace weight and G/C fraction of every IUPAC code (either case),
+# averaged over the bases it stands for; NaN marks invalid characters.
+IUPAC_WALLACE_WEIGHTS = np.full(256, np.nan)
+IUPAC_GC_FRACTIONS = np.full(256, np.nan)
+
+for code, bases in IUPAC_CODES.items():
+    for letter in (code, code.lower()):
+        IUPAC_WALLACE_WEIGHTS[ord(letter)] = np.mean(WALLACE_WEIGHTS[list(bases.encode("ascii"))])
+        IUPAC_GC_FRACTIONS[ord(letter)] = np.mean(GC_MASK[list(bases.encode("ascii"))])
+
+TM_MODELS = ("wallace", "nn")
+
+# Variants of a degenerate primer whose nearest-neighbor Tm is computed per NumPy call.
+TM_RANGE_CHUNK = 1 << 16
+
+# Largest number of variants enumerated for a nearest-neighbor Tm range (the Wallace range has a closed form).
+TM_RANGE_MAX_VARIANTS = 1 << 25
+
+GAS_CONSTANT = 1.987
+
+# Bases are encoded A=0, C=1, G=2, T=3 and anything else as 4, so a
+# dinucleotide XY is indexed as 5 * X + Y in the nearest-neighbor tables.
+BASE_CODES = np.full(256, 4, dtype=np.uint8)
+BASE_CODES[list(b"ACGT")] = np.arange(4, dtype=np.uint8)
+
+# SantaLucia (1998) unified nearest-neighbor parameters: dH (kcal/mol), dS (cal/K/mol).
+NN_PARAMS = {
+    "AA": (-7.9, -22.2), "TT": (-7.9, -22.2),
+    "AT": (-7.2, -20.4),
+    "TA": (-7.2, -21.3),
+    "CA": (-8.5, -22.7), "TG": (-8.5, -22.7),
+    "GT": (-8.4, -22.4), "AC": (-8.4, -22.4),
+    "CT": (-7.8, -21.0), "AG": (-7.8, -21.0),
+    "GA": (-8.2, -22.2), "TC": (-8.2, -22.2),
+    "CG": (-10.6, -27.2),
+    "GC": (-9.8, -24.4),
+    "GG": (-8.0, -19.9), "CC": (-8.0, -19.9),
+}
+
+# Initiation parameters for a terminal G·C or A·T pair, indexed by base code.
+NN_INIT_DH = np.array([2.3, 0.1, 0.1, 2.3, 0.0])
+NN_INIT_DS = np.array([4.1, -2.8, -2.8, 4.1, 0.0])
+
+NN_SYMMETRY_DS = -1.4
+
+NN_DH = np.zeros(25)
+NN_DS = np.zeros(25)
+
+for dinucleotide, (dh, ds) in NN_PARAMS.items():
+    index = 5 * "ACGT".index(dinucleotide[0]) + "ACGT".index(dinucleotide[1])
+    NN_DH[index] = dh
+    NN_DS[index] = ds
+
+
 def calculate_tm(primer: str, nmer: int) -> float:
     """
     Calculate the melting temperature of the primer using the Wallace rule.
+
+    For a degenerate (IUPAC) primer this is the mean Tm over every variant.
+    The result is always a float, whether or not the primer is degenerate.
     
     Args:
         primer (str): Input primer sequence.
@@ -16,6 +87,323 @@ def calculate_tm(primer: str, nmer: int) -> float:
     c_count = primer_segment.count('C')
     g_count = primer_segment.count('G')
 
+    if a_count + t_count + c_count + g_count != len(primer_segment):
+        return calculate_tm_range(primer_segment, nmer)[2]
+
     tm = 2 * (a_count + t_count) + 4 * (c_count + g_count)
 
-    return tm
\ No newline at end of file
+    return float(tm)
+
+def encode_primers(primers: list[str], nmer: int) -> np.ndarray:
+    """
+    Encode the 3' nmer segment of every primer into a (len(primers), nmer) uint8 array.
+
+    Args:
+        primers (list[str]): Input primer sequences.
+        nmer (int): Length of the DNA segment from the 3' end to encode.
+    """
+
+    if nmer < 1:
+        raise ValueError("nmer must be at least 1.")
+
+    if any(nmer > len(primer) for primer in primers):
+        raise ValueError("nmer cannot be greater than the length of the primer sequence.")
+
+    segments = "".join(primer[-nmer:] for primer in primers).encode("ascii")
+
+    return np.frombuffer(segments, dtype=np.uint8).reshape(len(primers), nmer)
+
+def calculate_tm_batch(primers: list[str], nmer: int, model: str = "wallace", **conditions) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the melting temperature and GC content of many primers at once.
+
+    For each primer the result matches calculate_tm_model(primer, nmer, model, **conditions),
+    so degenerate (IUPAC) primers get their mean Tm and GC content over every
+    variant.
+
+    Args:
+        primers (list[str]): Input primer sequences.
+        nmer (int): Length of the DNA segment from the 3' end to consider for Tm calculation.
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    if model not in TM_MODELS:
+        raise ValueError(f"Unknown Tm model {model!r}; expected one of {', '.join(TM_MODELS)}.")
+
+    if len(primers) == 0:
+        return np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.float64)
+
+    codes = encode_primers(primers, nmer)
+    gc_percent = GC_MASK[codes].sum(axis=1) * 100.0 / nmer
+
+    if model == "nn":
+        if nmer < 2:
+            raise ValueError("nmer must be at least 2 for the nearest-neighbor model.")
+
+        base_codes = BASE_CODES[codes]
+        tm = nn_batch_tms(base_codes, **conditions)
+        concrete = not (base_codes == 4).any()
+    else:
+        weights = WALLACE_WEIGHTS[codes]
+        tm = weights.sum(axis=1).astype(np.float64)
+        concrete = weights.all()
+
+    if concrete:
+        return tm, gc_percent
+
+    # Degenerate (or lower-case) primers are rare, so they are only looked for once the whole batch is known to have some.
+    degenerate = np.flatnonzero((BASE_CODES[codes] == 4).any(axis=1))
+    gc_fractions = IUPAC_GC_FRACTIONS[codes[degenerate]]
+
+    if np.isnan(gc_fractions).any():
+        for row in degenerate:
+            degenerate_options(primers[row][-nmer:])
+
+    if model == "nn":
+        for row in degenerate:
+            tm[row] = calculate_tm_range(primers[row], nmer, model, **conditions)[2]
+    else:
+        tm[degenerate] = IUPAC_WALLACE_WEIGHTS[codes[degenerate]].sum(axis=1)
+
+    gc_percent[degenerate] = gc_fractions.sum(axis=1) * 100.0 / nmer
+
+    return tm, gc_percent
+
+def encode_sequence(sequence: str) -> np.ndarray:
+    """
+    Encode a DNA sequence into nearest-neighbor base codes (A=0, C=1, G=2, T=3, other=4).
+
+    Args:
+        sequence (str): Input DNA sequence.
+    """
+
+    return BASE_CODES[np.frombuffer(sequence.encode("ascii"), dtype=np.uint8)]
+
+def nn_prefix_sums(sequence: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return cumulative nearest-neighbor dH and dS sums along a sequence.
+
+    Element k holds the sum over the dinucleotide stacks starting before
+    position k, so the stacks of the window sequence[start:end] sum to
+    prefix[end - 1] - prefix[start].
+
+    Args:
+        sequence (str): Input DNA sequence.
+    """
+
+    codes = encode_sequence(sequence)
+    stacks = codes[:-1].astype(np.intp) * 5 + codes[1:]
+    dh_prefix = np.concatenate(([0.0], np.cumsum(NN_DH[stacks])))
+    ds_prefix = np.concatenate(([0.0], np.cumsum(NN_DS[stacks])))
+
+    return dh_prefix, ds_prefix
+
+def salt_corrected_tm(
+        dh,
+        ds,
+        length,
+        na: float = 50.0,
+        mg: float = 0.0,
+        dntp: float = 0.0,
+        primer_conc: float = 250.0,
+        self_complementary=False
+    ):
+    """
+    Convert total duplex dH/dS into a melting temperature with salt and concentration corrections.
+
+    Works element-wise on NumPy arrays as well as on plain floats. Mg2+ is
+    converted to a sodium equivalent (von Ahsen et al., 2001) and the entropy
+    is salt-corrected following SantaLucia (1998).
+
+    Args:
+        dh: Total enthalpy including initiation (kcal/mol).
+        ds: Total entropy including initiation (cal/K/mol).
+        length: Number of bases in the duplex.
+        na (float, optional): Monovalent cation concentration (mM). Defaults to 50.0.
+        mg (float, optional): Mg2+ concentration (mM). Defaults to 0.0.
+        dntp (float, optional): dNTP concentration (mM), which chelates Mg2+. Defaults to 0.0.
+        primer_conc (float, optional): Primer strand concentration (nM). Defaults to 250.0.
+        self_complementary (optional): Whether the duplex is self-complementary. Defaults to False.
+    """
+
+    sodium_equivalent = (na + 120 * np.sqrt(max(mg - dntp, 0.0))) / 1000
+
+    if sodium_equivalent <= 0:
+        raise ValueError("Salt concentration must be greater than zero.")
+
+    ds = ds + 0.368 * (np.asarray(length) - 1) * np.log(sodium_equivalent)
+    ds = ds + np.where(self_complementary, NN_SYMMETRY_DS, 0.0)
+    strand_conc = primer_conc * 1e-9 / np.where(self_complementary, 1, 4)
+
+    return 1000 * dh / (ds + GAS_CONSTANT * np.log(strand_conc)) - 273.15
+
+def nn_window_tms(sequence: str, window: int, **conditions) -> np.ndarray:
+    """
+    Calculate the nearest-neighbor Tm of every window of a sequence in O(length).
+
+    Windows are treated as non-self-complementary.
+
+    Args:
+        sequence (str): Input DNA sequence.
+        window (int): Window length.
+        **conditions: Salt and primer concentrations passed to salt_corrected_tm.
+    """
+
+    if window < 2:
+        raise ValueError("Window must be at least 2 bases long.")
+
+    if window > len(sequence):
+        return np.zeros(0)
+
+    codes = encode_sequence(sequence)
+    dh_prefix, ds_prefix = nn_prefix_sums(sequence)
+    starts = np.arange(len(sequence) - window + 1)
+    ends = starts + window
+
+    dh = dh_prefix[ends - 1] - dh_prefix[starts] + NN_INIT_DH[codes[starts]] + NN_INIT_DH[codes[ends - 1]]
+    ds = ds_prefix[ends - 1] - ds_prefix[starts] + NN_INIT_DS[codes[starts]] + NN_INIT_DS[codes[ends - 1]]
+
+    return salt_corrected_tm(dh, ds, window, **conditions)
+
+def nn_batch_tms(codes: np.ndarray, **conditions) -> np.ndarray:
+    """
+    Calculate the nearest-neighbor Tm of every row of an encoded primer array.
+
+    Args:
+        codes (np.ndarray): (n, length) array of base codes from encode_sequence.
+        **conditions: Salt and primer concentrations passed to salt_corrected_tm.
+    """
+
+    stacks = codes[:, :-1].astype(np.intp) * 5 + codes[:, 1:]
+    dh = NN_DH[stacks].sum(axis=1) + NN_INIT_DH[codes[:, 0]] + NN_INIT_DH[codes[:, -1]]
+    ds = NN_DS[stacks].sum(axis=1) + NN_INIT_DS[codes[:, 0]] + NN_INIT_DS[codes[:, -1]]
+
+    complement = np.where(codes < 4, 3 - codes.astype(np.int16), -1)
+    self_complementary = np.all(codes == complement[:, ::-1], axis=1)
+
+    return salt_corrected_tm(dh, ds, codes.shape[1], self_complementary=self_complementary, **conditions)
+
+def calculate_tm_nn(
+        primer: str,
+        nmer: int,
+        na: float = 50.0,
+        mg: float = 0.0,
+        dntp: float = 0.0,
+        primer_conc: float = 250.0
+    ) -> float:
+    """
+    Calculate the melting temperature of the primer using the SantaLucia nearest-neighbor model.
+
+    Args:
+        primer (str): Input primer sequence.
+        nmer (int): Length of the DNA segment from the 3' end to consider for Tm calculation.
+        na (float, optional): Monovalent cation concentration (mM). Defaults to 50.0.
+        mg (float, optional): Mg2+ concentration (mM). Defaults to 0.0.
+        dntp (float, optional): dNTP concentration (mM). Defaults to 0.0.
+        primer_conc (float, optional): Primer strand concentration (nM). Defaults to 250.0.
+    """
+
+    if nmer > len(primer):
+        raise ValueError("nmer cannot be greater than the length of the primer sequence.")
+
+    if nmer < 2:
+        raise ValueError("nmer must be at least 2 for the nearest-neighbor model.")
+
+    codes = encode_sequence(primer[-nmer:])[np.newaxis, :]
+
+    if (codes == 4).any():
+        return calculate_tm_range(primer, nmer, "nn", na=na, mg=mg, dntp=dntp, primer_conc=primer_conc)[2]
+
+    return float(nn_batch_tms(codes, na=na, mg=mg, dntp=dntp, primer_conc=primer_conc)[0])
+
+def calculate_tm_model(primer: str, nmer: int, model: str = "wallace", **conditions) -> float:
+    """
+    Calculate the melting temperature of the primer with the selected model.
+
+    Args:
+        primer (str): Input primer sequence.
+        nmer (int): Length of the DNA segment from the 3' end to consider for Tm calculation.
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    if model == "wallace":
+        return calculate_tm(primer, nmer)
+
+    if model == "nn":
+        return calculate_tm_nn(primer, nmer, **conditions)
+
+    raise ValueError(f"Unknown Tm model {model!r}; expected one of {', '.join(TM_MODELS)}.")
+
+def calculate_tm_range(
+        primer: str,
+        nmer: int,
+        model: str = "wallace",
+        chunk_size: int = TM_RANGE_CHUNK,
+        **conditions
+    ) -> tuple[float, float, float]:
+    """
+    Calculate the minimum, maximum and mean melting temperature over every variant of a degenerate (IUPAC) primer.
+
+    Variants are never materialized as strings. Wallace Tm is additive per
+    base, so the range comes from the lightest, heaviest and mean weight at
+    each position in O(nmer). Nearest-neighbor variants are decoded from
+    their index into base codes `chunk_size` at a time and evaluated with
+    NumPy, so memory stays bounded for libraries of millions of variants.
+
+    Args:
+        primer (str): Input primer sequence, possibly with IUPAC codes.
+        nmer (int): Length of the DNA segment from the 3' end to consider for Tm calculation.
+        model (str, optional): "wallace" or "nn". Defaults to "wallace".
+        chunk_size (int, optional): Number of variants evaluated per NumPy call. Defaults to TM_RANGE_CHUNK.
+        **conditions: Salt and primer concentrations, used by the "nn" model only.
+    """
+
+    if model not in TM_MODELS:
+        raise ValueError(f"Unknown Tm model {model!r}; expected one of {', '.join(TM_MODELS)}.")
+
+    if nmer > len(primer):
+        raise ValueError("nmer cannot be greater than the length of the primer sequence.")
+
+    options = degenerate_options(primer[-nmer:])
+
+    if model == "wallace":
+        weights = [WALLACE_WEIGHTS[list(bases.encode("ascii"))] for bases in options]
+
+        return (
+            float(sum(weight.min() for weight in weights)),
+            float(sum(weight.max() for weight in weights)),
+            float(sum(weight.mean() for weight in weights)),
+        )
+
+    if nmer < 2:
+        raise ValueError("nmer must be at least 2 for the nearest-neighbor model.")
+
+    variants = prod(len(bases) for bases in options)
+
+    if variants > TM_RANGE_MAX_VARIANTS:
+        raise ValueError(f"Too many variants ({variants}) for a nearest-neighbor Tm range; use the Wallace model.")
+
+    # Each degenerate position is one digit of the variant index, the last position varying fastest.
+    positions = np.array([index for index, bases in enumerate(options) if len(bases) > 1], dtype=np.intp)
+    counts = np.array([len(options[index]) for index in positions], dtype=np.int64)
+    strides = np.cumprod(np.concatenate((counts[1:], [1]))[::-1])[::-1]
+    choices = np.full((len(positions), 4), 4, dtype=np.uint8)
+
+    for row, index in enumerate(positions):
+        choices[row, :counts[row]] = encode_sequence(options[index])
+
+    first = encode_sequence("".join(bases[0] for bases in options))
+    low, high, total = np.inf, -np.inf, 0.0
+
+    for start in range(0, variants, chunk_size):
+        index = np.arange(start, min(start + chunk_size, variants), dtype=np.int64)
+        codes = np.repeat(first[np.newaxis, :], len(index), axis=0)
+        codes[:, positions] = choices[np.arange(len(positions)), index[:, np.newaxis] // strides % counts]
+        tms = nn_batch_tms(codes, **conditions)
+        low = min(low, float(tms.min()))
+        high = max(high, float(tms.max()))
+        total += float(tms.sum())
+
+    return low, high, total / variants
\ No newline at end of file
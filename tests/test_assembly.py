@@ -0,0 +1,130 @@
+from itertools import product
+
+import numpy as np
+import pytest
+
+from assembly import choose_windows, design_assembly, junction_candidates, transition_costs, window_tms
+from bench import synthetic_gene
+from primer import reverse_complement
+from temp import calculate_tm_model
+
+
+def junction(length: list[int], shift: list[int], tm: list[float], cost: list[float]) -> dict:
+    return {"length": np.array(length), "shift": np.array(shift), "tm": np.array(tm, dtype=float), "cost": np.array(cost, dtype=float)}
+
+def exhaustive_cost(candidates: list[dict], lengths: list[int], choices: tuple[int, ...], circular: bool) -> float:
+    cost = sum(junction["cost"][choice] for junction, choice in zip(candidates, choices))
+    steps = list(range(1, len(candidates))) + ([0] if circular else [])
+
+    for j in steps:
+        cost += transition_costs(candidates[j - 1], candidates[j], lengths[j])[choices[j - 1], choices[j]]
+
+    return cost
+
+def test_transition_costs_reject_crossing_overlaps():
+    previous = junction([20, 20], [0, 10], [60, 55], [0, 0])
+    current = junction([20, 20], [20, 10], [60, 60], [0, 0])
+
+    # Bases used inside the 30-base fragment: 20 + 20, 20 + 10, 10 + 20, 10 + 10.
+    np.testing.assert_array_equal(transition_costs(previous, current, 30), [[np.inf, 0.0], [2.5, 2.5]])
+
+def test_choose_windows_skips_best_windows_that_cross():
+    candidates = [junction([20, 20], [0, 10], [60, 60], [0, 1]), junction([20, 20], [20, 10], [60, 60], [0, 2])]
+
+    # Both cheapest windows together need 40 bases of the 30-base middle fragment.
+    assert choose_windows(candidates, [100, 30, 100], circular=False) == [1, 0]
+    assert choose_windows(candidates, [100, 40, 100], circular=False) == [0, 0]
+
+def test_choose_windows_balances_overlap_tms():
+    candidates = [junction([20, 20], [10, 10], [55, 60], [0, 0.1]), junction([20], [10], [60], [0])]
+
+    assert choose_windows(candidates, [100, 100, 100], circular=False) == [1, 0]
+
+def test_choose_windows_closes_circular_assemblies():
+    candidates = [junction([20, 20], [20, 10], [60, 60], [0, 1]), junction([20, 20], [0, 10], [60, 60], [0, 2])]
+
+    # Linear, fragment 0 is only an end; closing the circle puts both overlaps inside its 30 bases.
+    assert choose_windows(candidates, [30, 100], circular=False) == [0, 0]
+    assert choose_windows(candidates, [30, 100], circular=True) == [1, 0]
+
+def test_choose_windows_raises_when_nothing_fits():
+    candidates = [junction([20], [0], [60], [0]), junction([20], [20], [60], [0])]
+
+    with pytest.raises(ValueError):
+        choose_windows(candidates, [100, 30, 100], circular=False)
+
+@pytest.mark.parametrize("circular", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_choose_windows_matches_exhaustive_search(seed, circular):
+    rng = np.random.default_rng(seed)
+    candidates = []
+
+    for _ in range(3):
+        length = rng.integers(18, 30, size=4)
+        candidates.append(junction(length, rng.integers(0, length + 1), rng.uniform(55.0, 65.0, size=4), rng.uniform(0.0, 5.0, size=4)))
+
+    lengths = rng.integers(30, 60, size=3 if circular else 4).tolist()
+    choices = choose_windows(candidates, lengths, circular)
+    best = min(exhaustive_cost(candidates, lengths, choice, circular) for choice in product(range(4), repeat=3))
+
+    assert exhaustive_cost(candidates, lengths, tuple(choices), circular) == pytest.approx(best)
+
+def test_junction_candidates_slice_the_seam():
+    left, right = synthetic_gene(60, seed=1)[-40:], synthetic_gene(60, seed=2)[:40]
+    found = junction_candidates(left, right, np.zeros(80 - 11, dtype=np.int64), 20, 30, 60.0)
+
+    for start, length, shift, tm in zip(found["start"], found["length"], found["shift"], found["tm"]):
+        overlap = found["region"][start:start + length]
+
+        assert 20 <= length <= 30 and 0 <= shift <= length
+        assert overlap == left[len(left) - shift:] + right[:length - shift]
+        assert tm == pytest.approx(calculate_tm_model(overlap, length))
+
+    assert np.all(np.diff(found["cost"]) >= 0)
+
+@pytest.mark.parametrize("model", ["wallace", "nn"])
+def test_window_tms_match_primer_tm(model):
+    region = synthetic_gene(120, seed=3)
+    starts = np.array([0, 5, 17, 60, 90])
+    lengths = np.array([18, 22, 25, 30, 20])
+    expected = [calculate_tm_model(region[start:start + length], length, model) for start, length in zip(starts, lengths)]
+
+    np.testing.assert_allclose(window_tms(region, starts, lengths, model), expected)
+
+@pytest.mark.parametrize("circular", [False, True])
+def test_design_assembly_overlaps_join_neighbours(circular):
+    fragments = [(f"f{index}", synthetic_gene(300 + 50 * index, seed=20 + index)) for index in range(4)]
+    records = design_assembly(fragments, circular)
+    joined = records if circular else records[:-1]
+
+    for index, record in enumerate(joined):
+        following = records[(index + 1) % len(records)]
+
+        assert record["next"] == following["name"]
+        assert reverse_complement(record["reverse_primer"]).endswith(record["overlap"])
+        assert following["forward_primer"].startswith(record["overlap"])
+
+    total = sum(len(sequence) for _, sequence in fragments)
+    assert sum(record["product_length"] for record in records) - sum(record["overlap_length"] for record in joined) == total
+
+def test_design_assembly_reports_overlap_annealing_inside_fragment():
+    fragments = [(f"f{index}", synthetic_gene(300, seed=40 + index)) for index in range(2)]
+    # 40-base overlaps split evenly put about 20 bases inside each fragment, more than the 16-base primers.
+    records = design_assembly(fragments, circular=True, min_overlap=40, max_overlap=40, anneal_tm=45.0, tm_window=10.0, min_nmer=14, max_nmer=16)
+
+    insides = []
+
+    for index, (record, (_, sequence)) in enumerate(zip(records, fragments)):
+        forward, reverse = record["forward_primer"], reverse_complement(record["reverse_primer"])
+        previous = records[index - 1]
+        forward_inside, reverse_inside = previous["overlap_length"] - previous["overlap_shift"], record["overlap_shift"]
+        insides.extend([forward_inside, reverse_inside])
+
+        assert record["forward_nmer"] == max(forward_inside, record["forward_nmer"]) <= max(forward_inside, 16)
+        assert record["reverse_nmer"] == max(reverse_inside, record["reverse_nmer"]) <= max(reverse_inside, 16)
+        assert forward.endswith(sequence[:record["forward_nmer"]])
+        assert reverse.startswith(sequence[-record["reverse_nmer"]:])
+        assert record["forward_tm"] == pytest.approx(calculate_tm_model(sequence[:record["forward_nmer"]], record["forward_nmer"]))
+        assert record["reverse_tm"] == pytest.approx(calculate_tm_model(reverse_complement(sequence[-record["reverse_nmer"]:]), record["reverse_nmer"]))
+
+    assert max(insides) > 16
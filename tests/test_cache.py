@@ -0,0 +1,89 @@
+from bench import synthetic_gene
+from cache import DesignCache, cache_key, open_cache
+import main as cli
+
+
+def run_all(path: str, capsys) -> str:
+    gene = synthetic_gene(600, seed=1)
+    gene_b = synthetic_gene(600, seed=2)
+    cli.main([
+        "all", "--seq", gene, "--seq-b", gene_b, "--mut", "GGG", "--nmer", "20",
+        "--forward-re", "GAATTC", "--reverse-re", "CTCGAG", "--cache", path
+    ])
+
+    return capsys.readouterr().out
+
+def test_all_cache_twice_in_one_process(tmp_path, capsys):
+    path = str(tmp_path / "designs.sqlite")
+    open_cache.cache_clear()
+
+    first = run_all(path, capsys)
+    second = run_all(path, capsys)
+
+    assert first == second
+    # The second run is served by the in-memory layer, which still counts as a hit.
+    assert open_cache(path).stats()["entries"] == 1
+    assert open_cache(path).stats()["hits"] == 1
+
+def test_reopen_serves_stored_design(tmp_path):
+    path = str(tmp_path / "designs.sqlite")
+    key = cache_key({"command": "test", "seq": "ACGT"})
+    cache = DesignCache(path)
+    cache.put(key, {"primers": ["ACGT"]})
+    cache.close()
+
+    reopened = DesignCache(path)
+
+    assert reopened.get(key) == {"primers": ["ACGT"]}
+    assert reopened.stats()["hits"] == 1
+    reopened.close()
+
+def test_memory_hits_are_counted_and_refresh_access(tmp_path):
+    cache = DesignCache(str(tmp_path / "designs.sqlite"), max_entries=2)
+
+    for index in range(2):
+        cache.put(str(index), {"index": index})
+
+    for _ in range(3):
+        assert cache.get("0") == {"index": 0}
+
+    assert cache.stats()["hits"] == 3
+    assert [entry["hits"] for entry in cache.entries() if entry["key"] == "0"] == [3]
+
+    # Entry 0 was read from memory after 1 was written, so 1 is the least recently used.
+    cache.put("2", {"index": 2})
+
+    assert cache.evict() == 1
+    assert cache.get("1") is None
+    cache.close()
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = DesignCache(str(tmp_path / "designs.sqlite"), max_entries=2)
+
+    for index in range(3):
+        cache.put(str(index), {"index": index})
+
+    cache.memory.clear()
+    cache.get("0")
+
+    assert cache.evict() == 1
+    assert cache.get("1") is None
+    assert cache.get("0") == {"index": 0}
+    assert cache.get("2") == {"index": 2}
+    cache.close()
+
+def test_get_or_compute_computes_once(tmp_path):
+    cache = DesignCache(str(tmp_path / "designs.sqlite"))
+    calls = []
+
+    def compute() -> dict:
+        calls.append(1)
+        return {"value": len(calls)}
+
+    inputs = {"command": "test", "nmer": 20}
+
+    assert cache.get_or_compute(inputs, compute) == {"value": 1}
+    assert cache.get_or_compute(inputs, compute) == {"value": 1}
+    assert cache.stats()["entries"] == 1
+    assert len(calls) == 1
+    cache.close()
@@ -0,0 +1,92 @@
+import random
+
+from ispcr import binding_sites, find_amplicons, run_pcr
+from primer import reverse_complement
+
+
+OVERHANG_F = "GAATTC"
+OVERHANG_R = "CTCGAG"
+
+
+def random_sequence(length: int, seed: int) -> str:
+    rng = random.Random(seed)
+
+    return "".join(rng.choice("ACGT") for _ in range(length))
+
+def template_with_sites() -> tuple[str, str, str]:
+    """
+    Return a template with a forward site at 100-120 and a reverse site at 320-340, and primers for them with 6-base overhangs.
+    """
+
+    template = list(random_sequence(460, seed=1))
+    # Bases next to the sites differ from the overhangs, so the overhangs do not anneal.
+    template[99] = "A"
+    template[340] = "A"
+    template = "".join(template)
+
+    return template, OVERHANG_F + template[100:120], OVERHANG_R + reverse_complement(template[320:340])
+
+def mutate(template: str, position: int) -> str:
+    return template[:position] + ("A" if template[position] != "A" else "C") + template[position + 1:]
+
+def products(template: str, forward: str, reverse: str, **options) -> list[tuple]:
+    return [
+        (amplicon["kind"], amplicon["start"], amplicon["end"], amplicon["length"], amplicon["forward_mismatches"], amplicon["reverse_mismatches"])
+        for amplicon in run_pcr([("t", template)], [("pair", forward, reverse)], **options)
+    ]
+
+def test_overhangs_only_need_to_anneal_at_the_3_end():
+    template, forward, reverse = template_with_sites()
+
+    assert binding_sites(template, forward) == [{"strand": "+", "start": 100, "end": 120, "mismatches": 0, "overhang": 6}]
+    assert binding_sites(template, reverse) == [{"strand": "-", "start": 320, "end": 340, "mismatches": 0, "overhang": 6}]
+    # The product carries both overhangs: 6 + 240 + 6 bp.
+    assert products(template, forward, reverse) == [("F-R", 100, 340, 252, 0, 0)]
+
+def test_overhang_matching_the_template_extends_the_site():
+    template, forward, reverse = template_with_sites()
+    template = template[:96] + "GTTC" + template[100:]
+
+    assert binding_sites(template, forward)[0] == {"strand": "+", "start": 97, "end": 120, "mismatches": 0, "overhang": 3}
+    assert products(template, forward, reverse) == [("F-R", 97, 340, 252, 0, 0)]
+
+def test_mismatch_and_seed_limits():
+    template, forward, reverse = template_with_sites()
+    # 10 bases from the forward 3' end: inside the annealed bases but outside the 5-base seed.
+    outside_seed = mutate(template, 110)
+    # 3 bases from the reverse primer's 3' end (template 320-340 read on the other strand).
+    inside_seed = mutate(template, 322)
+
+    assert products(outside_seed, forward, reverse) == [("F-R", 100, 340, 252, 1, 0)]
+    assert products(outside_seed, forward, reverse, mismatches=0) == []
+    assert products(mutate(mutate(mutate(template, 105), 108), 110), forward, reverse) == []
+    assert products(inside_seed, forward, reverse) == []
+    assert products(inside_seed, forward, reverse, seed=2) == [("F-R", 100, 340, 252, 0, 1)]
+
+def test_max_size_filters_products():
+    template, forward, reverse = template_with_sites()
+
+    assert products(template, forward, reverse, max_size=251) == []
+    assert products(template, forward, reverse, max_size=252) == [("F-R", 100, 340, 252, 0, 0)]
+
+def test_reverse_strand_templates():
+    template, forward, reverse = template_with_sites()
+    flipped = reverse_complement(template)
+
+    assert binding_sites(flipped, forward)[0]["strand"] == "-"
+    assert products(flipped, forward, reverse) == [("R-F", 120, 360, 252, 0, 0)]
+
+def test_single_primer_products():
+    template, forward, reverse = template_with_sites()
+    # A second, inverted copy of the forward site lets the forward primer prime both ends.
+    template = template[:400] + reverse_complement(template[100:120]) + "A" + template[421:]
+
+    assert sorted(products(template, forward, reverse)) == [("F-F", 100, 420, 332, 0, 0), ("F-R", 100, 340, 252, 0, 0)]
+    assert products(template, forward, forward) == [("F-F", 100, 420, 332, 0, 0)]
+
+def test_amplicons_need_facing_sites():
+    template, forward, reverse = template_with_sites()
+
+    # Sites on one strand only, or facing away from each other, amplify nothing.
+    assert find_amplicons(template, {"R": reverse}) == []
+    assert find_amplicons(template, {"F": template[300:320], "R": reverse_complement(template[100:120])}) == []
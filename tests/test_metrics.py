@@ -0,0 +1,35 @@
+import json
+import tracemalloc
+
+from metrics import METRICS, profiling, stage
+
+
+def run(tmp_path, **options) -> dict:
+    path = tmp_path / "metrics.json"
+
+    with profiling("test", str(path), **options):
+        with stage("outer"):
+            with stage("inner"):
+                bytearray(1 << 16)
+
+    return json.loads(path.read_text())
+
+def test_memory_tracking_is_opt_in(tmp_path):
+    report = run(tmp_path)
+
+    assert report["peak_bytes"] is None
+    assert report["stages"]["outer/inner"]["calls"] == 1
+    assert report["stages"]["outer/inner"]["peak_bytes"] == 0
+
+    report = run(tmp_path, track_memory=True)
+
+    assert report["peak_bytes"] >= 1 << 16
+    assert report["stages"]["outer/inner"]["peak_bytes"] >= 1 << 16
+
+def test_profiling_disables_metrics_afterwards(tmp_path):
+    run(tmp_path, track_memory=True)
+
+    assert not METRICS.enabled
+    assert not METRICS.track_memory
+    assert not tracemalloc.is_tracing()
+    assert stage("after") is stage("other")
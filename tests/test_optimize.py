@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from optimize import annealing_candidates, annealing_tms
+from temp import calculate_tm, calculate_tm_nn
+
+
+# Starts with the self-complementary EcoRI site, so the 6-base prefix needs the symmetry correction.
+REGION = "GAATTCAGCTAGCATCGATGCAAGCTTACGGATCCA"
+
+
+def test_annealing_tms_match_calculate_tm_nn():
+    tms = annealing_tms(REGION, "nn", na=50.0, mg=1.5, dntp=0.2)
+    expected = [calculate_tm_nn(REGION[:length], length, na=50.0, mg=1.5, dntp=0.2) for length in range(2, len(REGION) + 1)]
+
+    assert np.isnan(tms[:2]).all()
+    np.testing.assert_allclose(tms[2:], expected)
+
+def test_annealing_tms_match_calculate_tm():
+    tms = annealing_tms(REGION)
+
+    np.testing.assert_allclose(tms[1:], [calculate_tm(REGION[:length], length) for length in range(1, len(REGION) + 1)])
+
+def test_annealing_candidates_keep_lengths_in_window():
+    found = annealing_candidates(REGION, 10, 30, 60.0, 4.0, model="nn")
+
+    assert found
+    assert all(10 <= nmer <= 30 and abs(tm - 60.0) <= 4.0 for nmer, tm in found)
+    assert [tm for _, tm in found] == pytest.approx([calculate_tm_nn(REGION[:nmer], nmer) for nmer, _ in found])
@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from packed import SHORT_FETCH, PackedSeq
+from primer import construct_primers, reverse_complement
+
+
+def random_sequence(length: int, seed: int, alphabet: str = "ACGT") -> str:
+    rng = random.Random(seed)
+
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+def test_round_trip_across_chunk_boundaries():
+    sequence = random_sequence(1_003, seed=1)
+
+    assert str(PackedSeq(sequence)) == sequence
+    assert str(PackedSeq([sequence[:5], sequence[5:502], sequence[502:]])) == sequence
+    assert len(PackedSeq(sequence)) == 1_003
+    assert str(PackedSeq("")) == ""
+
+def test_masked_bases_round_trip():
+    sequence = "ACGTNNRYKMacgtswbdhvnACGT"
+    packed = PackedSeq(sequence)
+
+    assert str(packed) == sequence.upper()
+    assert packed[4] == "N"
+    assert packed[-5] == "N"
+    assert packed[14:20] == "SWBDHV"
+    assert packed.codes().tolist()[:8] == [0, 1, 2, 3, 4, 4, 4, 4]
+
+def test_long_masked_sequence_round_trips_through_views():
+    sequence = random_sequence(3 * SHORT_FETCH, seed=2, alphabet="ACGTACGTACGTNRY")
+    packed = PackedSeq(sequence.lower())
+    view = packed[7:-9]
+
+    assert isinstance(view, PackedSeq)
+    assert str(view) == sequence[7:-9]
+    assert str(view[SHORT_FETCH:]) == sequence[7:-9][SHORT_FETCH:]
+    assert "".join(packed.iter_chunks(100)) == sequence
+
+@pytest.mark.parametrize("key", [
+    slice(None, 3),
+    slice(-23, None),
+    slice(-23, -3),
+    slice(3, 23),
+    slice(50, 10),
+    slice(-5000, 5),
+    slice(None, None, 2),
+    slice(None, None, -1),
+    slice(-3, 2, -3),
+    slice(0, SHORT_FETCH + 1),
+])
+def test_slices_match_str(key: slice):
+    sequence = random_sequence(600, seed=3, alphabet="ACGTACGTN")
+    packed = PackedSeq(sequence)
+
+    assert str(packed[key]) == sequence[key]
+    assert str(packed[key]) == sequence[key]
+    assert str(packed.reverse_complement()[key]) == reverse_complement(sequence)[key]
+
+def test_short_slices_are_str_and_long_slices_are_views():
+    packed = PackedSeq(random_sequence(2 * SHORT_FETCH, seed=4))
+
+    assert isinstance(packed[:SHORT_FETCH], str)
+    assert isinstance(packed[:SHORT_FETCH + 1], PackedSeq)
+    assert packed[-23:] is packed[-23:]
+
+def test_integer_indices():
+    sequence = "ACGTN"
+    packed = PackedSeq(sequence)
+
+    assert [packed[index] for index in range(-5, 5)] == [sequence[index] for index in range(-5, 5)]
+
+    with pytest.raises(IndexError):
+        packed[5]
+
+    with pytest.raises(IndexError):
+        packed[-6]
+
+def test_reverse_complement_is_cached_view():
+    sequence = random_sequence(700, seed=5, alphabet="ACGTACGTRYN")
+    packed = PackedSeq(sequence)
+    rc = packed.reverse_complement()
+
+    assert str(rc) == reverse_complement(sequence)
+    assert rc.reverse_complement() is packed
+    assert packed.reverse_complement() is rc
+    assert packed.complement() == sequence.translate(str.maketrans("ACGTRYN", "TGCAYRN"))
+    assert str(packed[100:500].reverse_complement()) == reverse_complement(sequence[100:500])
+    assert str(rc[100:500].reverse_complement()) == reverse_complement(sequence)[100:500][::-1].translate(str.maketrans("ACGTRYN", "TGCAYRN"))
+
+def test_equality_and_hash():
+    packed = PackedSeq("ACGTN")
+
+    assert packed == "ACGTN"
+    assert packed == PackedSeq("acgtn")
+    assert packed != "ACGT"
+    assert hash(packed) == hash("ACGTN")
+
+def test_construct_primers_match_str():
+    gene = "ATG" + random_sequence(900, seed=6) + "TAA"
+    gene_b = "ATG" + random_sequence(600, seed=7) + "TGA"
+
+    assert construct_primers(PackedSeq(gene), "", "", 20, "GAATTC", "CTCGAG") == construct_primers(gene, "", "", 20, "GAATTC", "CTCGAG")
+    assert construct_primers(PackedSeq(gene), PackedSeq(gene_b), "GGG", 20, "GAATTC", "CTCGAG") == construct_primers(gene, gene_b, "GGG", 20, "GAATTC", "CTCGAG")
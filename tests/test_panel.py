@@ -0,0 +1,118 @@
+from itertools import product
+
+import numpy as np
+import pytest
+
+from dimer import THREE_PRIME_RUN_THRESHOLD, dimer_matrix
+from panel import anneal_panel, build_problem, panel_cost, three_prime_runs
+
+
+# 3' ends without any complementary run of THREE_PRIME_RUN_THRESHOLD bases, to themselves or each other.
+QUIET = "ACACACACACACACACAC"
+
+
+def random_primers(rng: np.random.Generator, count: int) -> list[str]:
+    return ["".join(rng.choice(list("ACGT"), size=rng.integers(15, 26))) for _ in range(count)]
+
+def random_candidates(rng: np.random.Generator, targets: int, pairs: int) -> list[dict]:
+    return [
+        {
+            "forward_primer": random_primers(rng, pairs),
+            "reverse_primer": random_primers(rng, pairs),
+            "forward_tm": rng.uniform(55.0, 65.0, size=pairs),
+            "reverse_tm": rng.uniform(55.0, 65.0, size=pairs),
+            "product_length": rng.integers(100, 400, size=pairs),
+        }
+        for _ in range(targets)
+    ]
+
+def candidates(pairs: list[list[tuple[str, str, float, int]]]) -> list[dict]:
+    return [
+        {
+            "forward_primer": [forward for forward, _, _, _ in target],
+            "reverse_primer": [reverse for _, reverse, _, _ in target],
+            "forward_tm": np.array([tm for _, _, tm, _ in target]),
+            "reverse_tm": np.array([tm for _, _, tm, _ in target]),
+            "product_length": np.array([size for _, _, _, size in target]),
+        }
+        for target in pairs
+    ]
+
+def exhaustive_optimum(problem: dict) -> float:
+    return min(panel_cost(problem, np.array(assignment)) for assignment in product(*problem["options"]))
+
+def test_three_prime_runs_edge_cases():
+    primers = [
+        "CCCCCCACGT",        # 3' end ACGT is its own reverse complement: a run of exactly the threshold
+        "AAAAAAAAAAGGATCC",  # GGATCC pairs with itself and with the same site inside primer 3
+        "TTTTTTTTTGAT",      # Only 3-base runs, reported as 0
+        "ACACACACAGGATCCA",
+        "CCCCCCCCCCNACGT",   # An N next to the run does not break it
+        "GGGATC",            # Shorter than the others, so it is padded
+    ]
+    expected = [
+        [4, 0, 0, 0, 4, 0],
+        [0, 6, 0, 6, 0, 5],
+        [0, 0, 0, 0, 0, 0],
+        [0, 6, 0, 0, 0, 5],
+        [4, 0, 0, 0, 4, 0],
+        [0, 5, 0, 5, 0, 4],
+    ]
+
+    np.testing.assert_array_equal(three_prime_runs(primers), expected)
+
+    runs = dimer_matrix(primers)["three_prime_run"]
+    np.testing.assert_array_equal(expected, np.where(runs >= THREE_PRIME_RUN_THRESHOLD, runs, 0))
+
+    assert three_prime_runs(["ACG", "CGT"]).tolist() == [[0, 0], [0, 0]]
+    assert three_prime_runs([]).shape == (0, 0)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_three_prime_runs_match_dimer_matrix(seed):
+    primers = random_primers(np.random.default_rng(seed), 30)
+    expected = dimer_matrix(primers)["three_prime_run"]
+
+    np.testing.assert_array_equal(three_prime_runs(primers), np.where(expected >= THREE_PRIME_RUN_THRESHOLD, expected, 0))
+
+def test_anneal_spaces_amplicons():
+    problem = build_problem(candidates([
+        [(QUIET, QUIET, 60.0, 200)],
+        [(QUIET, QUIET, 60.0, 210), (QUIET, QUIET, 60.0, 300)],
+        [(QUIET, QUIET, 60.0, 250), (QUIET, QUIET, 60.0, 400)],
+    ]), min_spacing=50)
+    cost, best = anneal_panel(problem, np.array([0, 1, 3]), 500, 0)
+
+    assert problem["runs"].max() == 0
+    assert best.tolist() == [0, 2, 4]
+    assert cost == pytest.approx(panel_cost(problem, best)) == pytest.approx(0.0)
+
+def test_anneal_avoids_three_prime_runs():
+    problem = build_problem(candidates([
+        [(QUIET + "GGATCC", QUIET, 60.0, 200)],
+        [(QUIET + "GGATCC", QUIET, 60.0, 400), (QUIET, QUIET, 61.0, 400)],
+    ]), min_spacing=50)
+    cost, best = anneal_panel(problem, np.array([0, 1]), 500, 0)
+
+    # The shared BamHI site gives 6-base runs; a 1 °C Tm spread costs less.
+    assert problem["runs"][0, 1] == 6 and problem["runs"][0, 2] == 0
+    assert best.tolist() == [0, 2]
+    assert cost == pytest.approx(exhaustive_optimum(problem))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_anneal_finds_exhaustive_optimum(seed):
+    rng = np.random.default_rng(seed)
+    problem = build_problem(random_candidates(rng, 3, 4), min_spacing=50)
+    start = np.array([choices[0] for choices in problem["options"]])
+
+    cost, best = anneal_panel(problem, start, 3000, seed)
+
+    assert cost == pytest.approx(panel_cost(problem, best))
+    assert cost == pytest.approx(exhaustive_optimum(problem))
+
+def test_anneal_keeps_panel_without_choices():
+    problem = build_problem(candidates([[(QUIET, QUIET, 58.0 + target, 100 * target)] for target in range(3)]), min_spacing=50)
+    start = np.array([choices[0] for choices in problem["options"]])
+    cost, best = anneal_panel(problem, start, 100, 0)
+
+    np.testing.assert_array_equal(best, start)
+    assert cost == pytest.approx(panel_cost(problem, start))
@@ -0,0 +1,58 @@
+import json
+
+import main as cli
+from restriction import (
+    ENZYMES,
+    PAIR_BLUNT,
+    PAIR_COMPATIBLE,
+    PAIR_DIRECTIONAL,
+    PAIR_STICKY_BLUNT,
+    PAIR_UNKNOWN,
+    RESTRICTION_FIELDS,
+    pair_rank,
+    sticky_end,
+    suggest_enzyme_pairs,
+)
+
+
+def end(name: str):
+    return sticky_end(name, ENZYMES[name])
+
+def test_sticky_ends():
+    assert end("EcoRI") == ("5'", "AATT")
+    assert end("PstI") == ("3'", "TGCA")
+    assert end("EcoRV") == ("blunt", "")
+    assert end("BsaI") == ("5'", "NNNN")
+    assert sticky_end("Custom", "GAATTC") is None
+
+def test_pair_ranks():
+    assert pair_rank(end("EcoRI"), end("XhoI")) == PAIR_DIRECTIONAL
+    assert pair_rank(end("BamHI"), end("BglII")) == PAIR_COMPATIBLE
+    assert pair_rank(end("AvaI"), end("XhoI")) == PAIR_COMPATIBLE
+    assert pair_rank(end("BsaI"), end("BsmBI")) == PAIR_DIRECTIONAL
+    assert pair_rank(end("EcoRI"), end("EcoRV")) == PAIR_STICKY_BLUNT
+    assert pair_rank(end("EcoRV"), end("SmaI")) == PAIR_BLUNT
+    assert pair_rank(end("EcoRI"), None) == PAIR_UNKNOWN
+
+def test_suggested_pairs_are_ranked_and_capped():
+    enzymes = {name: ENZYMES[name] for name in ("BamHI", "BglII", "EcoRV", "SmaI", "NotI", "EcoRI")}
+    non_cutters, pairs = suggest_enzyme_pairs(["GAATTC"], enzymes, top=None)
+
+    assert "EcoRI" not in non_cutters
+    assert pairs[0] == ("BamHI", "NotI")
+    assert pairs[-1] == ("EcoRV", "SmaI")
+    assert ("BamHI", "BglII") in pairs[-3:]
+    assert len(suggest_enzyme_pairs(["GAATTC"], enzymes, top=2)[1]) == 2
+
+def test_restriction_jsonl_output_has_sites_non_cutters_and_pairs(capsys):
+    cli.main(["--format", "jsonl", "restriction", "--seq", "AAGAATTCAA", "--enzymes", "EcoRI,BamHI,NotI,XhoI", "--top", "2"])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert [record["record"] for record in records] == ["site", "non_cutter", "non_cutter", "non_cutter", "pair", "pair"]
+    assert records[0]["enzyme"] == "EcoRI" and records[0]["position"] == 3 and records[0]["site"] == "GAATTC"
+    assert [record["enzyme"] for record in records[1:4]] == ["BamHI", "NotI", "XhoI"]
+    assert [(record["rank"], record["enzyme_a"], record["enzyme_b"], record["score"]) for record in records[4:]] == [
+        (1, "BamHI", "NotI", PAIR_DIRECTIONAL),
+        (2, "BamHI", "XhoI", PAIR_DIRECTIONAL),
+    ]
+    assert set(records[0]) == set(RESTRICTION_FIELDS)
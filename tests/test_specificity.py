@@ -0,0 +1,75 @@
+import os
+import random
+
+import pytest
+
+from specificity import build_index, find_sites, open_index, screen_primer
+
+
+def random_sequence(length: int, seed: int) -> str:
+    rng = random.Random(seed)
+
+    return "".join(rng.choice("ACGT") for _ in range(length))
+
+@pytest.fixture
+def reference(tmp_path) -> str:
+    path = tmp_path / "reference.fa"
+    path.write_text(f">one\n{random_sequence(200, 1)}NACGT\n>two\n{random_sequence(200, 2)}\n")
+
+    return str(path)
+
+def test_find_sites_with_mismatches(reference):
+    index = build_index(reference, reference + ".kidx")
+    query = random_sequence(200, 2)[50:70]
+    mutated = query[:5] + ("A" if query[5] != "A" else "C") + query[6:]
+
+    assert find_sites(index, query, 0) == [(256, 0)]
+    assert find_sites(index, mutated, 0) == []
+    assert find_sites(index, mutated, 1) == [(256, 1)]
+
+def test_windows_over_separators_and_ambiguous_bases_are_rejected(reference):
+    index = build_index(reference, reference + ".kidx")
+    one, two = random_sequence(200, 1), random_sequence(200, 2)
+
+    # The last base falls on the N, or on the separator after the last record; the 5' seed still matches.
+    assert find_sites(index, one[-15:] + "A", 1, seed_at_end=False) == []
+    assert find_sites(index, two[-15:] + "A", 1, seed_at_end=False) == []
+    assert find_sites(index, one[-15:], 1, seed_at_end=False) == [(185, 0)]
+    assert find_sites(index, two[-15:], 1, seed_at_end=False) == [(391, 0)]
+
+def test_screen_primer_reports_both_strands(reference):
+    index = build_index(reference, reference + ".kidx")
+    two = random_sequence(200, 2)
+    site = two[100:118]
+    rc = site[::-1].translate(str.maketrans("ACGT", "TGCA"))
+    hits = screen_primer(index, "GGGG" + site, region=15, mismatches=0)
+
+    assert {"strand": "+", "record": "two", "start": 103, "end": 118, "mismatches": 0} in hits
+    assert any(hit["strand"] == "-" for hit in screen_primer(index, rc, region=15, mismatches=0))
+
+def test_open_index_rebuilds_stale_index(reference):
+    index_path = reference + ".kidx"
+    index = open_index(None, reference)
+
+    assert index.k == 12
+    assert open_index(None, reference).reference == index.reference
+
+    with open(reference, "a") as handle:
+        handle.write(">three\nACGTACGTACGTACGT\n")
+
+    rebuilt = open_index(None, reference)
+
+    assert [name for name, _, _ in rebuilt.records] == ["one", "two", "three"]
+    assert open_index(index_path, reference, k=10).k == 10
+    assert open_index(index_path).k == 10
+    assert not os.path.exists(index_path + ".tmp")
+
+def test_open_index_without_reference_rejects_other_k(reference):
+    index_path = reference + ".kidx"
+    build_index(reference, index_path, k=10)
+
+    with pytest.raises(ValueError):
+        open_index(index_path, k=12)
+
+    with pytest.raises(ValueError):
+        open_index(str(reference) + ".missing")
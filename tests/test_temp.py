@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from iupac import degeneracy, expand_degenerate
+from primer import complement, reverse_complement
+from temp import calculate_tm, calculate_tm_batch, calculate_tm_model, calculate_tm_range
+
+
+def test_degenerate_complement():
+    assert complement("ACGTRYSWKMBDHVN") == "TGCAYRSWMKVHDBN"
+    assert complement("acgtnnk") == "tgcannm"
+    assert reverse_complement("ATGNNK") == "MNNCAT"
+    assert reverse_complement(reverse_complement("GATRYSWKMBDHVNC")) == "GATRYSWKMBDHVNC"
+
+def test_reverse_complement_covers_every_variant():
+    primer = "ACRYK"
+    expected = sorted(reverse_complement(variant) for variant in expand_degenerate(primer))
+
+    assert sorted(expand_degenerate(reverse_complement(primer))) == expected
+
+@pytest.mark.parametrize("model", ["wallace", "nn"])
+def test_tm_range_matches_expanded_variants(model):
+    primer = "ATGCGTACGTTAGCNNKACG"
+    tms = [calculate_tm_model(variant, 20, model) for variant in expand_degenerate(primer)]
+    low, high, mean = calculate_tm_range(primer, 20, model)
+
+    assert degeneracy(primer) == len(tms) == 32
+    assert low == pytest.approx(min(tms))
+    assert high == pytest.approx(max(tms))
+    assert mean == pytest.approx(np.mean(tms))
+
+def test_tm_range_of_concrete_primer_is_a_point():
+    assert calculate_tm_range("ATGCGTACGT", 10) == (30.0, 30.0, 30.0)
+    assert calculate_tm_range("GGGNATGCGTACGT", 10) == (30.0, 30.0, 30.0)
+
+def test_tm_range_rejects_invalid_input():
+    with pytest.raises(ValueError):
+        calculate_tm_range("ATGXATG", 7)
+
+    with pytest.raises(ValueError):
+        calculate_tm_range("ATG", 4)
+
+    with pytest.raises(ValueError):
+        calculate_tm_range("ATG", 3, model="other")
+
+def test_calculate_tm_is_always_float():
+    for primer in ("ATGCGTACGT", "ATGCGTACGN", "atgcgtacgt"):
+        assert type(calculate_tm(primer, 10)) is float
+
+    assert calculate_tm("ATGCGTACGT", 10) == 30.0
+    assert calculate_tm("atgcgtacgt", 10) == 30.0
+    assert calculate_tm("ATGCGTACGN", 10) == 31.0
+
+@pytest.mark.parametrize("model", ["wallace", "nn"])
+def test_batch_tm_matches_single_tm_on_degenerate_primers(model):
+    primers = ["ATGCGTACGTTAGCAGTACG", "ATGCGTACGTTAGCNNKACG", "atgcgtacgttagcagtacg", "ATGCGTACGTTAGCAGTACR"]
+    tms, gc_percents = calculate_tm_batch(primers, 20, model)
+
+    assert tms.dtype == np.float64
+    np.testing.assert_allclose(tms, [calculate_tm_model(primer, 20, model) for primer in primers])
+    np.testing.assert_allclose(gc_percents, [50.0, 52.5, 50.0, 47.5])
+
+def test_batch_tm_types_are_consistent():
+    concrete, _ = calculate_tm_batch(["ATGCGTACGT"], 10)
+    degenerate, _ = calculate_tm_batch(["ATGCGTACGN"], 10)
+    empty, _ = calculate_tm_batch([], 10)
+
+    assert concrete.dtype == degenerate.dtype == empty.dtype == np.float64
+
+    with pytest.raises(ValueError):
+        calculate_tm_batch(["ATGCGTACGX"], 10)
@@ -0,0 +1,39 @@
+import io
+
+import pytest
+
+from batch import RESULT_FIELDS
+from writers import ArrowWriter, DelimitedWriter, RecordWriter
+
+
+def test_record_writer_is_abstract():
+    with pytest.raises(TypeError):
+        RecordWriter(io.StringIO())
+
+def test_arrow_schema_does_not_depend_on_first_batch():
+    pyarrow = pytest.importorskip("pyarrow")
+    handle = io.BytesIO()
+    failed = {"row": 1, "name": "bad", "error": "ValueError: nmer"}
+    designed = {"row": 2, "name": "good", "forward_primer": "ACGT", "forward_tm": 60.5, "forward_ta": 55.5, "product_length": 900}
+
+    with ArrowWriter(handle, RESULT_FIELDS, batch_size=1) as writer:
+        writer.write(failed)
+        writer.write({**designed, "forward_tm": 60})
+        writer.write(designed)
+
+    table = pyarrow.ipc.open_file(pyarrow.BufferReader(handle.getvalue())).read_all()
+
+    assert table.schema.field("forward_tm").type == pyarrow.float64()
+    assert table.schema.field("product_length").type == pyarrow.int64()
+    assert table.column("forward_tm").to_pylist() == [None, 60.0, 60.5]
+
+def test_delimited_writer_flushes_each_batch():
+    handle = io.StringIO()
+    writer = DelimitedWriter(handle, ["row", "name"], batch_size=2, delimiter="\t")
+
+    writer.write({"row": 1, "name": "a"})
+    assert handle.getvalue() == "row\tname\r\n"
+
+    writer.write({"row": 2, "name": "b"})
+    assert handle.getvalue().splitlines() == ["row\tname", "1\ta", "2\tb"]
+    writer.close()
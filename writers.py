@@ -0,0 +1,356 @@
+import csv
+import json
+import sys
+from abc import ABC, abstractmethod
+from typing import IO, Iterable
+
+
+WRITER_FORMATS = ("text", "jsonl", "csv", "tsv", "arrow", "parquet")
+
+BATCH_SIZE = 4096
+
+# Type of every column written by the subcommands, so columnar schemas never depend on the first batch.
+FIELD_TYPES = {
+    "bytes": int,
+    "codon": str,
+    "created": float,
+    "dg": float,
+    "end": int,
+    "entries": int,
+    "enzyme": str,
+    "enzyme_a": str,
+    "enzyme_b": str,
+    "error": str,
+    "flagged": bool,
+    "forward_mismatches": int,
+    "forward_nmer": int,
+    "forward_primer": str,
+    "forward_start": int,
+    "forward_ta": float,
+    "forward_tm": float,
+    "gc_percent": float,
+    "hairpin_dg": float,
+    "hits": int,
+    "key": str,
+    "kind": str,
+    "last_access": float,
+    "length": int,
+    "matches": int,
+    "max_bytes": int,
+    "max_entries": int,
+    "max_run": int,
+    "mismatches": int,
+    "mut_forward_nmer": int,
+    "mut_forward_primer": str,
+    "mut_reverse_nmer": int,
+    "mut_reverse_primer": str,
+    "mutant": str,
+    "name": str,
+    "next": str,
+    "overlap": str,
+    "overlap_gc_percent": float,
+    "overlap_length": int,
+    "overlap_shift": int,
+    "overlap_tm": float,
+    "pair": str,
+    "path": str,
+    "position": int,
+    "primer": str,
+    "primer_a": str,
+    "primer_b": str,
+    "product_length": int,
+    "rank": int,
+    "record": str,
+    "removed": int,
+    "reverse_mismatches": int,
+    "reverse_nmer": int,
+    "reverse_primer": str,
+    "reverse_start": int,
+    "reverse_ta": float,
+    "reverse_tm": float,
+    "row": int,
+    "score": int,
+    "self_dimer_dg": float,
+    "self_three_prime_run": int,
+    "sequence": str,
+    "shared_kmers": int,
+    "site": str,
+    "size": int,
+    "size_gap": int,
+    "start": int,
+    "strand": str,
+    "ta": float,
+    "template": str,
+    "three_prime_run": int,
+    "tm": float,
+    "wild_type": str,
+}
+
+
+class RecordWriter(ABC):
+    """
+    Writes result records (flat dicts) to a stream in batches.
+
+    Records are buffered and handed to write_batch every `batch_size` records
+    and when the writer is closed, so formats can encode many rows per call.
+    When `fields` is not given, the keys of the first record are used; other
+    keys are dropped and missing ones are left empty. A writer that owns its
+    stream closes it when it is closed.
+
+    Args:
+        handle (IO): Stream to write to; text or binary depending on the format.
+        fields (list[str] | None, optional): Columns to write, in order. Defaults to None.
+        batch_size (int, optional): Number of records buffered before they are written. Defaults to BATCH_SIZE.
+    """
+
+    def __init__(self, handle: IO, fields: list[str] | None = None, batch_size: int = BATCH_SIZE) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        self.handle = handle
+        self.fields = list(fields) if fields is not None else None
+        self.batch_size = batch_size
+        self.buffer: list[dict] = []
+        self.owned = False
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, record: dict) -> None:
+        """
+        Buffer one record, writing the buffer out once it holds a full batch.
+
+        Args:
+            record (dict): Record to write.
+        """
+
+        if self.fields is None:
+            self.fields = list(record)
+
+        self.buffer.append({field: record.get(field) for field in self.fields})
+
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[dict]) -> None:
+        """
+        Buffer every record of an iterable.
+
+        Args:
+            records (Iterable[dict]): Records to write.
+        """
+
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        """
+        Write out the buffered records.
+        """
+
+        if self.buffer:
+            self.write_batch(self.buffer)
+            self.buffer = []
+
+        self.handle.flush()
+
+    @abstractmethod
+    def write_batch(self, records: list[dict]) -> None:
+        """
+        Encode and write a batch of records, all holding exactly `self.fields`.
+
+        Args:
+            records (list[dict]): Records to write.
+        """
+
+    def finish(self) -> None:
+        """
+        Write any trailer of the format after the last batch.
+        """
+
+    def close(self) -> None:
+        """
+        Write out the buffered records and any trailer of the format.
+        """
+
+        try:
+            self.flush()
+            self.finish()
+        finally:
+            if self.owned:
+                self.handle.close()
+
+def json_scalar(value):
+    """
+    Convert a NumPy scalar (e.g. a flag or score taken from an array) to the equivalent Python value for JSON.
+
+    Args:
+        value: Value json cannot serialize by itself.
+    """
+
+    if hasattr(value, "item"):
+        return value.item()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable.")
+
+class JsonLinesWriter(RecordWriter):
+    """
+    Writes one JSON object per line.
+    """
+
+    def write_batch(self, records: list[dict]) -> None:
+        self.handle.write("".join(json.dumps(record, separators=(",", ":"), default=json_scalar) + "\n" for record in records))
+
+class DelimitedWriter(RecordWriter):
+    """
+    Writes CSV or TSV with a header row; empty fields are written as "".
+
+    Args:
+        handle (IO): Text stream opened with newline="".
+        fields (list[str] | None, optional): Columns to write, in order. Defaults to None.
+        batch_size (int, optional): Number of records buffered before they are written. Defaults to BATCH_SIZE.
+        delimiter (str, optional): Field delimiter. Defaults to ",".
+    """
+
+    def __init__(self, handle: IO, fields: list[str] | None = None, batch_size: int = BATCH_SIZE, delimiter: str = ",") -> None:
+        super().__init__(handle, fields, batch_size)
+        self.delimiter = delimiter
+        self.writer = None
+
+        if self.fields is not None:
+            self.start()
+
+    def start(self) -> None:
+        """
+        Create the underlying csv writer and write the header row.
+        """
+
+        self.writer = csv.DictWriter(self.handle, fieldnames=self.fields, delimiter=self.delimiter)
+        self.writer.writeheader()
+
+    def write_batch(self, records: list[dict]) -> None:
+        if self.writer is None:
+            self.start()
+
+        self.writer.writerows(records)
+
+class ArrowWriter(RecordWriter):
+    """
+    Writes an Apache Arrow IPC file or a Parquet file, one record batch (row group) per buffered batch.
+
+    Requires the optional pyarrow package. Column types come from
+    FIELD_TYPES; only columns missing from it are inferred from the first
+    batch, and written as strings if they hold only empty values there.
+
+    Args:
+        handle (IO): Binary stream.
+        fields (list[str] | None, optional): Columns to write, in order. Defaults to None.
+        batch_size (int, optional): Number of records buffered before they are written. Defaults to BATCH_SIZE.
+        parquet (bool, optional): Write Parquet instead of Arrow IPC. Defaults to False.
+    """
+
+    def __init__(self, handle: IO, fields: list[str] | None = None, batch_size: int = BATCH_SIZE, parquet: bool = False) -> None:
+        try:
+            import pyarrow
+        except ImportError:
+            raise ValueError("Arrow and Parquet output require pyarrow (pip install pyarrow).") from None
+
+        super().__init__(handle, fields, batch_size)
+        self.pyarrow = pyarrow
+        self.parquet = parquet
+        self.schema = None
+        self.writer = None
+
+    def column_type(self, field: str, records: list[dict]):
+        """
+        Return the Arrow type of a column, from FIELD_TYPES or else from its values in the first batch.
+
+        Args:
+            field (str): Column name.
+            records (list[dict]): First batch of records.
+        """
+
+        pa = self.pyarrow
+        known = {str: pa.string(), int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+
+        if field in FIELD_TYPES:
+            return known[FIELD_TYPES[field]]
+
+        inferred = pa.array([record[field] for record in records]).type if records else pa.null()
+
+        return pa.string() if pa.types.is_null(inferred) else inferred
+
+    def start(self, records: list[dict]) -> None:
+        """
+        Build the schema and open the Arrow or Parquet writer.
+
+        Args:
+            records (list[dict]): First batch of records.
+        """
+
+        pa = self.pyarrow
+        self.schema = pa.schema([pa.field(field, self.column_type(field, records)) for field in self.fields or []])
+
+        if self.parquet:
+            import pyarrow.parquet
+
+            self.writer = pyarrow.parquet.ParquetWriter(self.handle, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(self.handle, self.schema)
+
+    def write_batch(self, records: list[dict]) -> None:
+        if self.writer is None:
+            self.start(records)
+
+        self.writer.write_table(self.pyarrow.Table.from_pylist(records, schema=self.schema))
+
+    def finish(self) -> None:
+        if self.writer is None:
+            self.start([])
+
+        self.writer.close()
+        self.handle.flush()
+
+def open_writer(format: str, path: str | None = None, fields: list[str] | None = None, batch_size: int = BATCH_SIZE) -> RecordWriter:
+    """
+    Return a record writer for a structured output format, writing to a file or to standard output.
+
+    The file (if any) is closed together with the writer.
+
+    Args:
+        format (str): "jsonl", "csv", "tsv", "arrow" or "parquet".
+        path (str | None, optional): Output file; standard output if None. Defaults to None.
+        fields (list[str] | None, optional): Columns to write, in order. Defaults to None.
+        batch_size (int, optional): Number of records buffered before they are written. Defaults to BATCH_SIZE.
+    """
+
+    if format not in WRITER_FORMATS or format == "text":
+        raise ValueError(f"Unknown record format: {format!r}.")
+
+    binary = format in ("arrow", "parquet")
+
+    if path is None:
+        sys.stdout.flush()
+        handle = sys.stdout.buffer if binary else sys.stdout
+    else:
+        handle = open(path, "wb") if binary else open(path, "w", newline="")
+
+    try:
+        if format == "jsonl":
+            writer = JsonLinesWriter(handle, fields, batch_size)
+        elif format in ("csv", "tsv"):
+            writer = DelimitedWriter(handle, fields, batch_size, "," if format == "csv" else "\t")
+        else:
+            writer = ArrowWriter(handle, fields, batch_size, format == "parquet")
+    except Exception:
+        if path is not None:
+            handle.close()
+
+        raise
+
+    writer.owned = path is not None
+
+    return writer
\ No newline at end of file